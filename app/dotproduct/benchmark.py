@@ -0,0 +1,187 @@
+"""
+Dotproduct benchmark driver.
+
+Generates the input arrays with gen_data.py, builds one dotproduct binary per
+LMUL and simulates every (VLEN, LMUL) point in parallel on cached Verilator
+models of sim/testbench.sv (VEnable=1, one model per VLEN). Each run measures
+all N and SEW values, printed by the program as "Vector_32b = [...]" lines;
+the cycles are written to cycles.csv, read by plotData.py, chart.py and
+chart2.py.
+
+Usage:
+    python3 benchmark.py                          # VLEN 64,128,256 x LMUL 1,2,4,8
+    python3 benchmark.py --vlen 128 --lmul 2 4 -j 4
+"""
+
+import os
+import re
+import sys
+import shutil
+import argparse
+import subprocess
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+
+import results
+import gen_data
+
+APP_DIR = Path(__file__).resolve().parent
+sys.path.insert(0, str(APP_DIR.parent.parent / "sim"))
+from model_cache import SIM_DIR, ModelCache, run_model, read_exit_status
+
+DEFAULT_WORK_ROOT = APP_DIR / "bench_work"
+
+# Six arrays (int32, int16 and int8 pairs) take 14 bytes per element; the
+# RAM also holds the code, the other data and the stack below MEM_SIZE
+BYTES_PER_ELEMENT = 14
+CODE_AND_STACK = 0x8000
+MAX_N = 1 << 20
+
+# Cycle cap of each run (+MAX_CYCLES): every N from 8 to n runs all kernels,
+# far below this many cycles per element of n
+MAX_CYCLES_BASE = 1_000_000
+MAX_CYCLES_PER_ELEMENT = 2_000
+
+RESULT_LINE = re.compile(r"^(Vector|Scalar)_(\d+)b\s*=\s*\[(.*)\]")
+SIZES_LINE = re.compile(r"^X\s*=\s*\[(.*)\]")
+
+
+def mem_size(n):
+    """RAM of the program and the model for n elements: the next power of two"""
+    size = 1
+    while size < BYTES_PER_ELEMENT * n + CODE_AND_STACK:
+        size <<= 1
+    return size
+
+
+def generate_data(n, seed=None, binary=False):
+    """Writes src/data.h (and data.S/data.bin with binary) with n elements per array"""
+    arrays = gen_data.generate_random_arrays(n, seed)
+    if binary:
+        gen_data.write_binary_files(str(APP_DIR / "src"), *arrays)
+    else:
+        gen_data.write_header_file(str(APP_DIR / "src" / "data.h"), *arrays)
+
+
+def build(lmul, vsize, work_root):
+    """Builds dotproduct.bin for one LMUL; returns the path of its copy in work_root"""
+    make = ["make", f"LMUL={lmul}", f"VSIZE={vsize}", f"MEM_SIZE={mem_size(vsize)}"]
+    subprocess.run(make + ["clean"], cwd=APP_DIR, capture_output=True)
+    result = subprocess.run(make + ["all"], cwd=APP_DIR, capture_output=True, text=True)
+    log = work_root / f"build_m{lmul}.log"
+    log.write_text(result.stdout + result.stderr)
+    if result.returncode != 0:
+        raise RuntimeError(f"build with LMUL={lmul} failed, see {log}")
+    binary = work_root / f"dotproduct_m{lmul}.bin"
+    shutil.copy(APP_DIR / "dotproduct.bin", binary)
+    return binary
+
+
+def parse_output(text):
+    """{(kind, sew): [cycles]} and the N of each column from the program output"""
+    sizes, series = None, {}
+    for line in text.splitlines():
+        match = SIZES_LINE.match(line.strip())
+        if match:
+            sizes = [int(v) for v in match.group(1).split(",")]
+            continue
+        match = RESULT_LINE.match(line.strip())
+        if match:
+            series[(match.group(1), int(match.group(2)))] = [int(v) for v in match.group(3).split(",")]
+    return sizes, series
+
+
+def run_point(exe, binary, vlen, lmul, n, work_root, timeout=None):
+    """Simulates one (VLEN, LMUL) point; returns its result rows"""
+    run_dir = work_root / f"vlen{vlen}_m{lmul}"
+    plusargs = {"BIN_FILE": binary, "EXIT_FILE": run_dir / "results" / "exit_status.txt",
+                "RESULT_WORDS": 0, "MAX_CYCLES": MAX_CYCLES_BASE + MAX_CYCLES_PER_ELEMENT * n}
+    run_dir.mkdir(parents=True, exist_ok=True)
+    with open(run_dir / "simulation.log", "w") as log:
+        run_model(exe, run_dir, plusargs, stdout=log, timeout=timeout)
+
+    status = read_exit_status(run_dir / "results" / "exit_status.txt")
+    if not status or status["status"] != "DONE" or status["exit_code"] != 0:
+        raise RuntimeError(f"VLEN={vlen} LMUL={lmul} did not finish cleanly ({status}), see {run_dir}")
+    sizes, series = parse_output((run_dir / "results" / "Output.txt").read_text(errors="replace"))
+    if not sizes or not series:
+        raise RuntimeError(f"VLEN={vlen} LMUL={lmul}: no cycle tables in {run_dir}")
+
+    rows = []
+    for (kind, sew), cycles in series.items():
+        point = (vlen, sew, lmul) if kind == "Vector" else (0, sew, 0)
+        rows += [(*point, size, c) for size, c in zip(sizes, cycles)]
+    return rows
+
+
+def run_benchmark(vlens, lmuls, n, jobs, work_root=DEFAULT_WORK_ROOT, timeout=None, seed=None,
+                  binary=False):
+    work_root = Path(work_root)
+    shutil.rmtree(work_root, ignore_errors=True)
+    work_root.mkdir(parents=True)
+
+    # The builds share app/common objects, so they run one at a time. data.h
+    # is put back afterwards, since it must match the default VSIZE of the app
+    data_h = APP_DIR / "src" / "data.h"
+    original = data_h.read_bytes()
+    try:
+        generate_data(n, seed, binary)
+        binaries = {lmul: build(lmul, n, work_root) for lmul in lmuls}
+    finally:
+        gen_data.remove_binary_files(str(APP_DIR / "src"))
+        data_h.write_bytes(original)
+
+    # The model's RAM (MEM_WIDTH) matches the MEM_SIZE the binaries were built for
+    cache = ModelCache(log=lambda m: print(m, flush=True))
+    params = {"VEnable": 1, "MEM_WIDTH": mem_size(n)}
+    with ThreadPoolExecutor(max_workers=max(1, min(jobs, len(vlens)))) as pool:
+        exes = dict(zip(vlens, pool.map(
+            lambda vlen: cache.get(SIM_DIR / "testbench.sv", {**params, "VLEN": vlen}), vlens)))
+
+    cycles = {}
+    with ThreadPoolExecutor(max_workers=jobs) as pool:
+        futures = [pool.submit(run_point, exes[vlen], binaries[lmul], vlen, lmul, n, work_root,
+                               timeout)
+                   for vlen in vlens for lmul in lmuls]
+        for future in futures:
+            # Every point also measures the scalar kernels; the first one is kept
+            for *key, c in future.result():
+                cycles.setdefault(tuple(key), c)
+    return [(*key, c) for key, c in cycles.items()]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measures the dotproduct benchmark on Verilator")
+    parser.add_argument("--vlen", type=int, nargs="+", default=[64, 128, 256])
+    parser.add_argument("--lmul", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("-n", type=int, default=1024,
+                        help=f"Largest vector length (the program measures 8, 16, ... n), "
+                             f"at most {MAX_N}")
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the input data")
+    parser.add_argument("--binary", action="store_true",
+                        help="Link the input data as a binary blob (faster builds for large -n)")
+    parser.add_argument("-j", "--jobs", type=int, default=os.cpu_count(),
+                        help="Simulations in parallel (default: number of CPUs)")
+    parser.add_argument("--work-root", default=str(DEFAULT_WORK_ROOT))
+    parser.add_argument("--timeout", type=float, default=None,
+                        help="Wall-clock limit per simulation in seconds")
+    parser.add_argument("-o", "--output", default=results.RESULTS_FILE, help="Results file")
+    args = parser.parse_args()
+
+    if args.n < 8 or args.n & (args.n - 1):
+        sys.exit("error: -n must be a power of two >= 8")
+    if args.n > MAX_N:
+        sys.exit(f"error: -n above {MAX_N} needs more than {mem_size(MAX_N) >> 20} MiB of simulated RAM")
+
+    try:
+        rows = run_benchmark(args.vlen, args.lmul, args.n, args.jobs, args.work_root, args.timeout,
+                             args.seed, args.binary)
+    except (RuntimeError, subprocess.TimeoutExpired) as e:
+        sys.exit(f"error: {e}")
+    results.write(rows, args.output)
+    print(f"{len(rows)} measurements written to {args.output}")
+    shutil.rmtree(args.work_root, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,72 +1,15 @@
 import matplotlib.pyplot as plt
 
-X = [8, 16, 32, 64, 128, 256, 512, 1024]
+import results
 
-data = {
-    "Scalar": {
-        "32b": [104, 177, 323, 615, 1199, 2367, 4703, 9375],
-        "16b": [153, 252, 450, 846, 1638, 3222, 6390, 12726],
-        "8b":  [138, 229, 411, 775, 1503, 2959, 5871, 11695],
-    },
-    "VLEN_64": {
-        "32b": {
-            "m1": [150, 282, 546, 1074, 2130, 4242, 8466, 16914],
-            "m2": [102, 186, 354, 690, 1362, 2706, 5394, 10770],
-            "m4": [79, 140, 262, 506, 994, 1970, 3922, 7826],
-            "m8": [88, 114, 211, 405, 793, 1569, 3121, 6225],
-        },
-        "16b": {
-            "m1": [82, 144, 268, 516, 1012, 2004, 3988, 7956],
-            "m2": [58, 96, 172, 324, 628, 1236, 2452, 4884],
-            "m4": [64, 73, 126, 232, 444, 868, 1716, 3412],
-            "m8": [72, 82, 100, 181, 343, 667, 1315, 2611],
-        },
-        "8b": {
-            "m1": [51, 81, 141, 261, 501, 981, 1941, 3861],
-            "m2": [55, 58, 95, 169, 317, 613, 1205, 2389],
-            "m4": [59, 64, 73, 125, 229, 437, 853, 1685],
-            "m8": [67, 72, 82, 100, 180, 340, 660, 1300],
-        },
-    },
-    "VLEN_128": {
-        "32b": {
-            "m1": [92, 166, 314, 610, 1202, 2386, 4754, 9490],
-            "m2": [68, 118, 218, 418, 818, 1618, 3218, 6418],
-            "m4": [74, 95, 172, 326, 634, 1250, 2482, 4946],
-            "m8": [82, 104, 146, 275, 533, 1049, 2081, 4145],
-        },
-        "16b": {
-            "m1": [55, 90, 160, 300, 580, 1140, 2260, 4500],
-            "m2": [59, 66, 112, 204, 388, 756, 1492, 2964],
-            "m4": [63, 72, 89, 158, 296, 572, 1124, 2228],
-            "m8": [71, 80, 98, 132, 245, 471, 923, 1827],
-        },
-        "8b": {
-            "m1": [55, 55, 89, 157, 293, 565, 1109, 2197],
-            "m2": [57, 59, 66, 111, 201, 381, 741, 1461],
-            "m4": [61, 63, 72, 89, 157, 293, 565, 1109],
-            "m8": [69, 71, 80, 98, 132, 244, 468, 916],
-        },
-    },
-    "VLEN_256": {
-        "32b": {
-            "m1": [63, 108, 198, 378, 738, 1458, 2898, 5778],
-            "m2": [67, 84, 150, 282, 546, 1074, 2130, 4242],
-            "m4": [71, 90, 127, 236, 454, 890, 1762, 3506],
-            "m8": [79, 98, 136, 210, 403, 789, 1561, 3105],
-        },
-        "16b": {
-            "m1": [59, 63, 106, 192, 364, 708, 1396, 2772],
-            "m2": [61, 67, 82, 144, 268, 516, 1012, 2004],
-            "m4": [65, 71, 88, 121, 222, 424, 828, 1636],
-            "m8": [73, 79, 96, 130, 196, 373, 727, 1435],
-        },
-        "8b": {
-            "m1": [55, 59, 63, 105, 189, 357, 693, 1365],
-            "m2": [57, 61, 67, 82, 143, 265, 509, 997],
-            "m4": [61, 65, 71, 88, 121, 221, 421, 821],
-            "m8": [69, 73, 79, 96, 130, 196, 372, 724],
-        },
-    },
-}
+# Data from cycles.csv (legacy figures until benchmark.py is run), grouped by VLEN, SEW and LMUL
+X, cycles = results.load()
 
+data = {"Scalar": {}}
+order = sorted(cycles, key=lambda key: (key[0], -key[1], key[2]))
+for vlen, sew, lmul in order:
+    values = cycles[(vlen, sew, lmul)]
+    if vlen == 0:
+        data["Scalar"][f"{sew}b"] = values
+    else:
+        data.setdefault(f"VLEN_{vlen}", {}).setdefault(f"{sew}b", {})[f"m{lmul}"] = values
@@ -1,8 +1,12 @@
 import os
 import sys
+import argparse
 import numpy as np
 
-def generate_random_arrays(n):
+ARRAYS = ("v32a", "v32b", "v16a", "v16b", "v8a", "v8b")
+C_TYPES = {np.int32: "int32_t", np.int16: "int16_t", np.int8: "int8_t"}
+
+def generate_random_arrays(n, seed=None):
     """Generates random numbers for 32-bit, 16-bit, and 8-bit arrays."""
     """v32a = np.random.randint(-2**(20), high=2**(20)-1, size=n, dtype=np.int32)"""
     """v32b = np.random.randint(-2**(20), high=2**(20)-1, size=n, dtype=np.int32)"""
@@ -10,12 +14,13 @@ def generate_random_arrays(n):
     """v16b = np.random.randint(-2**(10), high=2**(10)-1, size=n, dtype=np.int16)"""
     """v8a  = np.random.randint( -2**(2), high=2**(2)-1,  size=n, dtype=np.int8)"""
     """v8b  = np.random.randint( -2**(2), high=2**(2)-1,  size=n, dtype=np.int8)"""
-    v32a = np.random.randint(-100, high=100, size=n, dtype=np.int32)
-    v32b = np.random.randint(-100, high=100, size=n, dtype=np.int32)
-    v16a = np.random.randint(-100, high=100, size=n, dtype=np.int16)
-    v16b = np.random.randint(-100, high=100, size=n, dtype=np.int16)
-    v8a  = np.random.randint(-100, high=100, size=n, dtype=np.int8)
-    v8b  = np.random.randint(-100, high=100, size=n, dtype=np.int8)
+    rng = np.random.default_rng(seed)
+    v32a = rng.integers(-100, high=100, size=n, dtype=np.int32)
+    v32b = rng.integers(-100, high=100, size=n, dtype=np.int32)
+    v16a = rng.integers(-100, high=100, size=n, dtype=np.int16)
+    v16b = rng.integers(-100, high=100, size=n, dtype=np.int16)
+    v8a  = rng.integers(-100, high=100, size=n, dtype=np.int8)
+    v8b  = rng.integers(-100, high=100, size=n, dtype=np.int8)
     return v32a, v32b, v16a, v16b, v8a, v8b
 
 def write_header_file(filepath, v32a, v32b, v16a, v16b, v8a, v8b):
@@ -52,26 +57,76 @@ def write_header_file(filepath, v32a, v32b, v16a, v16b, v8a, v8b):
 
         file.write("#endif\n")
 
+def write_binary_files(src_dir, *arrays):
+    """
+    Writes the arrays as one little-endian blob (data.bin), an assembly file
+    that links it in with .incbin (data.S) and a header of extern
+    declarations (data.h). The compiler never parses the values, so large N
+    costs only the size of the blob.
+    """
+    offset = 0
+    symbols = []
+    with open(os.path.join(src_dir, "data.bin"), 'wb') as file:
+        for name, array in zip(ARRAYS, arrays):
+            blob = array.astype(array.dtype.newbyteorder('<')).tobytes()
+            padding = -len(blob) % 4
+            file.write(blob + bytes(padding))
+            symbols.append((name, array, offset, len(blob)))
+            offset += len(blob) + padding
+
+    with open(os.path.join(src_dir, "data.S"), 'w') as file:
+        file.write("// data.S\n")
+        file.write("// Generated file linking the random test data in data.bin\n\n")
+        file.write("\t.section .rodata\n")
+        for name, array, start, size in symbols:
+            file.write(f"\n\t.global {name}\n")
+            file.write(f"\t.type {name}, @object\n")
+            file.write("\t.balign 4\n")
+            file.write(f"{name}:\n")
+            # Path relative to the directory make runs in (app/dotproduct)
+            file.write(f"\t.incbin \"src/data.bin\", {start}, {size}\n")
+            file.write(f"\t.size {name}, {size}\n")
+
+    with open(os.path.join(src_dir, "data.h"), 'w') as file:
+        file.write("// data.h\n")
+        file.write("// Generated file declaring the random test data of data.S\n\n")
+        file.write("#ifndef DATA_H\n")
+        file.write("#define DATA_H\n\n")
+        for name, array, _, _ in symbols:
+            file.write(f"extern const {C_TYPES[array.dtype.type]} {name}[{len(array)}];\n")
+        file.write("\n#endif\n")
+
+def remove_binary_files(src_dir):
+    """Removes data.S and data.bin, which would clash with a data.h holding the arrays"""
+    for name in ("data.S", "data.bin"):
+        path = os.path.join(src_dir, name)
+        if os.path.exists(path):
+            os.remove(path)
+
 def main():
-    if len(sys.argv) != 2:
-        print("Usage: python gen_data.py <N>")
-        sys.exit(1)
+    parser = argparse.ArgumentParser(description="Generates the input data of the dotproduct benchmark")
+    parser.add_argument("n", type=int, help="Number of elements of each array")
+    parser.add_argument("--seed", type=int, default=None,
+                        help="Seed of the random generator (same seed, same data)")
+    parser.add_argument("--binary", action="store_true",
+                        help="Write the arrays as a binary blob linked with .incbin")
+    args = parser.parse_args()
 
-    try:
-        n = int(sys.argv[1])
-        if n <= 0:
-            raise ValueError
-    except ValueError:
+    if args.n <= 0:
         print("N must be a positive integer.")
         sys.exit(1)
 
     # Generate random data
-    v32a, v32b, v16a, v16b, v8a, v8b = generate_random_arrays(n)
-
-    # Write the data to a header file
-    write_header_file("./src/data.h", v32a, v32b, v16a, v16b, v8a, v8b)
+    arrays = generate_random_arrays(args.n, args.seed)
 
-    print(f"Generated ./src/data.h with {n} random numbers in each array.")
+    # Write the data to a header file, or to a blob declared by the header
+    if args.binary:
+        write_binary_files("./src", *arrays)
+        print(f"Generated ./src/data.bin, data.S and data.h with {args.n} random numbers in each array.")
+    else:
+        remove_binary_files("./src")
+        write_header_file("./src/data.h", *arrays)
+        print(f"Generated ./src/data.h with {args.n} random numbers in each array.")
 
 if __name__ == "__main__":
     main()
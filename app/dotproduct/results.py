@@ -0,0 +1,55 @@
+"""
+Measured cycles of the dotproduct benchmark, shared by benchmark.py (writer)
+and plotData.py, chart.py and chart2.py (readers).
+
+cycles.csv has one row per point: VLEN, SEW, LMUL, N, Cycles and Source.
+Scalar rows use VLEN = 0 and LMUL = 0. Source is "benchmark.py" for rows
+measured by benchmark.py and "legacy" for the hand-entered figures the file
+was seeded with (the 8-bit vector ones were dropped: they came from a broken
+kernel); running benchmark.py replaces them all with measurements.
+"""
+
+import csv
+import os
+import sys
+
+RESULTS_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "cycles.csv")
+COLUMNS = ("VLEN", "SEW", "LMUL", "N", "Cycles", "Source")
+MEASURED = "benchmark.py"
+LEGACY = "legacy"
+
+
+def write(rows, path=RESULTS_FILE):
+    """rows: iterable of (vlen, sew, lmul, n, cycles)"""
+    with open(path, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(COLUMNS)
+        writer.writerows((*row, MEASURED) for row in sorted(rows))
+
+
+def load(path=RESULTS_FILE):
+    """
+    Returns (X, {(vlen, sew, lmul): [cycles for each N in X]}), warning when
+    the file still holds legacy figures
+    """
+    points = {}
+    legacy = False
+    with open(path, newline="") as f:
+        for row in csv.DictReader(f):
+            key = (int(row["VLEN"]), int(row["SEW"]), int(row["LMUL"]))
+            points.setdefault(key, {})[int(row["N"])] = int(row["Cycles"])
+            legacy = legacy or row.get("Source", LEGACY) == LEGACY
+    if legacy:
+        print(f"warning: {path} has legacy (unmeasured) figures; run benchmark.py to measure them",
+              file=sys.stderr)
+    X = sorted({n for cycles in points.values() for n in cycles})
+    return X, {key: [cycles.get(n) for n in X] for key, cycles in points.items()}
+
+
+def scalar(data, sew):
+    return data[(0, sew, 0)]
+
+
+def vector(data, vlen, sew, lmul):
+    """None if the point was not measured"""
+    return data.get((vlen, sew, lmul))
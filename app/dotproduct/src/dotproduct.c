@@ -28,12 +28,24 @@
 // Check the vector results against golden vectors
 #define CHECK 1
 
+// Largest vector length measured (benchmark.py builds with -DVSIZE=N)
+#ifndef VSIZE
 #define VSIZE 4096
+#endif
+
+// LMUL of the vector kernels (benchmark.py builds one binary per value)
+#ifndef LMUL
+#define LMUL 8
+#endif
+
+#define STR_(x) #x
+#define STR(x) STR_(x)
+#define VTYPE(sew) "e" #sew ", m" STR(LMUL) ", ta, ma"
 
 int32_t dotp_v32b(int32_t *a, int32_t *b, uint32_t avl) {
   size_t orig_avl = avl;
   size_t vl;
-  __asm__ volatile("vsetvli %0, %1, e32, m8, ta, ma" : "=r"(vl) : "r"(avl));
+  __asm__ volatile("vsetvli %0, %1, " VTYPE(32) : "=r"(vl) : "r"(avl));
 
   int32_t red;
 
@@ -44,7 +56,7 @@ int32_t dotp_v32b(int32_t *a, int32_t *b, uint32_t avl) {
   __asm__ volatile("vmv.s.x v0, zero");
   // Stripmine and accumulate a partial reduced vector
   for (; avl > 0; avl -= vl) {
-    __asm__ volatile("vsetvli %0, %1, e32, m8, ta, ma" : "=r"(vl) : "r"(avl));
+    __asm__ volatile("vsetvli %0, %1, " VTYPE(32) : "=r"(vl) : "r"(avl));
     // Load chunk a and b
     __asm__ volatile("vle32.v v8,  (%0)" ::"r"(a_));
     __asm__ volatile("vle32.v v16, (%0)" ::"r"(b_));
@@ -70,7 +82,7 @@ int16_t dotp_v16b(int16_t *a, int16_t *b, uint32_t avl) {
 
   size_t orig_avl = avl;
   size_t vl;
-  __asm__ volatile("vsetvli %0, %1, e16, m8, ta, ma" : "=r"(vl) : "r"(avl));
+  __asm__ volatile("vsetvli %0, %1, " VTYPE(16) : "=r"(vl) : "r"(avl));
 
   int16_t red;
 
@@ -81,7 +93,7 @@ int16_t dotp_v16b(int16_t *a, int16_t *b, uint32_t avl) {
   __asm__ volatile("vmv.s.x v0, zero");
   // Stripmine and accumulate a partial reduced vector
   for (; avl > 0; avl -= vl) {
-    __asm__ volatile("vsetvli %0, %1, e16, m8, ta, ma" : "=r"(vl) : "r"(avl));
+    __asm__ volatile("vsetvli %0, %1, " VTYPE(16) : "=r"(vl) : "r"(avl));
     // Load chunk a and b
     __asm__ volatile("vle16.v v8,  (%0)" ::"r"(a_));
     __asm__ volatile("vle16.v v16, (%0)" ::"r"(b_));
@@ -106,7 +118,7 @@ int16_t dotp_v16b(int16_t *a, int16_t *b, uint32_t avl) {
 int8_t dotp_v8b(int8_t *a, int8_t *b, uint32_t avl) {
   size_t orig_avl = avl;
   size_t vl;
-  __asm__ volatile("vsetvli %0, %1, e8, m8, ta, ma" : "=r"(vl) : "r"(avl));
+  __asm__ volatile("vsetvli %0, %1, " VTYPE(8) : "=r"(vl) : "r"(avl));
 
   int8_t red;
 
@@ -117,7 +129,7 @@ int8_t dotp_v8b(int8_t *a, int8_t *b, uint32_t avl) {
   __asm__ volatile("vmv.s.x v0, zero");
   // Stripmine and accumulate a partial reduced vector
   for (; avl > 0; avl -= vl) {
-    __asm__ volatile("vsetvli %0, %1, e8, m8, ta, ma" : "=r"(vl) : "r"(avl));
+    __asm__ volatile("vsetvli %0, %1, " VTYPE(8) : "=r"(vl) : "r"(avl));
     // Load chunk a and b
     __asm__ volatile("vle8.v v8,  (%0)" ::"r"(a_));
     __asm__ volatile("vle8.v v16, (%0)" ::"r"(b_));
@@ -344,12 +356,11 @@ int main() {
   index = 0;
   for (uint32_t avl = 8; avl <= (VSIZE >> 0); avl *= 2) {
     printf("Calulating 8b dotp with vectors with length = %u\n", avl);
-    index = 0;
     cycles_start = csr_read_mcycle();
-    res8_v = dotp_v32b(v32a, v32b, avl);
+    res8_v = dotp_v8b(v8a, v8b, avl);
     cycles_end = csr_read_mcycle();
     cycles_v8[index] = cycles_end - cycles_start;
-    printf("VECTOR 32b - AVL = %lu, cycles = %ld\n", avl, cycles_v8[index]);
+    printf("VECTOR 8b - AVL = %lu, cycles = %ld\n", avl, cycles_v8[index]);
     if (SCALAR) {
       cycles_start = csr_read_mcycle();
       res8_s = dotp_s8b(v8a, v8b, avl);
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Benchmark do conversor imagem → RS5
+Compara o caminho antigo (getdata + to_bytes por pixel) com o conversor
+vetorizado de rs5_image, inteiro e por faixas, medindo tempo e pico de
+memória (tracemalloc) e conferindo que os binários são idênticos.
+"""
+
+import os
+import sys
+import time
+import argparse
+import tempfile
+import tracemalloc
+import numpy as np
+from PIL import Image
+
+from rs5_image import BAND_ROWS, write_rs5_bin
+
+def convert_per_pixel(image, bin_path):
+    """Caminho anterior dos conversores, mantido apenas como referência"""
+    rgb_data = []
+    for r, g, b in list(image.getdata()):
+        rgb_data.append((r << 24) | (g << 16) | (b << 8) | 0x00)
+    with open(bin_path, 'wb') as f:
+        for pixel_value in rgb_data:
+            f.write(pixel_value.to_bytes(4, byteorder='little'))
+
+def measure(func, *args):
+    """Executa func devolvendo (segundos, pico de memória em bytes)"""
+    tracemalloc.start()
+    inicio = time.perf_counter()
+    func(*args)
+    elapsed = time.perf_counter() - inicio
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak
+
+def synthetic_image(width, height, seed=0):
+    rng = np.random.default_rng(seed)
+    return Image.fromarray(rng.integers(0, 256, (height, width, 3), dtype=np.uint8), "RGB")
+
+def parse_size(text):
+    width, _, height = text.lower().partition("x")
+    return int(width), int(height)
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark do conversor imagem → RS5")
+    parser.add_argument("images", nargs="*", help="Imagens a converter (padrão: sintéticas)")
+    parser.add_argument("--sizes", nargs="+", type=parse_size,
+                        default=[(256, 256), (1024, 1024), (2048, 2048)],
+                        help="Tamanhos das imagens sintéticas (LxA)")
+    parser.add_argument("--band-rows", type=int, default=BAND_ROWS,
+                        help="Linhas por faixa no modo streaming")
+    parser.add_argument("--skip-per-pixel", action="store_true",
+                        help="Não executar o caminho antigo (lento em imagens grandes)")
+    args = parser.parse_args()
+
+    if args.images:
+        casos = [(os.path.basename(p), Image.open(p).convert("RGB")) for p in args.images]
+    else:
+        casos = [(f"sintetica {w}x{h}", synthetic_image(w, h)) for w, h in args.sizes]
+
+    metodos = [
+        ("vetorizado", lambda img, out: write_rs5_bin(img, out)),
+        (f"faixas {args.band_rows}", lambda img, out: write_rs5_bin(img, out, args.band_rows)),
+    ]
+    if not args.skip_per_pixel:
+        metodos.insert(0, ("por pixel", convert_per_pixel))
+
+    print(f"{'Imagem':<24} {'Método':<14} {'Tempo (s)':>10} {'Pico (MB)':>10} {'Speedup':>8}")
+    print("-" * 70)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for nome, image in casos:
+            referencia = None
+            base = None
+            for metodo, func in metodos:
+                out = os.path.join(tmp, "out.bin")
+                elapsed, peak = measure(func, image, out)
+                with open(out, "rb") as f:
+                    dados = f.read()
+                if referencia is None:
+                    referencia, base = dados, elapsed
+                elif dados != referencia:
+                    print(f"❌ {metodo} gerou um binário diferente para {nome}")
+                    sys.exit(1)
+                print(f"{nome:<24} {metodo:<14} {elapsed:>10.3f} {peak / 2**20:>10.1f} "
+                      f"{base / elapsed:>7.1f}x")
+
+    print("✅ Todos os métodos geraram binários idênticos")
+
+if __name__ == "__main__":
+    main()
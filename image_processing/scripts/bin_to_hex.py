@@ -1,29 +1,18 @@
 #!/usr/bin/env python3
 """
 Converte dados binários da imagem para formato hex para o testbench
+A conversão é feita por sim/memimage.py (formatação em lote com NumPy)
 """
 
 import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "sim"))
+import memimage
 
 def bin_to_hex(bin_file, hex_file):
-    """Converte arquivo binário para formato hex"""
-    
-    with open(bin_file, 'rb') as f:
-        data = f.read()
-    
-    # Converter para formato hex (4 bytes por linha)
-    with open(hex_file, 'w') as f:
-        for i in range(0, len(data), 4):
-            if i + 4 <= len(data):
-                # Ler 4 bytes em little endian
-                word = int.from_bytes(data[i:i+4], 'little')
-                f.write(f"{word:08X}\n")
-            else:
-                # Padding se necessário
-                remaining = data[i:]
-                padded = remaining + b'\x00' * (4 - len(remaining))
-                word = int.from_bytes(padded, 'little')
-                f.write(f"{word:08X}\n")
+    """Converte arquivo binário para formato hex (uma palavra por linha)"""
+    memimage.convert(bin_file, hex_file, src_fmt="bin", dst_fmt="hex")
 
 def main():
     if len(sys.argv) != 3:
@@ -41,4 +30,4 @@ def main():
         sys.exit(1)
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
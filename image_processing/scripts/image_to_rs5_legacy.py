@@ -7,7 +7,7 @@ Processa imagens no tamanho original (limitado pela memória do RS5)
 import sys
 import os
 from PIL import Image
-import struct
+from rs5_image import convert_image
 
 def convert_image_to_rs5(image_path, output_prefix="test_image_data", max_pixels=None):
     """
@@ -66,44 +66,13 @@ def convert_image_to_rs5(image_path, output_prefix="test_image_data", max_pixels
         
         print(f"📊 Pixels finais: {total_pixels:,} (~{total_pixels*4/1024:.1f}KB)")
         
-        # Extrair dados RGB
-        rgb_data = []
-        pixel_data = list(processed_image.getdata())
-        
-        for i, (r, g, b) in enumerate(pixel_data):
-            # Formato: 0xRRGGBBXX (X = padding)
-            pixel_value = (r << 24) | (g << 16) | (b << 8) | 0x00
-            rgb_data.append(pixel_value)
-        
-        print(f"✅ Dados RGB extraídos: {len(rgb_data)} pixels")
-        
-        # Salvar arquivo binário
+        # Empacotar 0xRRGGBBXX com NumPy e gravar
         bin_filename = f"{output_prefix}.bin"
-        with open(bin_filename, 'wb') as f:
-            for pixel_value in rgb_data:
-                f.write(pixel_value.to_bytes(4, byteorder='little'))
-        
-        print(f"💾 Arquivo binário salvo: {bin_filename}")
-        
-        # Salvar arquivo de informações
         info_filename = f"{output_prefix}_info.txt"
-        with open(info_filename, 'w') as f:
-            f.write(f"Original: {image_path}\n")
-            f.write(f"Dimensions: {width}x{height}\n")
-            f.write(f"Total pixels: {total_pixels}\n")
-            f.write(f"Data format: 0xRRGGBBXX per pixel\n\n")
-            f.write("Sample pixels:\n")
-            
-            # Mostrar alguns pixels de exemplo
-            for i in range(min(10, len(rgb_data))):
-                row = i // width
-                col = i % width
-                pixel_val = rgb_data[i]
-                r = (pixel_val >> 24) & 0xFF
-                g = (pixel_val >> 16) & 0xFF
-                b = (pixel_val >> 8) & 0xFF
-                f.write(f"Pixel[{i}] ({col},{row}): RGB({r},{g},{b}) = 0x{pixel_val:08X}\n")
+        convert_image(processed_image, bin_filename, info_filename, image_path)
         
+        print(f"✅ Dados RGB extraídos: {total_pixels} pixels")
+        print(f"💾 Arquivo binário salvo: {bin_filename}")
         print(f"📄 Arquivo de info salvo: {info_filename}")
         
         return width, height, total_pixels, bin_filename, info_filename
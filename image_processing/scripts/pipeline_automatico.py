@@ -7,19 +7,146 @@ Automatiza todo o processo: conversão → compilação → simulação → reco
 import os
 import sys
 import time
+import argparse
 import subprocess
 import shutil
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from pathlib import Path
 from PIL import Image
 import numpy as np
 
+# Cache de modelos Verilator compartilhado com as demais ferramentas de sim/
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "sim"))
+from model_cache import ModelCache, run_model, read_exit_status
+from checkpoint import savable_model, marker_address, checkpoint_path, run_checkpointed
+from rs5_results import load_result_dump
+from rs5_image import pack_rgbx
+
+# Mapa de memória do programa gerado (RAM de MEM_WIDTH bytes no testbench):
+# código em [0, IMAGE_HEADER_ADDR), cabeçalho da imagem em IMAGE_HEADER_ADDR,
+# pixels de entrada logo depois (IMAGE_DATA_ADDR), resultado logo após a
+# entrada e STACK_RESERVE bytes no topo para a pilha
+RS5_RAM_BYTES = 65_536
+IMAGE_HEADER_ADDR = 0x1000
+STACK_RESERVE = 0x1000
+
+# Cabeçalho gravado antes dos pixels (palavras little-endian): assinatura,
+# largura, altura, total de pixels e endereço do resultado. As dimensões não
+# são compiladas no programa, então o mesmo binário (e o mesmo checkpoint)
+# serve para qualquer imagem
+IMAGE_MAGIC = 0x49355352  # "RS5I"
+IMAGE_HEADER_WORDS = 5
+IMAGE_DATA_ADDR = IMAGE_HEADER_ADDR + IMAGE_HEADER_WORDS * 4
+
+# Símbolo que o programa gerado emite antes de ler a imagem: ponto do checkpoint
+CHECKPOINT_SYMBOL = "image_start"
+
+# Teto de ciclos de cada simulação (+MAX_CYCLES), com folga grande sobre o
+# custo real por pixel: só garante que um programa preso termine
+MAX_CYCLES_BASE = 1_000_000
+MAX_CYCLES_PER_PIXEL = 10_000
+
+# Registradores do testbench: saída de texto e conclusão (tohost)
+UART_ADDR = 0x80001000
+TOHOST_ADDR = 0x80000000
+
+# Modos de processamento: "pixel" usa plugin_pixel_processor (um acesso MMIO
+# por pixel); "frame" usa plugin_image_processor, que percorre o quadro
+# inteiro com o seu próprio mestre de memória (FRAME_PLUGIN=1 no testbench)
+MODES = ("pixel", "frame")
+
+# Espera pelo plugin de pixels no modo pixel: "poll" lê o bit done do CTRL
+# até o plugin terminar; "delay" mantém o laço fixo de espera antigo
+WAIT_MODES = ("poll", "delay")
+
+def max_tile_pixels():
+    """Maior número de pixels cujo buffer de entrada e de saída cabem na RAM"""
+    return (RS5_RAM_BYTES - IMAGE_DATA_ADDR - STACK_RESERVE) // 8
+
+def result_addr_for(total_pixels):
+    """Buffer de resultado logo após os dados de entrada, sem sobreposição"""
+    return IMAGE_DATA_ADDR + total_pixels * 4
+
+def image_header(width, height, total_pixels):
+    """Cabeçalho lido pelo programa gerado, gravado antes dos pixels"""
+    return np.array([IMAGE_MAGIC, width, height, total_pixels, result_addr_for(total_pixels)],
+                    dtype="<u4").tobytes()
+
+def plan_tiles(width, height, tile_width=None, tile_height=None):
+    """
+    Divide a imagem em tiles que cabem na RAM do RS5
+
+    Sem tamanho explícito usa faixas com a largura inteira da imagem (ou
+    pedaços de linha, se uma linha sozinha não couber).
+
+    Returns:
+        Lista de (x, y, w, h)
+    """
+    budget = max_tile_pixels()
+    if tile_width is None:
+        tile_width = min(width, budget)
+    if tile_height is None:
+        tile_height = max(1, min(height, budget // tile_width))
+    if tile_width * tile_height > budget:
+        raise ValueError(f"Tile {tile_width}x{tile_height} excede {budget} pixels")
+    
+    return [(x, y, min(tile_width, width - x), min(tile_height, height - y))
+            for y in range(0, height, tile_height)
+            for x in range(0, width, tile_width)]
+
+def read_clock_cycles(report_path):
+    """Lê 'Clock Cycles' do Report.txt gerado pelo CSRBank (PROFILING)"""
+    try:
+        with open(report_path) as f:
+            for line in f:
+                if line.startswith("Clock Cycles:"):
+                    return int(line.split(":")[1])
+    except OSError:
+        pass
+    return None
+
+def cycles_per_pixel(cycles, pixels):
+    return cycles / pixels if cycles is not None and pixels else None
+
 class RS5ImagePipeline:
-    def __init__(self, base_dir="."):
-        self.base_dir = Path(base_dir)
+    def __init__(self, base_dir=".", work_dir=None, job_name=None, sim_timeout=None,
+                 mode="pixel", wait="poll", checkpoint=False):
+        self.base_dir = Path(base_dir).resolve()
         self.sim_dir = self.base_dir / "sim"
         self.app_dir = self.base_dir / "app" / "c_code"
         self.imagem_entrada_dir = self.base_dir / "imagem_entrada"
         self.imagem_saida_dir = self.base_dir / "imagem_saida"
+        self.job_name = job_name
+        self.sim_timeout = sim_timeout
+        self.mode = mode
+        self.wait = wait
+        self.checkpoint = checkpoint
+        self.timings = {}
+        self.total_pixels = 0
+        self.result_addr = result_addr_for(0)
+        self.cycles = None
+        self.model_cache = ModelCache(self.sim_dir / "model_cache", log=self.log)
+        
+        # Diretório de trabalho: sem work_dir usamos os caminhos compartilhados
+        # de sempre; no modo em lote cada job tem o seu próprio diretório
+        self.work_dir = Path(work_dir).resolve() if work_dir else None
+        if self.work_dir is None:
+            self.output_root = self.base_dir
+            self.c_src_dir = self.app_dir / "src"
+            self.build_dir = self.app_dir
+            self.run_dir = self.sim_dir
+        else:
+            self.output_root = self.work_dir
+            self.c_src_dir = self.work_dir / "src"
+            self.build_dir = self.work_dir
+            self.run_dir = self.work_dir / "sim"
+            for d in ("binarios", "temp_files", "imagem_redimensionada"):
+                (self.work_dir / d).mkdir(parents=True, exist_ok=True)
+            self.c_src_dir.mkdir(parents=True, exist_ok=True)
+            self.run_dir.mkdir(parents=True, exist_ok=True)
+        
+        self.data_dir = self.output_root / "binarios"
+        self.info_dir = self.output_root / "temp_files"
         
         # Criar diretório de saída
         self.imagem_saida_dir.mkdir(exist_ok=True)
@@ -27,7 +154,16 @@ class RS5ImagePipeline:
     def log(self, message):
         """Log com timestamp"""
         timestamp = time.strftime("%H:%M:%S")
-        print(f"[{timestamp}] {message}")
+        prefix = f"[{self.job_name}] " if self.job_name else ""
+        print(f"[{timestamp}] {prefix}{message}", flush=True)
+    
+    def timed(self, stage, func, *args):
+        """Executa uma etapa do pipeline registrando o tempo gasto"""
+        inicio = time.perf_counter()
+        try:
+            return func(*args)
+        finally:
+            self.timings[stage] = time.perf_counter() - inicio
     
     def convert_image_to_rs5(self, image_path, output_prefix="current_image"):
         """Converte imagem para formato RS5"""
@@ -37,11 +173,12 @@ class RS5ImagePipeline:
             # Usar o script de conversão atualizado - caminho corrigido
             script_path = self.base_dir / "image_processing" / "scripts" / "image_to_rs5_original.py"
             cmd = [
-                "python3", str(script_path), 
-                str(image_path), output_prefix
+                sys.executable, str(script_path), 
+                str(Path(image_path).resolve()), output_prefix
             ]
             
-            result = subprocess.run(cmd, cwd=self.base_dir, 
+            # O conversor grava em binarios/ e temp_files/ relativos ao cwd
+            result = subprocess.run(cmd, cwd=self.output_root, 
                                   capture_output=True, text=True)
             
             if result.returncode == 0:
@@ -55,48 +192,152 @@ class RS5ImagePipeline:
             self.log(f"❌ Erro na conversão: {e}")
             return False
     
-    def update_c_program(self, width, height, total_pixels):
-        """Atualiza o programa C com as dimensões da imagem"""
-        self.log("🔧 Atualizando programa C...")
-        
-        c_template = f'''/*
+    def image_header_code(self):
+        """Definições C do cabeçalho da imagem e do marcador do checkpoint"""
+        return f'''// Cabeçalho da imagem, gravado pelo pipeline antes dos pixels
+#define IMAGE_HEADER_ADDR   0x{IMAGE_HEADER_ADDR:08X}
+#define IMAGE_MAGIC         0x{IMAGE_MAGIC:08X}  // "RS5I": imagem carregada
+#define HEADER_MAGIC        0
+#define HEADER_WIDTH        1
+#define HEADER_HEIGHT       2
+#define HEADER_TOTAL_PIXELS 3
+#define HEADER_RESULT_ADDR  4
+#define IMAGE_DATA_ADDR     0x{IMAGE_DATA_ADDR:08X}  // Pixels logo após o cabeçalho
+
+// Ponto do checkpoint (--checkpoint): nop com o símbolo {CHECKPOINT_SYMBOL}, retirado
+// antes de qualquer leitura da imagem, que o testbench recarrega ao retomar
+#define CHECKPOINT_MARKER() \\
+    __asm__ volatile (".globl {CHECKPOINT_SYMBOL}\\n{CHECKPOINT_SYMBOL}: nop" ::: "memory")
+
+// O testbench carrega a imagem alguns ciclos após o reset
+#define WAIT_IMAGE(header) while ((header)[HEADER_MAGIC] != IMAGE_MAGIC)'''
+    
+    def frame_c_program(self):
+        """Driver C do modo frame: programa um job para o quadro inteiro e aguarda done"""
+        return f'''/*
+ * RS5 Image Processor - Modo frame (plugin_image_processor)
+ * Gerado automaticamente; dimensões lidas do cabeçalho da imagem
+ */
+
+{self.image_header_code()}
+
+// Registradores do plugin de imagem (DMA)
+#define PLUGIN_IN_START_ADDR  0x10000000  // Início da imagem RGB
+#define PLUGIN_IN_END_ADDR    0x10000004  // Fim da imagem RGB
+#define PLUGIN_OUT_START_ADDR 0x10000008  // Início da imagem P&B
+#define PLUGIN_OUT_END_ADDR   0x1000000C  // Fim da imagem P&B
+#define PLUGIN_WIDTH_ADDR     0x10000010  // Largura
+#define PLUGIN_HEIGHT_ADDR    0x10000014  // Altura
+#define PLUGIN_CTRL_ADDR      0x10000018  // Controle/Status
+#define PLUGIN_STATUS_DONE    0x2         // bit 1: done (fica em 1 até o próximo start)
+
+#define REG(addr) (*(volatile unsigned int*)(addr))
+
+// Função simples para print via UART
+void print_uart(const char* str) {{
+    volatile unsigned int* uart_base = (volatile unsigned int*)0x{UART_ADDR:08X};
+    while (*str) {{
+        *uart_base = *str++;
+    }}
+}}
+
+// Encerra a simulação com um código de saída (0 = sucesso)
+void exit_sim(unsigned int code) {{
+    volatile unsigned int* tohost = (volatile unsigned int*)0x{TOHOST_ADDR:08X};
+    while (1) {{
+        *tohost = code;
+    }}
+}}
+
+int main() {{
+    volatile unsigned int* header = (volatile unsigned int*)IMAGE_HEADER_ADDR;
+    
+    CHECKPOINT_MARKER();
+    WAIT_IMAGE(header);
+    unsigned int total_pixels = header[HEADER_TOTAL_PIXELS];
+    unsigned int result_addr = header[HEADER_RESULT_ADDR];
+    
+    // Programar um único job com o quadro inteiro
+    REG(PLUGIN_IN_START_ADDR)  = IMAGE_DATA_ADDR;
+    REG(PLUGIN_IN_END_ADDR)    = IMAGE_DATA_ADDR + (total_pixels - 1) * 4;
+    REG(PLUGIN_OUT_START_ADDR) = result_addr;
+    REG(PLUGIN_OUT_END_ADDR)   = result_addr + (total_pixels - 1) * 4;
+    REG(PLUGIN_WIDTH_ADDR)     = header[HEADER_WIDTH];
+    REG(PLUGIN_HEIGHT_ADDR)    = header[HEADER_HEIGHT];
+    REG(PLUGIN_CTRL_ADDR)      = 1;  // Disparar processamento
+    
+    // Aguardar o plugin percorrer o quadro
+    while (!(REG(PLUGIN_CTRL_ADDR) & PLUGIN_STATUS_DONE));
+    
+    // Sinalizar conclusão e encerrar a simulação
+    print_uart("IMAGE_PROCESSING_COMPLETE\\n");
+    exit_sim(0);
+    
+    return 0;
+}}
+'''
+    
+    def wait_plugin_code(self):
+        """Corpo de wait_plugin_ready() para a espera escolhida (--wait)"""
+        if self.wait == "delay":
+            return """    // Aguardar alguns ciclos para plugin processar
+    for (volatile int i = 0; i < 10; i++);"""
+        return """    // Aguardar o bit done do registrador de controle
+    volatile unsigned int* plugin_ctrl = (volatile unsigned int*)PLUGIN_CTRL_ADDR;
+    while (!(*plugin_ctrl & PLUGIN_STATUS_DONE));"""
+    
+    def update_c_program(self):
+        """Atualiza o programa C para o modo e a espera escolhidos"""
+        if self.mode == "frame":
+            self.log(f"🔧 Atualizando programa C (modo frame)...")
+            c_template = self.frame_c_program()
+        else:
+            self.log(f"🔧 Atualizando programa C (modo pixel, espera {self.wait})...")
+            c_template = f'''/*
  * RS5 Image Processor - Processamento automático via pipeline
- * Gerado automaticamente para imagem {width}x{height}
+ * Gerado automaticamente; dimensões lidas do cabeçalho da imagem
  */
 
-// Definições da imagem atual
-#define IMAGE_WIDTH  {width}
-#define IMAGE_HEIGHT {height}
-#define TOTAL_PIXELS {total_pixels}
+{self.image_header_code()}
 
 // Endereços do plugin de pixels - VALIDADOS
 #define PLUGIN_RGB_ADDR   0x10000000  // Entrada RGB: 0xRRGGBBXX
 #define PLUGIN_UNUSED_ADDR 0x10000004  // Parâmetro não usado  
 #define PLUGIN_GRAY_ADDR  0x10000008  // Resultado P&B: 0xGGGGGG00
 #define PLUGIN_CTRL_ADDR  0x1000000C  // Controle/Status
+#define PLUGIN_STATUS_DONE 0x2         // bit 1: done (fica em 1 até o próximo start)
 
-// Endereços de dados da imagem na RAM
-#define IMAGE_DATA_ADDR   0x00001000  // Onde carregar dados da imagem
-#define RESULT_DATA_ADDR  0x00002000  // Onde salvar resultados
-
-// Função para aguardar conclusão do plugin
+// Função para aguardar conclusão do plugin (espera: {self.wait})
 void wait_plugin_ready() {{
-    // Aguardar alguns ciclos para plugin processar
-    for (volatile int i = 0; i < 10; i++);
+{self.wait_plugin_code()}
 }}
 
 // Função simples para print via UART
 void print_uart(const char* str) {{
-    volatile unsigned int* uart_base = (volatile unsigned int*)0x80000000;
+    volatile unsigned int* uart_base = (volatile unsigned int*)0x{UART_ADDR:08X};
     while (*str) {{
         *uart_base = *str++;
     }}
 }}
 
+// Encerra a simulação com um código de saída (0 = sucesso)
+void exit_sim(unsigned int code) {{
+    volatile unsigned int* tohost = (volatile unsigned int*)0x{TOHOST_ADDR:08X};
+    while (1) {{
+        *tohost = code;
+    }}
+}}
+
 int main() {{
+    volatile unsigned int* header = (volatile unsigned int*)IMAGE_HEADER_ADDR;
+    
+    CHECKPOINT_MARKER();
+    WAIT_IMAGE(header);
+    unsigned int total_pixels = header[HEADER_TOTAL_PIXELS];
+    
     // Ponteiros para dados de entrada e saída
     volatile unsigned int* input_ptr = (volatile unsigned int*)IMAGE_DATA_ADDR;
-    volatile unsigned int* output_ptr = (volatile unsigned int*)RESULT_DATA_ADDR;
+    volatile unsigned int* output_ptr = (volatile unsigned int*)header[HEADER_RESULT_ADDR];
     
     // Registradores do plugin
     volatile unsigned int* plugin_rgb = (volatile unsigned int*)PLUGIN_RGB_ADDR;
@@ -104,7 +345,7 @@ int main() {{
     volatile unsigned int* plugin_result = (volatile unsigned int*)PLUGIN_GRAY_ADDR;
     
     // Processar todos os pixels da imagem
-    for (int i = 0; i < TOTAL_PIXELS; i++) {{
+    for (unsigned int i = 0; i < total_pixels; i++) {{
         // Ler pixel RGB da memória
         unsigned int rgb_pixel = *(input_ptr + i);
         
@@ -122,15 +363,16 @@ int main() {{
         *(output_ptr + i) = gray_pixel;
     }}
     
-    // Sinalizar conclusão
+    // Sinalizar conclusão e encerrar a simulação
     print_uart("IMAGE_PROCESSING_COMPLETE\\n");
+    exit_sim(0);
     
     return 0;
 }}
 '''
         
         try:
-            c_file_path = self.app_dir / "src" / "process_current_image.c"
+            c_file_path = self.c_src_dir / "process_current_image.c"
             with open(c_file_path, 'w') as f:
                 f.write(c_template)
             
@@ -147,6 +389,8 @@ int main() {{
         
         try:
             cmd = ["make", "PROGNAME=process_current_image"]
+            if self.work_dir is not None:
+                cmd += [f"SRC_DIR={self.c_src_dir}", f"BUILD_DIR={self.build_dir}"]
             result = subprocess.run(cmd, cwd=self.app_dir, 
                                   capture_output=True, text=True)
             
@@ -161,39 +405,24 @@ int main() {{
             self.log(f"❌ Erro na compilação: {e}")
             return False
     
-    def prepare_simulation(self):
+    def prepare_simulation(self, width, height, total_pixels):
         """Prepara arquivos para simulação"""
         self.log("📋 Preparando simulação...")
         
         try:
-            # Converter programa para hex - caminho corrigido
-            bin_file = self.app_dir / "process_current_image.bin"
-            hex_file = self.app_dir / "process_current_image.hex"
-            
-            bin_to_hex_script = self.base_dir / "image_processing" / "scripts" / "bin_to_hex.py"
-            cmd = ["python3", str(bin_to_hex_script), str(bin_file), str(hex_file)]
-            result = subprocess.run(cmd, cwd=self.base_dir,
-                                  capture_output=True, text=True)
-            
-            if result.returncode != 0:
-                self.log(f"❌ Erro ao converter programa: {result.stderr}")
-                return False
-            
-            # Copiar arquivos para sim
-            shutil.copy(hex_file, self.sim_dir / "program.hex")
-            
-            # Converter dados da imagem para hex e copiar
-            bin_image_path = self.base_dir / "binarios" / "current_image.bin"
-            hex_image_path = self.base_dir / "binarios" / "current_image.hex"
-            cmd = ["python3", str(bin_to_hex_script), str(bin_image_path), str(hex_image_path)]
-            result = subprocess.run(cmd, cwd=self.base_dir,
-                                  capture_output=True, text=True)
-            
-            if result.returncode != 0:
-                self.log(f"❌ Erro ao converter dados da imagem: {result.stderr}")
-                return False
+            # Programa e imagem vão em binário direto para o modelo em cache
+            # (+BIN_FILE e +IMAGE_FILE, carregados com $fread), sem conversão
+            # para hex nem cópia para o diretório de execução
+            for arquivo in (self.build_dir / "process_current_image.bin",
+                            self.data_dir / "current_image.bin"):
+                if not arquivo.exists():
+                    self.log(f"❌ Arquivo não encontrado: {arquivo}")
+                    return False
             
-            shutil.copy(hex_image_path, self.sim_dir / "test_image_data.hex")
+            # Entrada carregada em IMAGE_HEADER_ADDR: cabeçalho e pixels
+            pixels = (self.data_dir / "current_image.bin").read_bytes()
+            (self.data_dir / "current_image_input.bin").write_bytes(
+                image_header(width, height, total_pixels) + pixels)
             
             self.log("✅ Simulação preparada")
             return True
@@ -203,60 +432,106 @@ int main() {{
             return False
     
     def run_simulation(self):
-        """Executa a simulação"""
+        """Executa a simulação no modelo Verilator em cache"""
         self.log("🚀 Executando simulação...")
         
         try:
-            cmd = ["make", "run"]
-            result = subprocess.run(cmd, cwd=self.sim_dir,
-                                  capture_output=False, text=True)  # Mostrar saída do Verilator
+            # Só verila quando RTL/testbench/parâmetros mudaram
+            params = {"FRAME_PLUGIN": 1} if self.mode == "frame" else None
+            if self.checkpoint:
+                exe = savable_model(self.model_cache, params)
+            else:
+                exe = self.model_cache.get(self.sim_dir / "testbench.sv", params)
             
-            if result.returncode == 0:
-                self.log("✅ Simulação concluída - Hardware processou a imagem")
-                return True, ""
+            # Programa, dados e timeout vão por plusargs para o modelo já compilado
+            plusargs = {
+                "BIN_FILE": self.build_dir / "process_current_image.bin",
+                "IMAGE_FILE": self.data_dir / "current_image_input.bin",
+                "IMAGE_ADDR": f"{IMAGE_HEADER_ADDR:x}",
+                "RESULT_FILE": self.run_dir / "results" / "result_data.bin",
+                "RESULT_ADDR": f"{self.result_addr:x}",
+                "RESULT_WORDS": self.total_pixels,
+                "EXIT_FILE": self.run_dir / "results" / "exit_status.txt",
+                "MAX_CYCLES": MAX_CYCLES_BASE + MAX_CYCLES_PER_PIXEL * self.total_pixels,
+            }
+            if self.sim_timeout is not None:
+                plusargs["TIMEOUT"] = self.sim_timeout
+            
+            if self.work_dir is None:
+                result = self.run_model(exe, plusargs)  # Mostrar saída do Verilator
             else:
-                self.log(f"⚠️  Simulação terminou com código: {result.returncode}")
-                return True, ""  # Pode ter funcionado mesmo com "erro"
+                # Jobs paralelos: saída do Verilator vai para o log do job
+                with open(self.work_dir / "simulacao.log", "w") as log_file:
+                    result = self.run_model(exe, plusargs, stdout=log_file)
+            
+            self.cycles = read_clock_cycles(self.run_dir / "results" / "Report.txt")
+            
+            # O programa escreve o código de saída em TOHOST_ADDR; WATCHDOG
+            # (instret parado ou laço preso) ou TIMEOUT (--timeout ou
+            # MAX_CYCLES) indicam que ele não terminou
+            status = read_exit_status(self.run_dir / "results" / "exit_status.txt")
+            if status is None:
+                self.log(f"❌ Simulação não gerou o estado de término (código {result.returncode})")
+                return False, ""
+            if status["status"] != "DONE":
+                self.log(f"❌ Simulação interrompida: {status['status']} em {status['time_ns']} ns")
+                return False, ""
+            if status["exit_code"] != 0:
+                self.log(f"❌ Programa terminou com código de saída {status['exit_code']}")
+                return False, ""
+            
+            self.log(f"✅ Simulação concluída em {status['time_ns']} ns - Hardware processou a imagem")
+            cpp = cycles_per_pixel(self.cycles, self.total_pixels)
+            if cpp is not None:
+                self.log(f"⏱️  {self.cycles} ciclos, {cpp:.1f} ciclos/pixel (modo {self.mode})")
+            return True, ""
                 
         except Exception as e:
             self.log(f"❌ Erro na simulação: {e}")
             return False, str(e)
     
+    def run_model(self, exe, plusargs, stdout=None):
+        """
+        Roda o modelo; com --checkpoint, o trecho até o marcador
+        (CHECKPOINT_SYMBOL, antes da leitura da imagem) é simulado uma vez
+        por programa e salvo, e as execuções seguintes retomam do checkpoint
+        com a nova imagem. Como as dimensões vêm do cabeçalho, o binário e o
+        checkpoint são os mesmos para todas as imagens do mesmo modo
+        
+        O programa não tem crt0 nem newlib (main fica no endereço 0): o
+        checkpoint poupa só o reset e a espera pela carga da imagem, cerca
+        de 30 ciclos por imagem
+        """
+        if not self.checkpoint:
+            return run_model(exe, self.run_dir, plusargs, stdout=stdout)
+        
+        elf = self.build_dir / "process_current_image.elf"
+        marker = marker_address(elf, CHECKPOINT_SYMBOL)
+        if marker is None:
+            self.log(f"⚠️  {elf.name} sem o símbolo {CHECKPOINT_SYMBOL}, simulando sem checkpoint")
+            return run_model(exe, self.run_dir, plusargs, stdout=stdout)
+        
+        checkpoint = checkpoint_path(exe, plusargs["BIN_FILE"])
+        result, restored = run_checkpointed(exe, self.run_dir, plusargs, checkpoint, marker,
+                                            stdout=stdout)
+        if restored:
+            self.log(f"♻️  Retomado do checkpoint {checkpoint.name} "
+                     f"({CHECKPOINT_SYMBOL} em 0x{marker:08x})")
+        elif checkpoint.exists():
+            self.log(f"💾 Checkpoint salvo em {CHECKPOINT_SYMBOL} (0x{marker:08x}): {checkpoint.name}")
+        return result
+    
     def extract_results(self, sim_output, width, height, total_pixels):
-        """Extrai resultados da simulação e reconstrói imagem"""
+        """Extrai da memória do RS5 os pixels processados pelo hardware"""
         self.log("📊 Extraindo resultados...")
         
         try:
-            # TODO: Em uma implementação real, extrairíamos os dados processados 
-            # da memória do RS5 ou do log de simulação.
-            # Por enquanto, como a simulação não expõe os dados processados diretamente,
-            # aplicamos o mesmo algoritmo do hardware: (R+G+B)/4
-            
-            self.log("⚠️  NOTA: Simulando saída do hardware - aplicando (R+G+B)/4")
-            
-            bin_path = self.base_dir / "binarios" / "current_image.bin"
-            with open(bin_path, "rb") as f:
-                raw_data = f.read()
+            # O testbench despeja a região RESULT_DATA_ADDR da RAM ao final da simulação
+            dump_path = self.run_dir / "results" / "result_data.bin"
+            pixels_processados, invalidos = load_result_dump(dump_path, total_pixels)
             
-            num_pixels = len(raw_data) // 4
-            pixels_processados = []
-            
-            for i in range(min(total_pixels, num_pixels)):
-                offset = i * 4
-                r = raw_data[offset]
-                g = raw_data[offset + 1]
-                b = raw_data[offset + 2]
-                
-                # Aplicar algoritmo do plugin de hardware: (R+G+B)/4
-                gray = (r + g + b) // 4
-                pixels_processados.append(gray)
-            
-            # Preencher com zeros se necessário
-            while len(pixels_processados) < total_pixels:
-                pixels_processados.append(0)
-            
-            # Truncar se necessário
-            pixels_processados = pixels_processados[:total_pixels]
+            if invalidos:
+                self.log(f"⚠️  {invalidos} palavras fora do formato 0xGGGGGG00 no dump")
             
             self.log(f"📈 Pixels extraídos: {len(pixels_processados)}")
             return pixels_processados
@@ -301,12 +576,12 @@ int main() {{
         self.log("=" * 60)
         
         # 1. Converter imagem
-        if not self.convert_image_to_rs5(image_path, "current_image"):
+        if not self.timed("conversao", self.convert_image_to_rs5, image_path, "current_image"):
             return False
         
         # 2. Ler informações da imagem convertida
         try:
-            info_path = self.base_dir / "temp_files" / "current_image_info.txt"
+            info_path = self.info_dir / "current_image_info.txt"
             with open(info_path, "r") as f:
                 info_lines = f.readlines()
             
@@ -316,6 +591,8 @@ int main() {{
             
             pixels_line = [l for l in info_lines if "Total pixels:" in l][0]
             total_pixels = int(pixels_line.split(":")[1].strip())
+            self.total_pixels = total_pixels
+            self.result_addr = result_addr_for(total_pixels)
             
             self.log(f"📐 Dimensões: {width}x{height} ({total_pixels} pixels)")
             
@@ -324,49 +601,396 @@ int main() {{
             return False
         
         # 3. Atualizar programa C
-        if not self.update_c_program(width, height, total_pixels):
+        if not self.timed("geracao_c", self.update_c_program):
             return False
         
         # 4. Compilar
-        if not self.compile_program():
+        if not self.timed("compilacao", self.compile_program):
             return False
         
         # 5. Preparar simulação
-        if not self.prepare_simulation():
+        if not self.timed("preparacao", self.prepare_simulation, width, height, total_pixels):
             return False
         
         # 6. Executar simulação
-        success, sim_output = self.run_simulation()
+        success, sim_output = self.timed("simulacao", self.run_simulation)
         if not success:
             return False
         
         # 7. Extrair resultados
-        pixels_data = self.extract_results(sim_output, width, height, total_pixels)
+        pixels_data = self.timed("extracao", self.extract_results, sim_output, width, height, total_pixels)
         if pixels_data is None:
             return False
         
         # 8. Reconstruir imagem
-        if not self.reconstruct_image(pixels_data, width, height, output_path):
+        if not self.timed("reconstrucao", self.reconstruct_image, pixels_data, width, height, output_path):
             return False
         
         self.log(f"🎉 PIPELINE CONCLUÍDO COM SUCESSO!")
         self.log(f"📁 Imagem salva: {output_path}")
         return True
+    
+    def check_program_size(self):
+        """Confere se o programa compilado não invade a região dos dados"""
+        size = (self.build_dir / "process_current_image.bin").stat().st_size
+        if size > IMAGE_HEADER_ADDR:
+            self.log(f"❌ Programa com {size} bytes invade IMAGE_HEADER_ADDR (0x{IMAGE_HEADER_ADDR:X})")
+            return False
+        return True
+    
+    def process_tile(self, rgb):
+        """
+        Processa um tile (array altura x largura x 3) no RS5
+        
+        Returns:
+            Array uint8 altura x largura em escala de cinza, ou None
+        """
+        height, width = rgb.shape[:2]
+        total_pixels = width * height
+        self.total_pixels = total_pixels
+        self.result_addr = result_addr_for(total_pixels)
+        
+        self.log(f"🧩 Tile {width}x{height} ({total_pixels} pixels)")
+        pack_rgbx(rgb).tofile(self.data_dir / "current_image.bin")
+        
+        if not self.timed("geracao_c", self.update_c_program):
+            return None
+        if not self.timed("compilacao", self.compile_program) or not self.check_program_size():
+            return None
+        if not self.timed("preparacao", self.prepare_simulation, width, height, total_pixels):
+            return None
+        
+        success, sim_output = self.timed("simulacao", self.run_simulation)
+        if not success:
+            return None
+        
+        pixels_data = self.timed("extracao", self.extract_results, sim_output, width, height, total_pixels)
+        if pixels_data is None:
+            return None
+        return pixels_data.reshape(height, width)
 
-def main():
-    if len(sys.argv) < 2:
-        print("Uso: python3 pipeline_automatico.py <imagem> [<imagem2> ...]")
-        print("Exemplo: python3 pipeline_automatico.py imagem_entrada/*.jpg")
-        sys.exit(1)
+def _process_job(base_dir, work_dir, job_name, image_path, keep_work, sim_timeout, mode="pixel",
+                 wait="poll", checkpoint=False):
+    """Executa uma imagem em um processo do pool, isolada no seu work_dir"""
+    pipeline = RS5ImagePipeline(base_dir, work_dir=work_dir, job_name=job_name,
+                                sim_timeout=sim_timeout, mode=mode, wait=wait,
+                                checkpoint=checkpoint)
+    inicio = time.perf_counter()
+    try:
+        ok = pipeline.process_image(image_path)
+    except Exception as e:
+        pipeline.log(f"❌ Erro inesperado: {e}")
+        ok = False
+    elapsed = time.perf_counter() - inicio
     
-    pipeline = RS5ImagePipeline()
+    if ok and not keep_work:
+        shutil.rmtree(work_dir, ignore_errors=True)
     
-    for image_path in sys.argv[1:]:
-        if os.path.exists(image_path):
-            pipeline.process_image(image_path)
+    return {
+        "image": str(image_path),
+        "ok": ok,
+        "pixels": pipeline.total_pixels,
+        "cycles": pipeline.cycles,
+        "elapsed": elapsed,
+        "timings": dict(pipeline.timings),
+        "work_dir": str(work_dir),
+    }
+
+def _process_tile(base_dir, work_dir, job_name, rgb, keep_work, sim_timeout, mode="pixel",
+                  wait="poll", checkpoint=False):
+    """Executa um tile em um processo do pool, isolado no seu work_dir"""
+    pipeline = RS5ImagePipeline(base_dir, work_dir=work_dir, job_name=job_name,
+                                sim_timeout=sim_timeout, mode=mode, wait=wait,
+                                checkpoint=checkpoint)
+    inicio = time.perf_counter()
+    try:
+        gray = pipeline.process_tile(rgb)
+    except Exception as e:
+        pipeline.log(f"❌ Erro inesperado: {e}")
+        gray = None
+    elapsed = time.perf_counter() - inicio
+    
+    if gray is not None and not keep_work:
+        shutil.rmtree(work_dir, ignore_errors=True)
+    
+    return {
+        "ok": gray is not None,
+        "gray": gray,
+        "cycles": pipeline.cycles,
+        "pixels": pipeline.total_pixels,
+        "elapsed": elapsed,
+        "work_dir": str(work_dir),
+    }
+
+def prepare_model(base_dir, mode, checkpoint=False):
+    """Verila (ou reaproveita) o modelo usado pelos jobs"""
+    cache = ModelCache(base_dir / "sim" / "model_cache")
+    params = {"FRAME_PLUGIN": 1} if mode == "frame" else None
+    if checkpoint:
+        return savable_model(cache, params)
+    return cache.get(base_dir / "sim" / "testbench.sv", params)
+
+def print_tile_summary(image_path, tiles, results, wall_time, jobs):
+    """Ciclos por pixel e throughput do processamento em tiles"""
+    print()
+    print("=" * 60)
+    print(f"🧩 RESUMO DOS TILES: {Path(image_path).name} ({len(tiles)} tiles, {jobs} jobs)")
+    print("=" * 60)
+    print(f"{'Tile':<24} {'Status':>6} {'Pixels':>8} {'Ciclos':>12} {'Ciclos/px':>10}")
+    for (x, y, w, h), r in zip(tiles, results):
+        status = "OK" if r["ok"] else "FALHA"
+        cycles = r["cycles"] if r["cycles"] is not None else 0
+        cpp = cycles / r["pixels"] if r["pixels"] else 0.0
+        print(f"{f'({x},{y}) {w}x{h}':<24} {status:>6} {r['pixels']:>8} {cycles:>12} {cpp:>10.1f}")
+    
+    medidos = [r for r in results if r["ok"] and r["cycles"] is not None]
+    total_pixels = sum(r["pixels"] for r in medidos)
+    total_cycles = sum(r["cycles"] for r in medidos)
+    print("-" * 60)
+    print(f"✅ Sucesso: {sum(r['ok'] for r in results)}/{len(results)} tiles")
+    if total_pixels:
+        print(f"🔁 Ciclos totais: {total_cycles:,} para {total_pixels:,} pixels "
+              f"({total_cycles / total_pixels:.1f} ciclos/pixel, inclui a sobrecarga de cada tile)")
+    if wall_time > 0:
+        print(f"⏱️  Tempo de parede: {wall_time:.2f}s ({total_pixels / wall_time:.0f} pixels/s simulados)")
+    
+    for (x, y, w, h), r in zip(tiles, results):
+        if not r["ok"]:
+            print(f"❌ Tile ({x},{y}): veja {r['work_dir']}")
+
+def run_tiled(base_dir, image_path, jobs, tile_size=None, work_root=None, keep_work=False,
+              sim_timeout=None, mode="pixel", wait="poll", checkpoint=False):
+    """
+    Processa uma imagem de qualquer tamanho dividindo-a em tiles que cabem na
+    RAM do RS5, simulando os tiles em paralelo e remontando a saída
+    """
+    base_dir = Path(base_dir).resolve()
+    image_name = Path(image_path).stem
+    work_root = Path(work_root).resolve() if work_root else base_dir / "temp_files" / "jobs"
+    work_root.mkdir(parents=True, exist_ok=True)
+    
+    rgb = np.asarray(Image.open(image_path).convert("RGB"))
+    height, width = rgb.shape[:2]
+    tile_width, tile_height = tile_size if tile_size else (None, None)
+    tiles = plan_tiles(width, height, tile_width, tile_height)
+    print(f"🧩 {image_path}: {width}x{height} em {len(tiles)} tiles "
+          f"(máximo de {max_tile_pixels()} pixels por tile)")
+    
+    # Verilar uma única vez antes de disparar os tiles; sem modelo, cada
+    # tile repetiria o mesmo build com falha
+    try:
+        prepare_model(base_dir, mode, checkpoint)
+    except Exception as e:
+        print(f"❌ Erro ao preparar o modelo Verilator: {e}")
+        return False
+    
+    inicio = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        futures = []
+        for idx, (x, y, w, h) in enumerate(tiles):
+            job_name = f"{image_name}_tile{idx:04d}"
+            work_dir = work_root / job_name
+            shutil.rmtree(work_dir, ignore_errors=True)
+            futures.append(pool.submit(_process_tile, base_dir, work_dir, job_name,
+                                       rgb[y:y + h, x:x + w], keep_work, sim_timeout, mode, wait,
+                                       checkpoint))
+        results = [future.result() for future in futures]
+    wall_time = time.perf_counter() - inicio
+    
+    print_tile_summary(image_path, tiles, results, wall_time, jobs)
+    if not all(r["ok"] for r in results):
+        return False
+    
+    # Remontar a imagem na resolução original
+    output = np.zeros((height, width), dtype=np.uint8)
+    for (x, y, w, h), r in zip(tiles, results):
+        output[y:y + h, x:x + w] = r["gray"]
+    
+    output_path = base_dir / "imagem_saida" / f"{image_name}_processada.png"
+    output_path.parent.mkdir(exist_ok=True)
+    Image.fromarray(output, "L").save(output_path)
+    print(f"📁 Imagem salva: {output_path}")
+    return True
+
+def print_batch_summary(results, wall_time, jobs):
+    """Resumo de throughput por imagem e agregado do modo em lote"""
+    print()
+    print("=" * 60)
+    print(f"📊 RESUMO DO LOTE ({jobs} jobs)")
+    print("=" * 60)
+    print(f"{'Imagem':<40} {'Status':>6} {'Pixels':>8} {'Tempo':>8} {'px/s':>10} {'Ciclos/px':>10}")
+    for r in results:
+        name = Path(r["image"]).name[:40]
+        status = "OK" if r["ok"] else "FALHA"
+        px_s = r["pixels"] / r["elapsed"] if r["elapsed"] > 0 else 0.0
+        cpp = cycles_per_pixel(r["cycles"], r["pixels"])
+        cpp = f"{cpp:.1f}" if cpp is not None else "-"
+        print(f"{name:<40} {status:>6} {r['pixels']:>8} {r['elapsed']:>7.2f}s {px_s:>10.0f} {cpp:>10}")
+    
+    ok = [r for r in results if r["ok"]]
+    total_pixels = sum(r["pixels"] for r in ok)
+    serial_time = sum(r["elapsed"] for r in results)
+    print("-" * 60)
+    print(f"✅ Sucesso: {len(ok)}/{len(results)} imagens")
+    print(f"⏱️  Tempo de parede: {wall_time:.2f}s (soma dos jobs: {serial_time:.2f}s)")
+    if wall_time > 0:
+        print(f"⚡ Throughput: {len(ok) / wall_time:.2f} imagens/s, {total_pixels / wall_time:.0f} pixels/s")
+        print(f"🚀 Speedup sobre execução serial: {serial_time / wall_time:.2f}x")
+    
+    failed = [r for r in results if not r["ok"]]
+    for r in failed:
+        print(f"❌ {r['image']}: veja {r['work_dir']}")
+
+def run_batch(base_dir, image_paths, jobs, work_root=None, keep_work=False, sim_timeout=None,
+              mode="pixel", wait="poll", checkpoint=False):
+    """Processa várias imagens em paralelo, cada uma no seu diretório de trabalho"""
+    base_dir = Path(base_dir).resolve()
+    work_root = Path(work_root).resolve() if work_root else base_dir / "temp_files" / "jobs"
+    work_root.mkdir(parents=True, exist_ok=True)
+    
+    # Verilar uma única vez antes de disparar os jobs; sem modelo, todos os
+    # jobs falhariam repetindo o mesmo build
+    try:
+        prepare_model(base_dir, mode, checkpoint)
+    except Exception as e:
+        print(f"❌ Erro ao preparar o modelo Verilator: {e}")
+        return [{"image": str(image_path), "ok": False, "pixels": 0, "cycles": None,
+                 "elapsed": 0.0, "timings": {}, "work_dir": str(work_root)}
+                for image_path in image_paths]
+    
+    results = []
+    inicio = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        futures = []
+        for idx, image_path in enumerate(image_paths):
+            job_name = f"{idx:03d}_{Path(image_path).stem}"
+            work_dir = work_root / job_name
+            shutil.rmtree(work_dir, ignore_errors=True)
+            futures.append(pool.submit(_process_job, base_dir, work_dir, job_name,
+                                       image_path, keep_work, sim_timeout, mode, wait, checkpoint))
+        for future in as_completed(futures):
+            results.append(future.result())
+    wall_time = time.perf_counter() - inicio
+    
+    # Manter a ordem de entrada no resumo
+    order = {str(p): i for i, p in enumerate(image_paths)}
+    results.sort(key=lambda r: order.get(r["image"], 0))
+    print_batch_summary(results, wall_time, jobs)
+    return results
+
+# Variantes medidas lado a lado por --mode compare: (rótulo, modo, espera)
+COMPARE_VARIANTS = (
+    ("Delay", "pixel", "delay"),
+    ("Poll", "pixel", "poll"),
+    ("Frame", "frame", "poll"),
+)
+
+def compare_modes(base_dir, image_paths, sim_timeout=None):
+    """
+    Processa cada imagem no modo pixel com espera fixa (delay) e com polling
+    do bit done, e no modo frame, comparando ciclos por pixel
+    """
+    comparacao = []
+    for image_path in image_paths:
+        linha = {"image": image_path}
+        for rotulo, mode, wait in COMPARE_VARIANTS:
+            pipeline = RS5ImagePipeline(base_dir, sim_timeout=sim_timeout, mode=mode, wait=wait)
+            ok = pipeline.process_image(image_path)
+            linha["pixels"] = pipeline.total_pixels
+            linha[rotulo] = pipeline.cycles if ok else None
             print()
+        comparacao.append(linha)
+    
+    rotulos = [rotulo for rotulo, _, _ in COMPARE_VARIANTS]
+    print("=" * 76)
+    print("📊 CICLOS POR PIXEL: PIXEL (DELAY) x PIXEL (POLL) x FRAME")
+    print("=" * 76)
+    print(f"{'Imagem':<28} {'Pixels':>8} " + " ".join(f"{r:>8}" for r in rotulos)
+          + f" {'Ganho poll':>10} {'Ganho frame':>11}")
+    for linha in comparacao:
+        cpp = {r: cycles_per_pixel(linha[r], linha["pixels"]) for r in rotulos}
+        texto = " ".join(f"{cpp[r]:>8.1f}" if cpp[r] is not None else f"{'FALHA':>8}"
+                         for r in rotulos)
+        speedup = {r: (f"{cpp['Delay'] / cpp[r]:.1f}x"
+                       if cpp["Delay"] is not None and cpp[r] else "-")
+                   for r in ("Poll", "Frame")}
+        print(f"{Path(linha['image']).name[:28]:<28} {linha['pixels']:>8} {texto} "
+              f"{speedup['Poll']:>10} {speedup['Frame']:>11}")
+    return all(linha[r] is not None for linha in comparacao for r in rotulos)
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Pipeline automático de processamento de imagem no RS5",
+        epilog="Exemplo: python3 pipeline_automatico.py --jobs 8 imagem_entrada/*.jpg")
+    parser.add_argument("images", nargs="+", help="Imagens de entrada")
+    parser.add_argument("-j", "--jobs", type=int, default=1,
+                        help="Número de imagens processadas em paralelo (padrão: 1, sequencial)")
+    parser.add_argument("--work-root", default=None,
+                        help="Diretório dos work dirs dos jobs (padrão: temp_files/jobs)")
+    parser.add_argument("--keep-work", action="store_true",
+                        help="Não apagar o work dir dos jobs concluídos com sucesso")
+    parser.add_argument("--timeout", type=int, default=None,
+                        help="Limite fixo de tempo simulado em ns (padrão: nenhum; a simulação "
+                             "termina quando o programa escreve em TOHOST, quando um watchdog "
+                             "dispara ou no teto de ciclos proporcional ao número de pixels)")
+    parser.add_argument("--mode", choices=MODES + ("compare",), default="pixel",
+                        help="pixel: um acesso MMIO por pixel; frame: plugin_image_processor "
+                             "processa o quadro inteiro; compare: roda pixel (delay e poll) e "
+                             "frame e compara ciclos por pixel")
+    parser.add_argument("--wait", choices=WAIT_MODES, default="poll",
+                        help="Espera pelo plugin no modo pixel: poll lê o bit done do CTRL; "
+                             "delay usa o laço fixo de espera (padrão: poll)")
+    parser.add_argument("--tile", nargs="?", const="auto", default=None,
+                        help="Processar em tiles: 'auto' ou LxA (imagens maiores que a "
+                             "RAM do RS5 usam tiles automaticamente)")
+    parser.add_argument("--checkpoint", action="store_true",
+                        help="Salvar o modelo (Verilator --savable) no marcador "
+                             f"{CHECKPOINT_SYMBOL}, antes da leitura da imagem, e retomar "
+                             "as imagens seguintes (de qualquer tamanho) desse checkpoint; "
+                             "o programa não tem crt0 nem newlib, então poupa só o reset e a "
+                             "espera pela carga da imagem (~30 ciclos por imagem)")
+    args = parser.parse_args()
+    
+    image_paths = []
+    for image_path in args.images:
+        if os.path.exists(image_path):
+            image_paths.append(image_path)
         else:
             print(f"❌ Imagem não encontrada: {image_path}")
+    
+    if args.mode == "compare":
+        sys.exit(0 if compare_modes(".", image_paths, args.timeout) else 1)
+    
+    # Imagens que não cabem na RAM (ou --tile) vão para o modo em tiles,
+    # com os --jobs paralelizando os tiles de cada imagem
+    tile_size = None
+    if args.tile and args.tile != "auto":
+        tile_size = tuple(int(v) for v in args.tile.lower().split("x"))
+    
+    grandes = [p for p in image_paths
+               if args.tile or np.prod(Image.open(p).size) > max_tile_pixels()]
+    image_paths = [p for p in image_paths if p not in grandes]
+    
+    ok_tiles = True
+    for image_path in grandes:
+        ok_tiles &= run_tiled(".", image_path, args.jobs, tile_size, args.work_root,
+                              args.keep_work, args.timeout, args.mode, args.wait, args.checkpoint)
+    if grandes and not image_paths:
+        sys.exit(0 if ok_tiles else 1)
+    
+    if args.jobs > 1:
+        results = run_batch(".", image_paths, args.jobs, args.work_root, args.keep_work,
+                            args.timeout, args.mode, args.wait, args.checkpoint)
+        sys.exit(0 if ok_tiles and all(r["ok"] for r in results) else 1)
+    
+    pipeline = RS5ImagePipeline(sim_timeout=args.timeout, mode=args.mode, wait=args.wait,
+                                checkpoint=args.checkpoint)
+    
+    oks = []
+    for image_path in image_paths:
+        oks.append(pipeline.process_image(image_path))
+        print()
+    sys.exit(0 if ok_tiles and all(oks) else 1)
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Conversão vetorizada de imagens para o formato de dados do RS5
+Cada pixel vira uma palavra little-endian 0xRRGGBBXX (XX = 0x00), montada
+com deslocamentos em NumPy e gravada com tofile, sem ints Python por pixel.
+"""
+
+import numpy as np
+from PIL import Image
+
+# Faixa de linhas usada no modo streaming
+BAND_ROWS = 256
+
+# Acima deste número de pixels os conversores passam a gravar por faixas
+STREAM_THRESHOLD_PIXELS = 1 << 20
+
+def pack_rgbx(rgb):
+    """
+    Empacota um array (..., 3) uint8 em palavras uint32 0xRRGGBB00
+
+    Returns:
+        Array uint32 little-endian achatado, pronto para tofile
+    """
+    rgb = np.asarray(rgb, dtype=np.uint8)
+    words = rgb[..., 0].astype("<u4") << 24
+    words |= rgb[..., 1].astype("<u4") << 16
+    words |= rgb[..., 2].astype("<u4") << 8
+    return words.reshape(-1)
+
+def iter_bands(image, band_rows=BAND_ROWS):
+    """Percorre a imagem em faixas de band_rows linhas já em RGB"""
+    width, height = image.size
+    for top in range(0, height, band_rows):
+        band = image.crop((0, top, width, min(top + band_rows, height)))
+        if band.mode != "RGB":
+            band = band.convert("RGB")
+        yield np.asarray(band)
+
+def write_rs5_bin(image, bin_path, band_rows=None):
+    """
+    Grava a imagem no formato RS5
+
+    Args:
+        image: Imagem PIL (qualquer modo; convertida para RGB)
+        bin_path: Arquivo binário de saída
+        band_rows: None grava a imagem inteira em um único tofile; um inteiro
+                   grava faixas de band_rows linhas (modo streaming)
+
+    Returns:
+        As primeiras palavras gravadas (até 10), para o arquivo de informações
+    """
+    if band_rows is None:
+        if image.mode != "RGB":
+            image = image.convert("RGB")
+        words = pack_rgbx(np.asarray(image))
+        words.tofile(bin_path)
+        return words[:10].copy()
+
+    sample = None
+    with open(bin_path, "wb") as f:
+        for rgb in iter_bands(image, band_rows):
+            words = pack_rgbx(rgb)
+            words.tofile(f)
+            if sample is None:
+                sample = words[:10].copy()
+    return sample if sample is not None else np.zeros(0, dtype="<u4")
+
+def write_info(info_path, image_path, width, height, sample):
+    """Grava o arquivo de informações da imagem convertida"""
+    with open(info_path, "w") as f:
+        f.write(f"Original: {image_path}\n")
+        f.write(f"Dimensions: {width}x{height}\n")
+        f.write(f"Total pixels: {width * height}\n")
+        f.write(f"Data format: 0xRRGGBBXX per pixel\n\n")
+        f.write("Sample pixels:\n")
+
+        # Mostrar alguns pixels de exemplo
+        for i, pixel_val in enumerate(int(w) for w in sample):
+            row = i // width
+            col = i % width
+            r = (pixel_val >> 24) & 0xFF
+            g = (pixel_val >> 16) & 0xFF
+            b = (pixel_val >> 8) & 0xFF
+            f.write(f"Pixel[{i}] ({col},{row}): RGB({r},{g},{b}) = 0x{pixel_val:08X}\n")
+
+def convert_image(image, bin_path, info_path=None, image_path=None, band_rows=None):
+    """
+    Converte uma imagem PIL já aberta para os arquivos do RS5
+
+    Se band_rows não for informado, imagens acima de STREAM_THRESHOLD_PIXELS
+    são gravadas por faixas de BAND_ROWS linhas.
+
+    Returns:
+        (width, height, total_pixels)
+    """
+    width, height = image.size
+    if band_rows is None and width * height > STREAM_THRESHOLD_PIXELS:
+        band_rows = BAND_ROWS
+
+    sample = write_rs5_bin(image, bin_path, band_rows)
+    if info_path is not None:
+        write_info(info_path, image_path, width, height, sample)
+    return width, height, width * height
@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+"""
+Leitura do buffer de resultados despejado pelo testbench do RS5
+O testbench grava a região RESULT_DATA_ADDR da RAM em um binário bruto
+(little-endian, uma palavra 0xGGGGGG00 por pixel) ao final da simulação.
+"""
+
+import sys
+import numpy as np
+
+def load_result_dump(dump_path, total_pixels, validate=True):
+    """
+    Carrega o dump sem cópia (memmap) e devolve os pixels em escala de cinza
+
+    Args:
+        dump_path: Arquivo gerado pelo testbench (+RESULT_FILE)
+        total_pixels: Número de pixels esperados
+        validate: Conferir se as palavras seguem o formato 0xGGGGGG00
+
+    Returns:
+        (gray, invalid): array uint8 com total_pixels valores e o número de
+        palavras fora do formato esperado
+    """
+    words = np.memmap(dump_path, dtype=np.uint8, mode="r")
+    num_words = min(total_pixels, len(words) // 4)
+
+    # Visão (num_words, 4) dos bytes; em little-endian o byte 3 é G[31:24]
+    lanes = words[:num_words * 4].reshape(num_words, 4)
+
+    gray = np.zeros(total_pixels, dtype=np.uint8)
+    gray[:num_words] = lanes[:, 3]
+
+    invalid = 0
+    if validate and num_words:
+        bad = (lanes[:, 0] != 0) | (lanes[:, 1] != lanes[:, 3]) | (lanes[:, 2] != lanes[:, 3])
+        invalid = int(np.count_nonzero(bad))
+
+    return gray, invalid
+
+def main():
+    if len(sys.argv) != 3:
+        print("Uso: python3 rs5_results.py <result_data.bin> <total_pixels>")
+        sys.exit(1)
+
+    gray, invalid = load_result_dump(sys.argv[1], int(sys.argv[2]))
+    print(f"📈 Pixels: {len(gray)}, Min: {gray.min()}, Max: {gray.max()}, Média: {gray.mean():.1f}")
+    print(f"🔍 Palavras fora do formato 0xGGGGGG00: {invalid}")
+
+if __name__ == "__main__":
+    main()
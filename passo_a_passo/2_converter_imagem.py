@@ -9,6 +9,9 @@ import sys
 from pathlib import Path
 from PIL import Image
 
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "image_processing" / "scripts"))
+from rs5_image import convert_image
+
 def ler_imagem_selecionada():
     """Lê qual imagem foi selecionada no passo anterior"""
     if not os.path.exists("imagem_selecionada.txt"):
@@ -51,46 +54,16 @@ def converter_imagem(imagem_path):
     processed_image.save(redimensionada_path)
     print(f"🖼️  Imagem redimensionada salva: {redimensionada_path}")
     
-    # Extrair dados RGB
-    rgb_data = []
-    pixel_data = list(processed_image.getdata())
-    
-    for i, (r, g, b) in enumerate(pixel_data):
-        # Formato: 0xRRGGBBXX (X = padding)
-        pixel_value = (r << 24) | (g << 16) | (b << 8) | 0x00
-        rgb_data.append(pixel_value)
-    
-    print(f"✅ Dados RGB extraídos: {len(rgb_data)} pixels")
-    
-    # Salvar arquivo binário
+    # Empacotar 0xRRGGBBXX com NumPy e gravar (por faixas em imagens grandes)
     os.makedirs("../binarios", exist_ok=True)
+    os.makedirs("../temp_files", exist_ok=True)
     bin_filename = f"../binarios/current_image.bin"
-    with open(bin_filename, 'wb') as f:
-        for pixel_value in rgb_data:
-            f.write(pixel_value.to_bytes(4, byteorder='little'))
+    info_filename = f"../temp_files/current_image_info.txt"
+    convert_image(processed_image, bin_filename, info_filename, imagem_path)
     
+    print(f"✅ Dados RGB extraídos: {total_pixels} pixels")
     print(f"💾 Arquivo binário salvo: {bin_filename}")
     
-    # Salvar arquivo de informações
-    os.makedirs("../temp_files", exist_ok=True)
-    info_filename = f"../temp_files/current_image_info.txt"
-    with open(info_filename, 'w') as f:
-        f.write(f"Original: {imagem_path}\n")
-        f.write(f"Dimensions: {width}x{height}\n")
-        f.write(f"Total pixels: {total_pixels}\n")
-        f.write(f"Data format: 0xRRGGBBXX per pixel\n\n")
-        f.write("Sample pixels:\n")
-        
-        # Mostrar alguns pixels de exemplo
-        for i in range(min(10, len(rgb_data))):
-            row = i // width
-            col = i % width
-            pixel_val = rgb_data[i]
-            r = (pixel_val >> 24) & 0xFF
-            g = (pixel_val >> 16) & 0xFF
-            b = (pixel_val >> 8) & 0xFF
-            f.write(f"Pixel[{i}] ({col},{row}): RGB({r},{g},{b}) = 0x{pixel_val:08X}\n")
-    
     print(f"📄 Arquivo de informações salvo: {info_filename}")
     
     return width, height, total_pixels
@@ -47,6 +47,7 @@ def gerar_programa_c(width, height, total_pixels):
 #define PLUGIN_UNUSED_ADDR 0x10000004  // Parâmetro não usado  
 #define PLUGIN_GRAY_ADDR  0x10000008  // Resultado P&B: 0xGGGGGG00
 #define PLUGIN_CTRL_ADDR  0x1000000C  // Controle/Status
+#define PLUGIN_STATUS_DONE 0x2         // bit 1: done (fica em 1 até o próximo start)
 
 // Endereços de dados da imagem na RAM
 #define IMAGE_DATA_ADDR   0x00001000  // Onde carregar dados da imagem
@@ -54,18 +55,27 @@ def gerar_programa_c(width, height, total_pixels):
 
 // Função para aguardar conclusão do plugin
 void wait_plugin_ready() {{
-    // Aguardar alguns ciclos para plugin processar
-    for (volatile int i = 0; i < 10; i++);
+    // Aguardar o bit done do registrador de controle
+    volatile unsigned int* plugin_ctrl = (volatile unsigned int*)PLUGIN_CTRL_ADDR;
+    while (!(*plugin_ctrl & PLUGIN_STATUS_DONE));
 }}
 
 // Função simples para print via UART
 void print_uart(const char* str) {{
-    volatile unsigned int* uart_base = (volatile unsigned int*)0x80000000;
+    volatile unsigned int* uart_base = (volatile unsigned int*)0x80001000;
     while (*str) {{
         *uart_base = *str++;
     }}
 }}
 
+// Encerra a simulação com um código de saída (0 = sucesso)
+void exit_sim(unsigned int code) {{
+    volatile unsigned int* tohost = (volatile unsigned int*)0x80000000;
+    while (1) {{
+        *tohost = code;
+    }}
+}}
+
 int main() {{
     // Ponteiros para dados de entrada e saída
     volatile unsigned int* input_ptr = (volatile unsigned int*)IMAGE_DATA_ADDR;
@@ -95,8 +105,9 @@ int main() {{
         *(output_ptr + i) = gray_pixel;
     }}
     
-    // Sinalizar conclusão
+    // Sinalizar conclusão e encerrar a simulação
     print_uart("IMAGE_PROCESSING_COMPLETE\\n");
+    exit_sim(0);
     
     return 0;
 }}
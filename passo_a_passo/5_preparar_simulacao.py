@@ -1,15 +1,17 @@
 #!/usr/bin/env python3
 """
 PASSO 5: Preparar Simulação
-Converte arquivos binários para hex e prepara para simulação no Verilator
+Converte o programa para hex e copia os dados da imagem (binários) para a simulação
 """
 
 import os
 import sys
-import subprocess
 import shutil
 from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "sim"))
+import memimage
+
 def verificar_arquivos():
     """Verifica se todos os arquivos necessários existem"""
     arquivos = {
@@ -42,24 +44,10 @@ def converter_bin_para_hex(bin_file, hex_file):
     print(f"🔄 Convertendo {bin_file} -> {hex_file}")
     
     try:
-        # Usar o script bin_to_hex.py
-        script_path = "/Users/joaocarlosbrittofilho/Documents/doutorado/RS5_ultimo/image_processing/scripts/bin_to_hex.py"
-        python_exec = "/Users/joaocarlosbrittofilho/Documents/doutorado/RS5_ultimo/.venv/bin/python"
-        cmd = [python_exec, script_path, bin_file, hex_file]
-        
-        result = subprocess.run(cmd, capture_output=True, text=True)
-        
-        if result.returncode == 0:
-            if os.path.exists(hex_file):
-                tamanho = os.path.getsize(hex_file)
-                print(f"✅ Convertido: {hex_file} ({tamanho} bytes)")
-                return True
-            else:
-                print(f"❌ Arquivo hex não foi criado: {hex_file}")
-                return False
-        else:
-            print(f"❌ Erro na conversão: {result.stderr}")
-            return False
+        memimage.convert(bin_file, hex_file, src_fmt="bin", dst_fmt="hex")
+        tamanho = os.path.getsize(hex_file)
+        print(f"✅ Convertido: {hex_file} ({tamanho} bytes)")
+        return True
             
     except Exception as e:
         print(f"❌ Erro ao converter: {e}")
@@ -75,11 +63,6 @@ def preparar_simulacao(arquivos):
     if not converter_bin_para_hex(arquivos["programa"], programa_hex):
         return False
     
-    # Converter dados da imagem para hex
-    dados_hex = "../binarios/current_image.hex"
-    if not converter_bin_para_hex(arquivos["dados"], dados_hex):
-        return False
-    
     # Criar diretório sim se não existir
     sim_dir = Path("../sim")
     sim_dir.mkdir(exist_ok=True)
@@ -93,9 +76,9 @@ def preparar_simulacao(arquivos):
         shutil.copy(programa_hex, sim_dir / "program.hex")
         print(f"✅ Copiado: program.hex")
         
-        # Copiar dados da imagem  
-        shutil.copy(dados_hex, sim_dir / "test_image_data.hex")
-        print(f"✅ Copiado: test_image_data.hex")
+        # Copiar dados da imagem em binário (o testbench carrega com $fread)
+        shutil.copy(arquivos["dados"], sim_dir / "test_image_data.bin")
+        print(f"✅ Copiado: test_image_data.bin")
         
         return True
         
@@ -134,7 +117,7 @@ def main():
         print()
         print("📁 ARQUIVOS NA PASTA SIM:")
         sim_dir = Path("../sim")
-        for arquivo in ["program.hex", "test_image_data.hex"]:
+        for arquivo in ["program.hex", "test_image_data.bin"]:
             caminho = sim_dir / arquivo
             if caminho.exists():
                 tamanho = caminho.stat().st_size
@@ -143,8 +126,6 @@ def main():
         print()
         print("🔍 VERIFICAÇÃO DOS ARQUIVOS HEX:")
         mostrar_conteudo_hex("../sim/program.hex", 3)
-        print()
-        mostrar_conteudo_hex("../sim/test_image_data.hex", 3)
         
         print()
         print("✅ PRONTO PARA SIMULAÇÃO!")
@@ -10,10 +10,13 @@ import subprocess
 import time
 from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "sim"))
+from model_cache import read_exit_status
+
 def verificar_arquivos_sim():
     """Verifica se arquivos da simulação estão prontos"""
     sim_dir = Path("../sim")
-    arquivos = ["program.hex", "test_image_data.hex"]
+    arquivos = ["program.hex", "test_image_data.bin"]
     
     faltando = []
     for arquivo in arquivos:
@@ -52,13 +55,20 @@ def executar_verilator(sim_dir):
         
         print("-" * 50)
         
-        if result.returncode == 0:
-            print("✅ Simulação concluída com sucesso!")
-            return True
-        else:
-            print(f"⚠️  Simulação terminou com código: {result.returncode}")
-            print("   (Isso pode ser normal - timeout do testbench)")
-            return True
+        # O testbench registra como a simulação terminou (tohost, watchdog ou timeout)
+        status = read_exit_status(sim_dir / "results" / "exit_status.txt")
+        if status is None:
+            print(f"❌ Simulação terminou sem estado de término (código {result.returncode})")
+            return False
+        if status["status"] != "DONE":
+            print(f"❌ Simulação interrompida: {status['status']} em {status['time_ns']} ns")
+            return False
+        if status["exit_code"] != 0:
+            print(f"❌ Programa terminou com código de saída {status['exit_code']}")
+            return False
+        
+        print(f"✅ Simulação concluída com sucesso em {status['time_ns']} ns!")
+        return True
             
     except Exception as e:
         print(f"❌ Erro na simulação: {e}")
@@ -74,14 +84,15 @@ def analisar_log():
     print("📋 ETAPAS EXECUTADAS:")
     print("   1. 🔄 Verilator compilou o design do RS5 + plugin")
     print("   2. 🔧 Carregou program.hex na memória (código RISC-V)")
-    print("   3. 📊 Carregou test_image_data.hex na memória (dados da imagem)")
+    print("   3. 📊 Carregou test_image_data.bin na memória ($fread) (dados da imagem)")
     print("   4. ▶️  Iniciou simulação do processador RS5")
     print("   5. 🖼️  Programa C executou no RS5:")
     print("      - Leu cada pixel RGB da memória")
     print("      - Enviou para plugin hardware (0x10000000)")
     print("      - Plugin converteu RGB → Grayscale usando (R+G+B)/4")
     print("      - Resultado salvo na memória de saída")
-    print("   6. ⏰ Simulação terminou por timeout ou conclusão")
+    print("   6. 🏁 Programa escreveu o código de saída em 0x80000000 (tohost)")
+    print("      - ou o watchdog parou a simulação se nenhuma instrução foi retirada")
     
     print()
     print("🔬 SINAIS IMPORTANTES NO LOG:")
@@ -98,7 +109,7 @@ def main():
     sim_dir = verificar_arquivos_sim()
     
     print("📁 Arquivos de simulação verificados:")
-    for arquivo in ["program.hex", "test_image_data.hex"]:
+    for arquivo in ["program.hex", "test_image_data.bin"]:
         caminho = sim_dir / arquivo
         tamanho = caminho.stat().st_size
         print(f"   ✅ {arquivo} ({tamanho} bytes)")
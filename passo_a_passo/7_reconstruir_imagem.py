@@ -10,6 +10,9 @@ import numpy as np
 from PIL import Image
 from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "image_processing" / "scripts"))
+from rs5_results import load_result_dump
+
 def ler_info_imagem():
     """Lê informações da imagem processada"""
     info_path = "../temp_files/current_image_info.txt"
@@ -39,47 +42,21 @@ def extrair_dados_processados(width, height, total_pixels):
     
     print("📊 Extraindo resultados da simulação...")
     
-    # NOTA: Em uma implementação real, leríamos os dados processados
-    # da memória de saída do RS5 ou do log da simulação.
-    # Por enquanto, simulamos aplicando o mesmo algoritmo do hardware.
-    
-    print("⚠️  NOTA: Aplicando algoritmo do hardware - (R+G+B)/4")
+    # O testbench despeja a região RESULT_DATA_ADDR da RAM do RS5 ao final
+    # da simulação; lemos esse dump diretamente (sem recalcular em Python)
+    dump_path = "../sim/results/result_data.bin"
     
-    bin_path = "../binarios/current_image.bin"
-    
-    if not os.path.exists(bin_path):
-        print(f"❌ Arquivo de dados não encontrado: {bin_path}")
+    if not os.path.exists(dump_path):
+        print(f"❌ Dump de resultados não encontrado: {dump_path}")
+        print("   Execute primeiro: python3 6_executar_verilator.py")
         sys.exit(1)
     
-    with open(bin_path, "rb") as f:
-        raw_data = f.read()
-    
-    num_pixels = len(raw_data) // 4
-    pixels_processados = []
-    
-    print(f"🔢 Processando {min(total_pixels, num_pixels)} pixels...")
-    
-    for i in range(min(total_pixels, num_pixels)):
-        offset = i * 4
-        r = raw_data[offset]
-        g = raw_data[offset + 1] 
-        b = raw_data[offset + 2]
-        
-        # Aplicar algoritmo do plugin de hardware: (R+G+B)/4
-        gray = (r + g + b) // 4
-        pixels_processados.append(gray)
-        
-        # Mostrar progresso a cada 10000 pixels
-        if (i + 1) % 10000 == 0:
-            progresso = (i + 1) / total_pixels * 100
-            print(f"   📈 Progresso: {i+1:,}/{total_pixels:,} pixels ({progresso:.1f}%)")
+    print(f"🔢 Lendo {total_pixels:,} pixels de {dump_path}...")
     
-    # Preencher com zeros se necessário
-    while len(pixels_processados) < total_pixels:
-        pixels_processados.append(0)
+    pixels_processados, invalidos = load_result_dump(dump_path, total_pixels)
     
-    # Truncar se necessário
-    pixels_processados = pixels_processados[:total_pixels]
+    if invalidos:
+        print(f"⚠️  {invalidos} palavras fora do formato 0xGGGGGG00")
     
     print(f"✅ Dados extraídos: {len(pixels_processados)} pixels")
     
@@ -1,32 +1,22 @@
 #!/usr/bin/env python3
 
+import sys
 from argparse import ArgumentParser
+from pathlib import Path
 
-def build_coi(input_file):
-    with open(input_file, "rb") as file_in:
-        rd = file_in.read(-1)
-        byteArray = bytearray(rd)
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "sim"))
+import memimage
 
-        while len(byteArray) < 65536:
-            byteArray.append(0)
-
-    with open("./memimage.coe", "w") as file_out:
-        file_out.write("memory_initialization_radix=16;\n")
-        file_out.write("memory_initialization_vector=\n")
-
-        for i in range(0, len(byteArray)-4, 4):
-            file_out.write(str(hex(byteArray[i+3])[2:].zfill(2)))
-            file_out.write(str(hex(byteArray[i+2])[2:].zfill(2)))
-            file_out.write(str(hex(byteArray[i+1])[2:].zfill(2)))
-            file_out.write(str(hex(byteArray[i+0])[2:].zfill(2)))
-            file_out.write(",\n")
-
-        file_out.write("00000000;")
+def build_coi(input_file, output_file="./memimage.coe", size=65536):
+    memimage.convert(input_file, output_file, src_fmt="bin", dst_fmt="coe", size=size)
 
 if __name__ == "__main__":
     parser = ArgumentParser(description="Converts binary file to COE file")
     parser.add_argument("input_file", help="Input binary file")
+    parser.add_argument("-o", "--output", default="./memimage.coe", help="Output COE file")
+    parser.add_argument("--size", type=lambda v: int(v, 0), default=65536,
+                        help="Memory size in bytes (default: 65536)")
 
     args = parser.parse_args()
 
-    build_coi(args.input_file)
+    build_coi(args.input_file, args.output, args.size)
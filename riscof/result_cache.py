@@ -0,0 +1,111 @@
+"""
+Content-hash cache of riscof test signatures, shared by the rs5 and
+sail_cSim plugins.
+
+A signature is stored under a key built from everything that can change it:
+the test source and its macros, the ISA string, the headers of the arch-test
+and plugin environments, the toolchain version and a model fingerprint (the
+RS5 model cache key, which covers the RTL tree and testbench parameters, or
+the Sail executable and its options). On a hit the plugin copies the stored
+signature into the test directory and leaves the test out of its Makefile.
+
+The cache directory comes from the RESULT_CACHE environment variable (set by
+riscof/Makefile); an empty value disables the cache.
+"""
+
+import os
+import shutil
+import hashlib
+import logging
+import subprocess
+
+logger = logging.getLogger()
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "result_cache")
+
+
+def file_hash(path):
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+def tree_hash(*dirs):
+    """Hash of every file below dirs (names and contents)"""
+    h = hashlib.sha256()
+    for d in dirs:
+        for root, subdirs, files in os.walk(d):
+            subdirs[:] = sorted(s for s in subdirs if s != "__pycache__")
+            for name in sorted(files):
+                path = os.path.join(root, name)
+                h.update(os.path.relpath(path, d).encode() + b"\0")
+                h.update(file_hash(path).encode())
+    return h.hexdigest()
+
+
+def tool_version(cmd):
+    """First line of `cmd --version`, or 'unknown' if it cannot be run"""
+    try:
+        out = subprocess.run([cmd, "--version"], capture_output=True, text=True)
+        lines = (out.stdout or out.stderr).splitlines()
+        return lines[0] if lines else "unknown"
+    except OSError:
+        return "unknown"
+
+
+class ResultCache:
+    def __init__(self, plugin, fingerprint, cache_dir=None):
+        """
+        plugin: name of the plugin (separate namespace per model)
+        fingerprint: strings that identify the model and toolchain of this run
+        """
+        if cache_dir is None:
+            cache_dir = os.environ.get("RESULT_CACHE", DEFAULT_CACHE_DIR)
+        self.enabled = bool(cache_dir)
+        self.cache_dir = os.path.join(os.path.abspath(cache_dir), plugin) if cache_dir else ""
+        self.salt = hashlib.sha256("\0".join(fingerprint).encode()).hexdigest()
+        self.hits = 0
+        self.misses = 0
+
+    def key(self, test_path, macros, isa):
+        """Key of one test of the suite"""
+        h = hashlib.sha256(self.salt.encode())
+        h.update(file_hash(test_path).encode())
+        h.update("\0".join(sorted(macros)).encode())
+        h.update(b"\0" + isa.lower().encode())
+        return h.hexdigest()
+
+    def path(self, key):
+        return os.path.join(self.cache_dir, key[:2], key + ".signature")
+
+    def fetch(self, key, sig_file):
+        """Copies the cached signature to sig_file; returns False on a miss"""
+        if not self.enabled:
+            return False
+        cached = self.path(key)
+        if not os.path.exists(cached):
+            self.misses += 1
+            return False
+        os.makedirs(os.path.dirname(sig_file), exist_ok=True)
+        shutil.copyfile(cached, sig_file)
+        self.hits += 1
+        return True
+
+    def store_cmd(self, key, sig_file):
+        """
+        Shell command appended to the test's make target that stores its
+        signature once the run produced one (atomic rename, safe with -j)
+        """
+        if not self.enabled:
+            return ''
+        cached = self.path(key)
+        tmp = f'{cached}.tmp.$$$$'
+        return (f'if [ -s {sig_file} ]; then mkdir -p {os.path.dirname(cached)} && '
+                f'cp {sig_file} {tmp} && mv {tmp} {cached}; fi')
+
+    def report(self, name):
+        if self.enabled:
+            logger.info(f"{name}: {self.hits} signatures reused from {self.cache_dir}, "
+                        f"{self.misses} tests to run")
@@ -193,7 +193,13 @@ module riscof_tb
         .weB_i      (mem_write_enable),
         .addrB_i    (mem_address[($clog2(MEM_WIDTH) - 1):0]),
         .dataB_i    (mem_data_write),
-        .dataB_o    (data_ram)
+        .dataB_o    (data_ram),
+
+        .enC_i      (1'b0),
+        .weC_i      (4'h0),
+        .addrC_i    ('0),
+        .dataC_i    (32'h00000000),
+        .dataC_o    ()
     );
 
 //////////////////////////////////////////////////////////////////////////////
@@ -243,19 +249,31 @@ module riscof_tb
 
     int fd;
 
+    /* Per-test values come from plusargs so that one verilated model runs
+     * every test of a configuration; the parameters are only the defaults */
+    logic [31:0] sig_start   = SIG_START;
+    logic [31:0] sig_end     = SIG_END;
+    logic [31:0] tohost_addr = TOHOST_ADDR;
+    string       sig_path    = SIG_PATH;
+
     always_ff @(posedge clk) begin
-        if (mem_address == TOHOST_ADDR && mem_write_enable != '0)
+        if (mem_address == tohost_addr && mem_write_enable != '0)
             $finish();
     end
 
     initial begin
-        fd = $fopen(SIG_PATH, "w");
+        void'($value$plusargs("SIG_START=%h", sig_start));
+        void'($value$plusargs("SIG_END=%h", sig_end));
+        void'($value$plusargs("TOHOST_ADDR=%h", tohost_addr));
+        void'($value$plusargs("SIG_PATH=%s", sig_path));
+
+        fd = $fopen(sig_path, "w");
         #10ms;
         $finish();
     end
 
     final begin
-        for (int i = SIG_START; i < SIG_END; i=i+4)
+        for (int i = sig_start; i < sig_end; i=i+4)
             $fwrite(fd, "%x\n", {RAM_MEM.RAM[i+3],RAM_MEM.RAM[i+2],RAM_MEM.RAM[i+1],RAM_MEM.RAM[i]});
         $fclose(fd);
         $display("# %t END OF SIMULATION",$time);
@@ -1,12 +1,21 @@
 import os
 import re
-import subprocess
+import sys
 import logging
 from multiprocessing import cpu_count
 
 import riscof.utils as utils
 from riscof.pluginTemplate import pluginTemplate
 
+# Verilated models are shared with the other sim/ tools through the model cache
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'sim'))
+from model_cache import ModelCache, DEFAULT_FLAGS, model_key
+import elfreader
+
+# Signature cache shared with the reference plugin
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from result_cache import ResultCache, file_hash, tree_hash, tool_version
+
 logger = logging.getLogger()
 
 class rs5(pluginTemplate):
@@ -24,7 +33,7 @@ class rs5(pluginTemplate):
             raise SystemExit(1)
 
         # Number of parallel jobs that can be spawned off by RISCOF
-        self.num_jobs = str(cpu_count())
+        self.num_jobs = os.environ.get('RISCOF_JOBS', str(cpu_count()))
 
         # Path to the directory where this python file is located
         self.pluginpath=os.path.abspath(config['pluginpath'])
@@ -48,6 +57,9 @@ class rs5(pluginTemplate):
         # capture the architectural test-suite directory.
         self.suite_dir = suite
 
+        # capture the test environment headers (part of the result cache key)
+        self.archtest_env = archtest_env
+
         # Note the march is not hardwired here, because it will change for each test
         self.compile_cmd = self.triplet + '-gcc -march={0} \
             -static -mcmodel=medany -fvisibility=hidden -nostdlib -nostartfiles -g\
@@ -55,13 +67,14 @@ class rs5(pluginTemplate):
             -I '+self.pluginpath+'/env/\
             -I ' + archtest_env + ' {2} -o {3} {4}'
         
-        # set up the simulation command
-        dut_dir = self.pluginpath + '/../../'
-        self.verilatecmd = f'verilator --cc --exe --binary --timescale 1ns/1ns -j 0\
-            -I{dut_dir}/rtl/\
-            -I{dut_dir}/sim/\
-            -I{dut_dir}/rtl/aes\
-            {dut_dir}/riscof/riscof_tb.sv'
+        # set up the testbench and include paths used to verilate the model
+        dut_dir = os.path.abspath(self.pluginpath + '/../../')
+        self.tb_path = os.path.join(dut_dir, 'riscof', 'riscof_tb.sv')
+        self.include_dirs = (
+            os.path.join(dut_dir, 'rtl'),
+            os.path.join(dut_dir, 'sim'),
+            os.path.join(dut_dir, 'rtl', 'aes'),
+        )
 
     def build(self, isa_yaml, platform_yaml):
         # load the isa yaml as a dictionary in python.
@@ -75,42 +88,66 @@ class rs5(pluginTemplate):
         if "I" not in ispec["ISA"]:
             print("ISA should contain I.")
             raise SystemExit(1)
-        if "M" in ispec["ISA"]:
-            self.verilatecmd += " -GMEnable=1\\'b1"
-        if "A" in ispec["ISA"]:
-            self.verilatecmd += " -GAEnable=1\\'b1"
-        if "C" in ispec["ISA"]:
-            self.verilatecmd += " -GCOMPRESSED=1\\'b1"
         if "U" not in ispec["ISA"]:
             print("ISA should contain U.")
             raise SystemExit(1)
-        if "Zicond" in ispec["ISA"]:
-            self.verilatecmd += " -GZICONDEnable=1\\'b1"
         if "Zicsr" not in ispec["ISA"]:
             print("ISA should contain Zicsr.")
             raise SystemExit(1)
-        if "Zihpm" in ispec["ISA"]:
-            self.verilatecmd += " -GHPMCOUNTEREnable=1\\'b1"
-        if "Zkne" in ispec["ISA"]:
-            self.verilatecmd += " -GZKNEEnable=1\\'b1"
-        if "Zcb" in ispec["ISA"]:
-            self.verilatecmd += " -GZCBEnable=1\\'b1"
 
-        self.verilatecmd += " -GBRANCHPRED=1\\'b" + os.environ["BRANCHPRED"]
-        self.verilatecmd += " -GFORWARDING=1\\'b" + os.environ["FORWARDING"]
+        # testbench parameters for this (ISA, BRANCHPRED, FORWARDING) configuration
+        self.params = {
+            "MEnable":          "M" in ispec["ISA"],
+            "AEnable":          "A" in ispec["ISA"],
+            "COMPRESSED":       "C" in ispec["ISA"],
+            "ZICONDEnable":     "Zicond" in ispec["ISA"],
+            "HPMCOUNTEREnable": "Zihpm" in ispec["ISA"],
+            "ZKNEEnable":       "Zkne" in ispec["ISA"],
+            "ZCBEnable":        "Zcb" in ispec["ISA"],
+            "BRANCHPRED":       os.environ["BRANCHPRED"] == "1",
+            "FORWARDING":       os.environ["FORWARDING"] == "1",
+        }
+
+        # Verilate once here; every test reuses the model and only passes its
+        # signature bounds, tohost address and signature path as plusargs
+        if self.target_run:
+            cache = ModelCache(log=logger.info)
+            self.sim_exe = str(cache.get(self.tb_path, self.params, include_dirs=self.include_dirs))
 
         self.compile_cmd = self.compile_cmd+' -mabi='+('lp64 ' if 64 in ispec['supported_xlen'] else 'ilp32 ')
 
-    def runTests(self, testList):
-        # Delete Makefile if it already exists.
-        if os.path.exists(self.work_dir+ "/Makefile." + self.name[:-1]):
-            os.remove(self.work_dir+ "/Makefile." + self.name[:-1])
-        
-        # create an instance the makeUtil class that we will use to create targets.
-        make = utils.makeUtil(makefilePath=os.path.join(self.work_dir, "Makefile." + self.name[:-1]))
-
-        # set the make command that will be used
+        # signatures only change with the test, the toolchain or the model
+        # (RTL tree + testbench parameters, i.e. the model cache key)
+        if self.target_run:
+            self.result_cache = ResultCache(self.name[:-1], [
+                model_key(self.tb_path, self.params, flags=DEFAULT_FLAGS, include_dirs=self.include_dirs),
+                tool_version(self.triplet + '-gcc'),
+                tree_hash(self.archtest_env, self.pluginpath + '/env'),
+                file_hash(os.path.abspath(__file__)),
+                self.compile_cmd,
+            ])
+
+    # Symbols riscof_tb needs, as plusarg: ELF symbol
+    SYMBOLS = {
+        "SIG_START":   "begin_signature",
+        "SIG_END":     "end_signature",
+        "TOHOST_ADDR": "tohost",
+    }
+
+    def makefile(self, suffix=''):
+        # a fresh Makefile.<name><suffix> in the work directory
+        path = os.path.join(self.work_dir, "Makefile." + self.name[:-1] + suffix)
+        if os.path.exists(path):
+            os.remove(path)
+        make = utils.makeUtil(makefilePath=path)
         make.makeCommand = 'make -k -j' + self.num_jobs
+        return make
+
+    def runTests(self, testList):
+        # tests are compiled in parallel first, so that their symbols and
+        # memory images can be read here, in-process, before the simulations
+        compile_make = self.makefile('.compile')
+        compiled = []
 
         # we will iterate over each entry in the testList
         for testname in testList:
@@ -135,50 +172,53 @@ class rs5(pluginTemplate):
             # substitute all variables in the compile command
             cmd = self.compile_cmd.format(testentry['isa'].lower(), self.xlen, test, elf, compile_macros)
 
+            key = None
             if self.target_run:
-                subprocess.run(cmd.split())
-                symbols = subprocess.check_output([self.triplet+"-readelf", elf, "-s"]).split(b'\n')[3:]
-
-                tohost_addr = ""
-                signature_start = ""
-                signature_end = ""
-
-                for line in symbols[:-1]: 
-                    l = line.split()
-                    addr = l[1]
-                    sym = l[-1]
-
-                    if sym == b'tohost':
-                        tohost_addr = addr.decode('utf-8')
-                    elif sym == b'begin_signature':
-                        signature_start = addr.decode('utf-8')
-                    elif sym == b'end_signature':
-                        signature_end = addr.decode('utf-8')
-
-                # generate .bin
-                objcopycmd = f'{self.triplet}-objcopy {elf} test.bin -O binary' 
-
-                verilatecmd = self.verilatecmd + f"\
-                    -GSIG_START=32\\'h{signature_start}\
-                    -GSIG_END=32\\'h{signature_end}\
-                    -GTOHOST_ADDR=32\\'h{tohost_addr}\
-                    -GSIG_PATH='\"{sig_file}\"'"
-
-                simcmd = './obj_dir/Vriscof_tb'
-            else:
-                simcmd = 'echo "NO RUN"'
-                verilatecmd = ''
-                objcopycmd = ''
+                # skip tests whose signature is already cached
+                key = self.result_cache.key(test, testentry['macros'], testentry['isa'])
+                if self.result_cache.fetch(key, sig_file):
+                    continue
 
-            # concatenate all commands that need to be executed within a make-target.
-            execute = 'cd {}; {}; {}; {}; {};'.format(testentry['work_dir'], cmd, objcopycmd, verilatecmd, simcmd)
+            compile_make.add_target('cd {}; {}'.format(test_dir, cmd))
+            compiled.append((test_dir, elf, sig_file, key))
 
-            # create a target
-            make.add_target(execute)
+        if self.target_run:
+            self.result_cache.report(self.name[:-1])
 
-        # run all the targets in parallel using the make command set above
-        make.execute_all(self.work_dir)
+        # compile all the tests in parallel using the make command
+        if compile_make.targets:
+            compile_make.execute_all(self.work_dir)
 
         # if target runs are not required then we simply exit
         if not self.target_run:
             raise SystemExit(0)
+
+        # symbols and test.bin come straight from the ELF (no readelf/objcopy
+        # per test); each make target then only runs the cached model
+        make = self.makefile()
+        for test_dir, elf, sig_file, key in compiled:
+            try:
+                elf_file = elfreader.ElfFile(elf)
+            except (OSError, ValueError) as e:
+                logger.error(f"{elf}: {e}")
+                continue
+
+            symbols = elf_file.symbols()
+            missing = [sym for sym in self.SYMBOLS.values() if sym not in symbols]
+            if missing:
+                logger.error(f"{elf}: missing symbols {', '.join(missing)}")
+                continue
+
+            _, image = elf_file.image()
+            image.tofile(os.path.join(test_dir, "test.bin"))
+
+            plusargs = ' '.join(f'+{arg}={symbols[sym]:08x}' for arg, sym in self.SYMBOLS.items())
+            simcmd = f'{self.sim_exe} {plusargs} +SIG_PATH={sig_file}'
+            storecmd = self.result_cache.store_cmd(key, sig_file)
+
+            # concatenate all commands that need to be executed within a make-target.
+            make.add_target('cd {}; {}; {}'.format(test_dir, simcmd, storecmd))
+
+        # run all the simulations in parallel using the make command set above
+        if make.targets:
+            make.execute_all(self.work_dir)
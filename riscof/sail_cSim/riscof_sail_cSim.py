@@ -1,4 +1,5 @@
 import os
+import sys
 import shutil
 import logging
 from multiprocessing import cpu_count
@@ -6,6 +7,10 @@ from multiprocessing import cpu_count
 import riscof.utils as utils
 from riscof.pluginTemplate import pluginTemplate
 
+# Signature cache shared with the DUT plugin
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from result_cache import ResultCache, file_hash, tree_hash, tool_version
+
 logger = logging.getLogger()
 
 class sail_cSim(pluginTemplate):
@@ -20,7 +25,7 @@ class sail_cSim(pluginTemplate):
         if config is None:
             logger.error("Config node for sail_cSim missing.")
             raise SystemExit(1)
-        self.num_jobs = str(cpu_count())
+        self.num_jobs = os.environ.get('RISCOF_JOBS', str(cpu_count()))
         self.pluginpath = os.path.abspath(config['pluginpath'])
         self.sail_exe = { '32' : os.path.join(config['PATH'] if 'PATH' in config else "","riscv_sim_rv32d"),
                 '64' : os.path.join(config['PATH'] if 'PATH' in config else "","riscv_sim_rv64d")}
@@ -36,6 +41,7 @@ class sail_cSim(pluginTemplate):
     def initialise(self, suite, work_dir, archtest_env):
         self.suite = suite
         self.work_dir = work_dir
+        self.archtest_env = archtest_env
         self.objdump_cmd = self.triplet+'-objdump -D {0} > {2};'
         self.compile_cmd = self.triplet+'-gcc -march={0} \
          -static -mcmodel=medany -fvisibility=hidden -nostdlib -nostartfiles\
@@ -69,6 +75,16 @@ class sail_cSim(pluginTemplate):
             logger.error(self.make+": executable not found. Please check environment setup.")
             raise SystemExit(1)
 
+        # reference signatures do not depend on the RS5 RTL at all: only on
+        # the test, the toolchain and the Sail binary with its options
+        self.result_cache = ResultCache(self.name[:-1], [
+            file_hash(shutil.which(self.sail_exe[self.xlen])),
+            self.args,
+            tool_version(compiler),
+            tree_hash(self.archtest_env, self.pluginpath + '/env'),
+            self.compile_cmd,
+        ])
+
 
     def runTests(self, testList, cgf_file=None):
         if os.path.exists(self.work_dir+ "/Makefile." + self.name[:-1]):
@@ -80,6 +96,12 @@ class sail_cSim(pluginTemplate):
             test = testentry['test_path']
             test_dir = testentry['work_dir']
             test_name = test.rsplit('/',1)[1][:-2]
+            sig_file = os.path.join(test_dir, self.name[:-1] + ".signature")
+
+            # coverage needs the execution log, so those runs always simulate
+            key = self.result_cache.key(test, testentry['macros'], testentry['isa'])
+            if cgf_file is None and self.result_cache.fetch(key, sig_file):
+                continue
 
             elf = 'ref.elf'
 
@@ -90,7 +112,6 @@ class sail_cSim(pluginTemplate):
             execute+=compile_cmd+";"
 
             execute += self.objdump_cmd.format(elf, self.xlen, 'ref.disass')
-            sig_file = os.path.join(test_dir, self.name[:-1] + ".signature")
 
             execute += self.sail_exe[self.xlen] + self.args + ' --test-signature={} {} > {}.log 2>&1;'.format(sig_file, elf, test_name)
 
@@ -110,6 +131,9 @@ class sail_cSim(pluginTemplate):
 
 
             execute+=coverage_cmd
+            execute+=self.result_cache.store_cmd(key, sig_file)
 
             make.add_target(execute)
-        make.execute_all(self.work_dir)
+        self.result_cache.report(self.name[:-1])
+        if make.targets:
+            make.execute_all(self.work_dir)
@@ -0,0 +1,288 @@
+#!/usr/bin/env python3
+"""
+Sharded riscof runs with a merged report.
+
+The test list of a suite is generated once (riscof testlist) and split
+deterministically into K shards, balanced with the per-test runtimes measured
+in previous runs (longest tests first, each one to the least loaded shard).
+Every shard is a regular `riscof run --testfile` with its own work dir, so
+shards can run as local processes or on other machines sharing the
+filesystem. The merge step compares the signatures of all shards, writes a
+single report and updates the runtime history used by the next plan.
+
+    python3 shard.py run   --config baseline.ini --work-dir baseline_work --shards 4
+    python3 shard.py plan  --config baseline.ini --work-dir baseline_work --shards 4
+    python3 shard.py run   --config baseline.ini --work-dir baseline_work --shard 2
+    python3 shard.py merge --work-dir baseline_work
+
+`run` without --shard plans, runs every shard in parallel and merges;
+with --shard it only runs that shard of an existing plan.
+"""
+
+import os
+import sys
+import json
+import html
+import shutil
+import argparse
+import subprocess
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+
+import riscof.utils as utils
+
+RISCOF_DIR = Path(__file__).resolve().parent
+DEFAULT_SUITE = RISCOF_DIR / "riscv-arch-test" / "riscv-test-suite"
+DEFAULT_ENV = DEFAULT_SUITE / "env"
+
+PLAN_FILE = "shards.json"
+RESULTS_FILE = "results.json"
+
+
+def shard_name(index):
+    return f"shard_{index:02d}"
+
+
+def history_path(work_dir):
+    """Runtime history lives next to the work dir, so `make clean` keeps it"""
+    work_dir = Path(work_dir)
+    return work_dir.parent / f"{work_dir.name}_runtimes.json"
+
+
+def load_history(path):
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def balance(tests, runtimes, shards):
+    """
+    Greedy longest-processing-time split of tests into shards.
+
+    Tests without history cost the median known runtime (1s with no history).
+    Ties are broken by test name and shard index, so the split only depends
+    on the test list and the history.
+    """
+    known = sorted(runtimes[t] for t in tests if t in runtimes)
+    default = known[len(known) // 2] if known else 1.0
+    cost = {t: runtimes.get(t, default) for t in tests}
+
+    loads = [0.0] * shards
+    assignment = [[] for _ in range(shards)]
+    for test in sorted(tests, key=lambda t: (-cost[t], t)):
+        index = min(range(shards), key=lambda i: (loads[i], i))
+        assignment[index].append(test)
+        loads[index] += cost[test]
+    return assignment, loads
+
+
+def riscof_cmd(command, config, work_dir, suite, env, *extra):
+    return ["riscof", command, f"--config={config}", f"--suite={suite}", f"--env={env}",
+            f"--work-dir={work_dir}"] + list(extra)
+
+
+def plan(config, work_dir, shards, suite=DEFAULT_SUITE, env=DEFAULT_ENV, history=None):
+    """Generates the test list and writes one test list per shard"""
+    work_dir = Path(work_dir).resolve()
+    shutil.rmtree(work_dir, ignore_errors=True)
+    # riscof creates its work dir with a non-recursive mkdir
+    work_dir.mkdir(parents=True)
+    plan_dir = work_dir / "plan"
+    subprocess.run(riscof_cmd("testlist", config, plan_dir, suite, env), check=True)
+
+    test_list = utils.load_yaml(plan_dir / "test_list.yaml")
+    runtimes = load_history(history or history_path(work_dir))
+    assignment, loads = balance(list(test_list), runtimes, shards)
+
+    # riscof run --testfile expects the checked yamls and the database in its
+    # work dir, and the test work dirs to exist without ref/ and dut/
+    support = [f for f in plan_dir.iterdir() if f.suffix == ".yaml" and f.name != "test_list.yaml"]
+    shard_tests = {}
+    for index, tests in enumerate(assignment):
+        shard_dir = work_dir / shard_name(index)
+        shard_dir.mkdir(parents=True)
+        for f in support:
+            shutil.copy(f, shard_dir / f.name)
+
+        shard_list = {}
+        for test in tests:
+            entry = dict(test_list[test])
+            rel = os.path.relpath(entry["work_dir"], plan_dir)
+            entry["work_dir"] = str(shard_dir / rel)
+            Path(entry["work_dir"]).mkdir(parents=True, exist_ok=True)
+            shard_list[test] = entry
+        with open(shard_dir / "test_list.yaml", "w") as f:
+            utils.dump_yaml(shard_list, f)
+        shard_tests[shard_name(index)] = tests
+
+    with open(work_dir / PLAN_FILE, "w") as f:
+        json.dump({"config": str(Path(config).resolve()), "suite": str(suite), "env": str(env),
+                   "shards": shard_tests, "estimated_s": loads}, f, indent=2)
+
+    for index, load in enumerate(loads):
+        print(f"{shard_name(index)}: {len(assignment[index])} tests, ~{load:.0f}s")
+    return work_dir
+
+
+def run_shard(work_dir, index, jobs=None):
+    """
+    Runs one shard of an existing plan; returns riscof's exit code.
+    jobs limits the make -j of the plugins (RISCOF_JOBS) when several
+    shards share a host.
+    """
+    work_dir = Path(work_dir).resolve()
+    with open(work_dir / PLAN_FILE) as f:
+        info = json.load(f)
+    count = len(info["shards"])
+    if not 0 <= index < count:
+        raise ValueError(f"shard {index} does not exist, the plan in {work_dir} has shards 0 to {count - 1}")
+    if not info["shards"][shard_name(index)]:
+        return 0
+    shard_dir = work_dir / shard_name(index)
+    cmd = riscof_cmd("run", info["config"], shard_dir, info["suite"], info["env"],
+                     f"--testfile={shard_dir / 'test_list.yaml'}", "--no-browser")
+    env = dict(os.environ)
+    if jobs:
+        env["RISCOF_JOBS"] = str(jobs)
+    with open(shard_dir / "riscof.log", "w") as log:
+        return subprocess.run(cmd, cwd=RISCOF_DIR, env=env, stdout=log,
+                              stderr=subprocess.STDOUT).returncode
+
+
+def _signature(test_dir, side):
+    """The single .signature written by a plugin in <test>/ref or <test>/dut"""
+    sigs = sorted((test_dir / side).glob("*.signature"))
+    return sigs[0] if sigs else None
+
+
+def _runtime(test_dir):
+    """
+    Seconds spent on a test, from the file times of its ref/ and dut/ runs
+    (first artifact to signature). Cached signatures measure ~0 and are not
+    recorded, so the history keeps the cost of a real run.
+    """
+    total = 0.0
+    for side in ("ref", "dut"):
+        times = [p.stat().st_mtime for p in (test_dir / side).glob("*") if p.is_file()]
+        if len(times) > 1:
+            total += max(times) - min(times)
+    return total
+
+
+def compare(test_dir):
+    """Same verdict as riscof: identical, non-empty signatures pass"""
+    ref, dut = _signature(test_dir, "ref"), _signature(test_dir, "dut")
+    if ref is None or dut is None:
+        return "Missing", ref, dut
+    ref_lines, dut_lines = ref.read_text().splitlines(), dut.read_text().splitlines()
+    if ref_lines == dut_lines and dut_lines:
+        return "Passed", ref, dut
+    return "Failed", ref, dut
+
+
+def write_report(path, results):
+    passed = sum(r["status"] == "Passed" for r in results)
+    rows = "\n".join(
+        f"<tr class=\"{r['status'].lower()}\"><td>{html.escape(r['test'])}</td>"
+        f"<td>{r['shard']}</td><td>{r['status']}</td><td>{r['runtime_s']:.1f}</td>"
+        f"<td><a href=\"file://{html.escape(r['work_dir'])}\">work dir</a></td></tr>"
+        for r in results)
+    with open(path, "w") as f:
+        f.write(f"""<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>RS5 riscof report</title>
+<style>
+body {{ font-family: sans-serif; }}
+td, th {{ padding: 2px 8px; text-align: left; }}
+.passed {{ background: #dfd; }} .failed {{ background: #fdd; }} .missing {{ background: #ffd; }}
+</style></head><body>
+<h1>RS5 riscof report (merged)</h1>
+<p>{passed} passed, {len(results) - passed} failed or missing, {len(results)} tests</p>
+<table>
+<tr><th>Test</th><th>Shard</th><th>Status</th><th>Runtime (s)</th><th></th></tr>
+{rows}
+</table></body></html>
+""")
+
+
+def merge(work_dir, history=None):
+    """Merges the shards into results.json and report.html; returns the failure count"""
+    work_dir = Path(work_dir).resolve()
+    with open(work_dir / PLAN_FILE) as f:
+        info = json.load(f)
+    history = history or history_path(work_dir)
+    runtimes = load_history(history)
+
+    results = []
+    for shard, tests in info["shards"].items():
+        test_list = utils.load_yaml(work_dir / shard / "test_list.yaml")
+        for test in tests:
+            test_dir = Path(test_list[test]["work_dir"])
+            status, ref, dut = compare(test_dir)
+            runtime = round(_runtime(test_dir), 3)
+            if runtime > 0:
+                runtimes[test] = runtime
+            results.append({"test": test, "shard": shard, "status": status,
+                            "runtime_s": runtime, "work_dir": str(test_dir),
+                            "ref_signature": str(ref) if ref else None,
+                            "dut_signature": str(dut) if dut else None})
+    results.sort(key=lambda r: r["test"])
+
+    with open(work_dir / RESULTS_FILE, "w") as f:
+        json.dump(results, f, indent=2)
+    write_report(work_dir / "report.html", results)
+    with open(history, "w") as f:
+        json.dump(runtimes, f, indent=2, sort_keys=True)
+
+    failed = [r for r in results if r["status"] != "Passed"]
+    for r in failed:
+        print(f"{r['status']:<8} {r['test']}")
+    print(f"{len(results) - len(failed)}/{len(results)} tests passed, "
+          f"report at {work_dir / 'report.html'}")
+    return len(failed)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Runs riscof in balanced shards and merges the reports")
+    parser.add_argument("command", choices=("plan", "run", "merge"))
+    parser.add_argument("--config", help="riscof config (baseline.ini, extensions.ini)")
+    parser.add_argument("--work-dir", required=True, help="Root of the shard work dirs")
+    parser.add_argument("--shards", type=int, default=os.cpu_count(),
+                        help="Number of shards (default: number of CPUs)")
+    parser.add_argument("--shard", type=int, default=None,
+                        help="Run only this shard of an existing plan")
+    parser.add_argument("--suite", default=str(DEFAULT_SUITE))
+    parser.add_argument("--env", default=str(DEFAULT_ENV))
+    parser.add_argument("--history", default=None,
+                        help="Per-test runtime history (default: <work-dir>_runtimes.json)")
+    args = parser.parse_args()
+
+    if args.command in ("plan", "run") and args.shard is None and not args.config:
+        parser.error(f"{args.command} needs --config")
+    if args.shards < 1:
+        parser.error("--shards must be at least 1")
+
+    if args.command == "plan":
+        plan(args.config, args.work_dir, args.shards, args.suite, args.env, args.history)
+    elif args.command == "merge":
+        sys.exit(1 if merge(args.work_dir, args.history) else 0)
+    elif args.shard is not None:
+        try:
+            sys.exit(run_shard(args.work_dir, args.shard))
+        except (OSError, ValueError) as e:
+            sys.exit(f"error: {e}")
+    else:
+        work_dir = plan(args.config, args.work_dir, args.shards, args.suite, args.env, args.history)
+        jobs = max(1, (os.cpu_count() or 1) // args.shards)
+        with ThreadPoolExecutor(max_workers=args.shards) as pool:
+            codes = list(pool.map(lambda i: run_shard(work_dir, i, jobs), range(args.shards)))
+        for index, code in enumerate(codes):
+            if code:
+                print(f"{shard_name(index)}: riscof exited with {code}, "
+                      f"see {work_dir / shard_name(index) / 'riscof.log'}")
+        sys.exit(1 if merge(work_dir, args.history) or any(codes) else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -19,7 +19,7 @@
  * - 0x10000014: Image Height (write)
  * - 0x10000018: Control/Status (read/write)
  *   - bit 0: busy (read)
- *   - bit 1: done (read)
+ *   - bit 1: done (read, stays set until the next start)
  *   - writing 1: start operation
  * - 0x1000001C: Progress Counter (read) - for debugging
  */
@@ -70,6 +70,7 @@ module plugin_image_memory_interface
     logic [31:0] out_start_reg, out_end_reg;
     logic [31:0] width_reg, height_reg;
     logic start_pulse;
+    logic done_sticky;              // plugin_done is a single-cycle pulse
 
     // Address decode
     logic sel_in_start, sel_in_end, sel_out_start, sel_out_end;
@@ -94,9 +95,13 @@ module plugin_image_memory_interface
             width_reg     <= 32'b0;
             height_reg    <= 32'b0;
             start_pulse   <= 1'b0;
+            done_sticky   <= 1'b0;
         end else begin
             start_pulse <= 1'b0;  // Default: clear start pulse
             
+            if (plugin_done)
+                done_sticky <= 1'b1;
+            
             if (enable_i && we_i != 4'b0000) begin
                 if (sel_in_start) begin
                     in_start_reg <= data_i;
@@ -120,6 +125,7 @@ module plugin_image_memory_interface
                     // Write to control register
                     if (data_i[0]) begin  // bit 0 = start
                         start_pulse <= 1'b1;
+                        done_sticky <= 1'b0;
                     end
                 end
             end
@@ -150,7 +156,7 @@ module plugin_image_memory_interface
             end
             else if (sel_ctrl) begin
                 // Status register: bit 0=busy, bit 1=done
-                data_o = {30'b0, plugin_done, plugin_busy};
+                data_o = {30'b0, done_sticky, plugin_busy};
             end
             else if (sel_progress) begin
                 data_o = plugin_progress;
@@ -16,7 +16,7 @@
  * - 0x10000008: Grayscale Result (read) - Format: 0xGGGGGG00
  * - 0x1000000C: Control/Status (read/write)
  *   - bit 0: busy (read)
- *   - bit 1: done (read)
+ *   - bit 1: done (read, stays set until the next start)
  *   - writing 1: start operation
  */
 
@@ -49,6 +49,7 @@ module plugin_pixel_memory_interface
     // Internal registers
     logic [31:0] rgb_pixel_reg, unused_param_reg;
     logic start_pulse;
+    logic done_sticky;              // plugin_done is a single-cycle pulse
 
     // Address decode
     logic sel_rgb, sel_unused, sel_gray, sel_ctrl;
@@ -63,9 +64,13 @@ module plugin_pixel_memory_interface
             rgb_pixel_reg   <= 32'b0;
             unused_param_reg <= 32'b0;
             start_pulse     <= 1'b0;
+            done_sticky     <= 1'b0;
         end else begin
             start_pulse <= 1'b0;  // Default: clear start pulse
             
+            if (plugin_done)
+                done_sticky <= 1'b1;
+            
             if (enable_i && we_i != 4'b0000) begin
                 if (sel_rgb) begin
                     // Write RGB pixel data
@@ -79,6 +84,7 @@ module plugin_pixel_memory_interface
                     // Write to control register
                     if (data_i[0]) begin  // bit 0 = start
                         start_pulse <= 1'b1;
+                        done_sticky <= 1'b0;
                     end
                 end
             end
@@ -100,7 +106,7 @@ module plugin_pixel_memory_interface
             end
             else if (sel_ctrl) begin
                 // Status register: bit 0=busy, bit 1=done
-                data_o = {30'b0, plugin_done, plugin_busy};
+                data_o = {30'b0, done_sticky, plugin_busy};
             end
         end
     end
@@ -47,19 +47,41 @@ module RAM_mem
     input  logic [ 3:0]                      weB_i,
     input  logic [($clog2(MEM_WIDTH) - 1):0] addrB_i,
     input  logic [31:0]                      dataB_i,
-    output logic [31:0]                      dataB_o
+    output logic [31:0]                      dataB_o,
+
+    /* Port C: DMA master of the frame plugin (tie enC_i to 0 when unused) */
+    input  logic                             enC_i,
+    input  logic [ 3:0]                      weC_i,
+    input  logic [($clog2(MEM_WIDTH) - 1):0] addrC_i,
+    input  logic [31:0]                      dataC_i,
+    output logic [31:0]                      dataC_o
 );
 
     reg [7:0] RAM [0:MEM_WIDTH-1];
     int fd;
+    string bin_file;
 `ifndef SYNTH
     int fd_r_a, fd_r_b, fd_w_a, fd_w_b;
+
+    /*
+     * +RAM_LOG=<path> writes every access of all ports as a 16-byte
+     * little-endian record (see ramlog.py), independent of DEBUG:
+     *   cycle[31:0], {16'b0, write enable, port (0: A, 1: B, 2: C)}, byte address, data
+     * Reads have write enable 0 and carry the data returned by the RAM.
+     */
+    string  ram_log   = "";
+    int     fd_log    = 0;
+    int     log_cycle = 0;
 `endif
 
     initial begin
-        fd = $fopen (BIN_FILE, "r");
+        /* +BIN_FILE=<path> selects the binary at run time */
+        bin_file = BIN_FILE;
+        void'($value$plusargs("BIN_FILE=%s", bin_file));
+
+        fd = $fopen (bin_file, "r");
         if (fd == '0) begin
-            $display("[%d] [RAM_mem] ERROR: %s not found.", $time(), BIN_FILE);
+            $display("[%d] [RAM_mem] ERROR: %s not found.", $time(), bin_file);
             $finish();
         end
 
@@ -72,6 +94,12 @@ module RAM_mem
             fd_w_a = $fopen ({DEBUG_PATH, "_A_writes.txt"}, "w");
             fd_w_b = $fopen ({DEBUG_PATH, "_B_writes.txt"}, "w");
         end
+
+        if ($value$plusargs("RAM_LOG=%s", ram_log)) begin
+            fd_log = $fopen(ram_log, "wb");
+            if (fd_log == 0)
+                $display("[%d] [RAM_mem] ERROR: could not open %s.", $time(), ram_log);
+        end
     `endif
     end
 
@@ -132,6 +160,21 @@ module RAM_mem
             end
         `endif
         end
+
+        if (enC_i == 1'b1) begin
+            if (weC_i[3] == 1'b1) begin
+                RAM[addrC_i+3] <= dataC_i[31:24];
+            end
+            if (weC_i[2] == 1'b1) begin
+                RAM[addrC_i+2] <= dataC_i[23:16];
+            end
+            if (weC_i[1] == 1'b1) begin
+                RAM[addrC_i+1] <= dataC_i[15:8];
+            end
+            if (weC_i[0] == 1'b1) begin
+                RAM[addrC_i]   <= dataC_i[7:0];
+            end
+        end
     end
 
     /* Read */
@@ -141,15 +184,6 @@ module RAM_mem
             dataA_o[23:16] = RAM[addrA_i+2];
             dataA_o[15:8]  = RAM[addrA_i+1];
             dataA_o[7:0]   = RAM[addrA_i];
-
-        `ifndef SYNTH
-            if (DEBUG) begin
-                if (addrA_i != '0) begin
-                    $display("[%0d] READ_comb_A: %h %h %h %h <-- 0x%4h",
-                        $time, RAM[addrA_i+3], RAM[addrA_i+2], RAM[addrA_i+1], RAM[addrA_i], addrA_i);
-                end
-            end
-        `endif
         end
         else begin
             dataA_o = '0;
@@ -162,19 +196,55 @@ module RAM_mem
             dataB_o[23:16] = RAM[addrB_i+2];
             dataB_o[15:8]  = RAM[addrB_i+1];
             dataB_o[7:0]   = RAM[addrB_i];
-
-        `ifndef SYNTH
-            if (DEBUG) begin
-                if (addrB_i != '0) begin
-                    $display("[%0d] read_comb_B: %h %h %h %h <-- 0x%4h",
-                        $time, RAM[addrB_i+3], RAM[addrB_i+2], RAM[addrB_i+1], RAM[addrB_i], addrB_i);
-                end
-            end
-        `endif
         end
         else begin
             dataB_o = '0;
         end
     end
 
+    always_comb begin
+        if (enC_i == 1'b1 && weC_i == '0) begin
+            dataC_o[31:24] = RAM[addrC_i+3];
+            dataC_o[23:16] = RAM[addrC_i+2];
+            dataC_o[15:8]  = RAM[addrC_i+1];
+            dataC_o[7:0]   = RAM[addrC_i];
+        end
+        else begin
+            dataC_o = '0;
+        end
+    end
+
+`ifndef SYNTH
+    /* Access logs, sampled once per cycle (the reads above are combinational) */
+    always_ff @(posedge clk) begin
+        log_cycle <= log_cycle + 1;
+
+        if (DEBUG) begin
+            if (enA_i == 1'b1 && weA_i == '0 && addrA_i != '0)
+                $fwrite(fd_r_a, "[%0d] %h %h %h %h <-- 0x%4h\n", $time,
+                        dataA_o[31:24], dataA_o[23:16], dataA_o[15:8], dataA_o[7:0], addrA_i);
+            if (enB_i == 1'b1 && weB_i == '0 && addrB_i != '0)
+                $fwrite(fd_r_b, "[%0d] %h %h %h %h <-- 0x%4h\n", $time,
+                        dataB_o[31:24], dataB_o[23:16], dataB_o[15:8], dataB_o[7:0], addrB_i);
+        end
+
+        if (fd_log != 0) begin
+            if (enA_i == 1'b1)
+                $fwrite(fd_log, "%u%u%u%u", log_cycle, {20'b0, weA_i, 8'd0}, 32'(addrA_i),
+                        (weA_i == '0) ? dataA_o : dataA_i);
+            if (enB_i == 1'b1)
+                $fwrite(fd_log, "%u%u%u%u", log_cycle, {20'b0, weB_i, 8'd1}, 32'(addrB_i),
+                        (weB_i == '0) ? dataB_o : dataB_i);
+            if (enC_i == 1'b1)
+                $fwrite(fd_log, "%u%u%u%u", log_cycle, {20'b0, weC_i, 8'd2}, 32'(addrC_i),
+                        (weC_i == '0) ? dataC_o : dataC_i);
+        end
+    end
+
+    final begin
+        if (fd_log != 0)
+            $fclose(fd_log);
+    end
+`endif
+
 endmodule
@@ -0,0 +1,471 @@
+#!/usr/bin/env python3
+"""
+Trace-driven cache simulator for sizing instruction and data caches.
+
+The testbench connects RS5 to a zero-latency RAM, so the RAM access log
+(+RAM_LOG, see ramlog.py) is the address stream a cache would see: port A
+is the fetch stream and port B the load/store stream. Every configuration of
+the grid (size x associativity x line size x replacement x write policy) is
+simulated on both streams of every workload, and the hit rates are turned
+into stall cycles with a fixed miss penalty.
+
+The tag, dirty and replacement state live in NumPy arrays of sets x ways,
+and the log is read in chunks of memory-mapped records. Lines, sets and tags
+are computed for a whole chunk at once; since sets are independent, the
+accesses are then grouped by set and every run of accesses to the same line
+within a set is folded into one access plus guaranteed hits, which leaves a
+small fraction of the stream to simulate (a loop that fits in the cache
+folds to its first iteration). Direct-mapped caches are then fully
+vectorized; associative ones simulate the k-th access of every set in one
+NumPy step while enough sets are left, and the rest set by set.
+
+Workloads are existing logs (NAME=path) or program binaries (--bin
+NAME=prog.bin), which are run on the cached testbench model to record one.
+
+Usage:
+    python3 sim/cachesim.py coremark=cm_ram.bin --size 1K,4K,16K --ways 1,2,4
+    python3 sim/cachesim.py --bin coremark=../app/coremark/coremark.bin \\
+        --bin alexnet=../app/alexnet/alexnet.bin --policy lru,plru,random --line 16,32
+"""
+
+import os
+import sys
+import csv
+import argparse
+import itertools
+from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import numpy as np
+
+from model_cache import SIM_DIR, ModelCache, run_model, read_exit_status
+from ramlog import RamLog
+
+POLICIES = ("lru", "plru", "random")
+WRITE_POLICIES = ("wb", "wt")       # write-back + write-allocate, write-through + no-write-allocate
+STREAMS = ("fetch", "data")
+CHUNK_RECORDS = 1 << 24             # log records loaded at a time
+MIN_STEP_SETS = 128                 # fewest sets simulated by one vectorized step
+
+DEFAULT_WORK_ROOT = SIM_DIR / "cachesim_work"
+COLUMNS = ("app", "stream", "size", "ways", "line", "policy", "write", "accesses", "hit_rate",
+           "misses", "writebacks", "mem_writes", "stall_cycles", "slowdown")
+
+
+class Cache:
+    """Set-associative cache with array-backed tag and replacement state"""
+
+    def __init__(self, size, ways, line, policy="lru", write="wb", seed=0):
+        for name, value in (("size", size), ("ways", ways), ("line", line)):
+            if value <= 0 or value & (value - 1):
+                raise ValueError(f"{name} must be a power of two, got {value}")
+        if size < ways * line:
+            raise ValueError(f"{size}B cannot hold {ways} ways of {line}B lines")
+        if policy not in POLICIES:
+            raise ValueError(f"unknown replacement policy '{policy}'")
+        if write not in WRITE_POLICIES:
+            raise ValueError(f"unknown write policy '{write}'")
+
+        self.ways, self.line, self.policy = ways, line, policy
+        self.sets = size // (ways * line)
+        self.offset_bits = line.bit_length() - 1
+        self.set_bits = self.sets.bit_length() - 1
+        self.write_back = write == "wb"
+
+        self.tags = np.full((self.sets, ways), -1, dtype=np.int64)
+        self.dirty = np.zeros((self.sets, ways), dtype=bool)
+        self.stamp = np.zeros((self.sets, ways), dtype=np.int64)  # LRU: last access time
+        self.tree = np.zeros(self.sets, dtype=np.int64)           # PLRU: bit n is node n of the set
+        self.levels = ways.bit_length() - 1
+        # PLRU nodes on the path of every way (children of node n: 2n + 1
+        # and 2n + 2), which an access points away from the way
+        self.path_mask, self.path_bits = np.zeros(ways, dtype=np.int64), np.zeros(ways, dtype=np.int64)
+        for way in range(ways):
+            node = 0
+            for level in range(self.levels - 1, -1, -1):
+                bit = (way >> level) & 1
+                self.path_mask[way] |= 1 << node
+                self.path_bits[way] |= (bit ^ 1) << node
+                node = 2 * node + 1 + bit
+        self.clock = 0
+        self.rng = np.random.default_rng(seed)
+        self.stats = dict.fromkeys(("accesses", "hits", "misses", "read_misses", "write_misses",
+                                    "writebacks", "mem_writes"), 0)
+
+    def _victims(self, s, rand):
+        """Way replaced in each set of s (full sets only)"""
+        if self.policy == "lru":
+            return self.stamp[s].argmin(axis=1)
+        if self.policy == "plru":
+            tree, node, way = self.tree[s], np.zeros_like(s), np.zeros_like(s)
+            for _ in range(self.levels):
+                bit = (tree >> node) & 1
+                way = (way << 1) | bit
+                node = 2 * node + 1 + bit
+            return way
+        return rand
+
+    def _touch(self, s, way, time):
+        if self.policy == "lru":
+            self.stamp[s, way] = time
+        elif self.policy == "plru":
+            self.tree[s] = (self.tree[s] & ~self.path_mask[way]) | self.path_bits[way]
+
+    def _step(self, s, tag, write, rand, time):
+        """
+        One access in each set of s (all different), vectorized; returns
+        (hit, writeback) flags of the accesses
+        """
+        rows = self.tags[s]
+        match = rows == tag[:, None]
+        hit = match.any(axis=1)
+        way = match.argmax(axis=1)
+        fill = ~hit if self.write_back else ~hit & ~write   # no-write-allocate
+        writeback = np.zeros(len(s), dtype=bool)
+        if fill.any():
+            fs = s[fill]
+            empty = rows[fill] == -1
+            victim = np.where(empty.any(axis=1), empty.argmax(axis=1), self._victims(fs, rand[fill]))
+            writeback[fill] = self.dirty[fs, victim]
+            self.tags[fs, victim] = tag[fill]
+            self.dirty[fs, victim] = False
+            way[fill] = victim
+        resident = hit | fill
+        s, way = s[resident], way[resident]
+        if self.write_back:
+            written = write[resident]
+            self.dirty[s[written], way[written]] = True
+        self._touch(s, way, time)
+        return hit, writeback
+
+    def _run_set(self, s, tags, writes, rands, times):
+        """
+        The accesses of one set in order, on Python lists (sparse tail of
+        run()); returns the lists of (hit, writeback) flags
+        """
+        row, dirty, stamp, tree = (self.tags[s].tolist(), self.dirty[s].tolist(),
+                                   self.stamp[s].tolist(), int(self.tree[s]))
+        lru, plru, write_back, levels = self.policy == "lru", self.policy == "plru", self.write_back, self.levels
+        path_mask, path_bits = self.path_mask.tolist(), self.path_bits.tolist()
+        hit, writeback = [], []
+        for tag, write, rand, time in zip(tags, writes, rands, times):
+            if tag in row:
+                way = row.index(tag)
+                hit.append(True)
+                writeback.append(False)
+            else:
+                hit.append(False)
+                if write and not write_back:
+                    writeback.append(False)
+                    continue
+                if -1 in row:
+                    way = row.index(-1)
+                elif lru:
+                    way = stamp.index(min(stamp))
+                elif plru:
+                    node = way = 0
+                    for _ in range(levels):
+                        bit = (tree >> node) & 1
+                        way = (way << 1) | bit
+                        node = 2 * node + 1 + bit
+                else:
+                    way = rand
+                writeback.append(dirty[way])
+                row[way] = tag
+                dirty[way] = False
+            if write and write_back:
+                dirty[way] = True
+            if lru:
+                stamp[way] = time
+            elif plru:
+                tree = (tree & ~path_mask[way]) | path_bits[way]
+        self.tags[s], self.dirty[s], self.stamp[s], self.tree[s] = row, dirty, stamp, tree
+        return hit, writeback
+
+    def _fold(self, lines, first, written, counts):
+        """
+        Folds runs of accesses to the same line into their first access
+        (first: it is a write, written: the run writes, counts: accesses
+        per run). After it the line is resident and its replacement state
+        unchanged, so the rest of the run hits. Without write allocation, a
+        run that starts with writes misses until its first read, which
+        starts a new run.
+        """
+        start = np.r_[True, lines[1:] != lines[:-1]]
+        if not self.write_back:
+            reads = ~first
+            seen = np.cumsum(reads)
+            run = np.maximum.accumulate(np.where(start, np.arange(len(start)), 0))
+            start |= reads & (seen - seen[run] + reads[run] == 1)
+        i = np.flatnonzero(start)
+        return lines[i], first[i], np.logical_or.reduceat(written, i), np.add.reduceat(counts, i)
+
+    def _associative(self, sets, tags, writes):
+        """
+        Accesses grouped by set: step k simulates the k-th access of every
+        set at once, until too few sets are left to amortize the NumPy
+        calls; the rest runs set by set. Returns (hit, writeback) flags.
+        """
+        n = len(sets)
+        heads = np.flatnonzero(np.r_[True, sets[1:] != sets[:-1]])
+        pos = np.arange(n) - np.repeat(heads, np.diff(np.r_[heads, n]))
+        rand = self.rng.integers(self.ways, size=n)
+        hit = np.zeros(n, dtype=bool)
+        writeback = np.zeros(n, dtype=bool)
+
+        width = np.bincount(pos)
+        steps = int(np.count_nonzero(width >= MIN_STEP_SETS))
+        by_step = np.argsort(pos, kind="stable")[:width[:steps].sum()]
+        bounds = np.r_[0, np.cumsum(width[:steps])]
+        s, t, w, r = sets[by_step], tags[by_step], writes[by_step], rand[by_step]
+        for k in range(steps):
+            lo, hi = bounds[k], bounds[k + 1]
+            i = by_step[lo:hi]
+            hit[i], writeback[i] = self._step(s[lo:hi], t[lo:hi], w[lo:hi], r[lo:hi], self.clock + k + 1)
+
+        rest = np.flatnonzero(pos >= steps)
+        if len(rest):
+            bounds = np.flatnonzero(np.r_[True, sets[rest[1:]] != sets[rest[:-1]], True])
+            columns = [a[rest].tolist() for a in (tags, writes, rand, self.clock + pos + 1)]
+            for lo, hi in zip(bounds[:-1].tolist(), bounds[1:].tolist()):
+                hit[rest[lo:hi]], writeback[rest[lo:hi]] = self._run_set(int(sets[rest[lo]]),
+                                                                         *(c[lo:hi] for c in columns))
+        self.clock += int(width.size)
+        return hit, writeback
+
+    def _direct(self, sets, tags, first, written):
+        """
+        Direct-mapped cache, vectorized: a set holds the line of its last
+        allocating access. Returns (hit, writeback) flags.
+        """
+        head = np.r_[True, sets[1:] != sets[:-1]]
+        last = np.r_[head[1:], True]
+        if self.write_back:
+            # Every access allocates and runs are folded, so only the first
+            # access of a set can find its line; the others evict the
+            # previous line of the set
+            held_dirty = self.dirty[sets, 0]
+            hit = tags == np.where(head, self.tags[sets, 0], np.r_[-1, tags[:-1]])
+            dirty = written | hit & held_dirty
+            writeback = ~hit & np.where(head, held_dirty, np.r_[False, dirty[:-1]])
+            self.tags[sets[last], 0] = tags[last]
+            self.dirty[sets[last], 0] = dirty[last]
+            return hit, writeback
+        # Without write allocation only reads allocate: the set holds the
+        # line of its last read
+        index = np.arange(len(sets))
+        read = np.maximum.accumulate(np.where(first, -1, index))
+        prev_read = np.r_[-1, read[:-1]]
+        start = np.maximum.accumulate(np.where(head, index, 0))
+        hit = tags == np.where(prev_read >= start, tags[prev_read], self.tags[sets, 0])
+        read_last = last & (read >= start)
+        self.tags[sets[read_last], 0] = tags[read[read_last]]
+        return hit, np.zeros(len(sets), dtype=bool)
+
+    def run(self, addrs, writes):
+        """
+        Simulates a stream of byte addresses (writes: bool array of the same
+        length); can be called again with the next part of a stream
+        """
+        stats = self.stats
+        if not len(addrs):
+            return stats
+        lines = np.asarray(addrs).astype(np.int64) >> self.offset_bits
+        writes = np.asarray(writes, dtype=bool)
+        stats["accesses"] += len(lines)
+        if not self.write_back:
+            stats["mem_writes"] += int(np.count_nonzero(writes))
+
+        # Sets are independent: the accesses are grouped by set, in program
+        # order within each set, and runs are folded before and after
+        lines, first, written, counts = self._fold(lines, writes, writes, np.ones(len(lines), dtype=np.int64))
+        # (set numbers in the smallest dtype: NumPy radix sorts up to 16 bits)
+        order = np.argsort((lines & (self.sets - 1)).astype(np.min_scalar_type(self.sets - 1)), kind="stable")
+        lines, first, written, counts = self._fold(lines[order], first[order], written[order], counts[order])
+        sets, tags = lines & (self.sets - 1), lines >> self.set_bits
+        if self.ways == 1:
+            hit, writeback = self._direct(sets, tags, first, written)
+        else:
+            # What a write changes: the dirty bit, or allocation on a miss
+            hit, writeback = self._associative(sets, tags, written if self.write_back else first)
+
+        n = len(sets)
+        resident = np.ones(n, dtype=bool) if self.write_back else hit | ~first
+        unallocated = counts[~resident] - 1      # write misses folded into a missed write
+        stats["hits"] += int(counts[resident].sum() - np.count_nonzero(~hit & resident))
+        stats["misses"] += int(np.count_nonzero(~hit) + unallocated.sum())
+        stats["read_misses"] += int(np.count_nonzero(~hit & ~first))
+        stats["write_misses"] += int(np.count_nonzero(~hit & first) + unallocated.sum())
+        stats["writebacks"] += int(np.count_nonzero(writeback))
+        return stats
+
+
+def load_stream(path, stream, chunk=CHUNK_RECORDS):
+    """Yields (addresses, writes) of the fetch or data stream of a RAM log, chunk records at a time"""
+    records = RamLog(path).records
+    last = None
+    for start in range(0, len(records), chunk):
+        part = records[start:start + chunk]
+        if stream == "fetch":
+            fetch = np.asarray(part[part["port"] == 0]["addr"])
+            if not len(fetch):
+                continue
+            # Port A presents the same PC while the pipeline is stalled
+            keep = np.r_[fetch[0] != last, fetch[1:] != fetch[:-1]]
+            last = fetch[-1]
+            yield fetch[keep], np.zeros(np.count_nonzero(keep), dtype=bool)
+        else:
+            data = part[part["port"] == 1]
+            yield data["addr"], data["we"] != 0
+
+
+def log_cycles(path):
+    log = RamLog(path)
+    return int(log.cycles()[-1] - log.cycles()[0]) + 1 if len(log) else 0
+
+
+def simulate(path, stream, config, miss_penalty, writeback_penalty):
+    """Runs one configuration on one stream; returns a result row"""
+    size, ways, line, policy, write = config
+    cache = Cache(size, ways, line, policy, write)
+    for addrs, writes in load_stream(path, stream):
+        cache.run(addrs, writes)
+    stats = cache.stats
+    stall = stats["misses"] * miss_penalty + stats["writebacks"] * writeback_penalty
+    cycles = log_cycles(path)
+    row = dict(stream=stream, size=size, ways=ways, line=line, policy=policy, write=write,
+               stall_cycles=stall, **stats)
+    row["hit_rate"] = stats["hits"] / stats["accesses"] if stats["accesses"] else None
+    row["slowdown"] = (cycles + stall) / cycles if cycles else None
+    return row
+
+
+def parse_size(text):
+    """"4K", "1M" or "512" -> bytes"""
+    text = text.strip().upper().rstrip("B")
+    scale = {"K": 1 << 10, "M": 1 << 20}.get(text[-1:], 1)
+    return int(text.rstrip("KM")) * scale
+
+
+def parse_workload(spec):
+    name, sep, path = spec.partition("=")
+    if not sep:
+        name, path = Path(spec).stem, spec
+    path = Path(path).resolve()
+    if not path.is_file():
+        raise ValueError(f"file not found: {path}")
+    return name, path
+
+
+def record_log(exe, name, binary, work_root, plusargs, timeout=None):
+    """Runs a program on the testbench with +RAM_LOG; returns the log path"""
+    run_dir = Path(work_root) / name
+    log = run_dir / "results" / "ram.bin"
+    args = {"BIN_FILE": binary, "EXIT_FILE": run_dir / "results" / "exit_status.txt",
+            "RESULT_WORDS": 0, "RAM_LOG": log}
+    args.update(plusargs)
+    run_dir.mkdir(parents=True, exist_ok=True)
+    with open(run_dir / "simulation.log", "w") as out:
+        run_model(exe, run_dir, args, stdout=out, timeout=timeout)
+    status = read_exit_status(run_dir / "results" / "exit_status.txt")
+    if not status or status["status"] != "DONE":
+        raise RuntimeError(f"{name} did not finish ({status}), see {run_dir}")
+    return log
+
+
+def print_table(rows):
+    header = ["App", "Stream", "Size", "Ways", "Line", "Policy", "Write", "Accesses", "Hit %",
+              "Misses", "WB", "Stall cycles", "Slowdown"]
+    lines = [[r["app"], r["stream"], str(r["size"]), str(r["ways"]), str(r["line"]), r["policy"],
+              r["write"], str(r["accesses"]),
+              "-" if r["hit_rate"] is None else f"{100 * r['hit_rate']:.2f}",
+              str(r["misses"]), str(r["writebacks"]), str(r["stall_cycles"]),
+              "-" if r["slowdown"] is None else f"{r['slowdown']:.3f}"] for r in rows]
+    widths = [max(len(h), *(len(l[i]) for l in lines)) for i, h in enumerate(header)]
+    print()
+    print("  ".join(h.ljust(w) for h, w in zip(header, widths)))
+    print("  ".join("-" * w for w in widths))
+    for l in lines:
+        print("  ".join(c.ljust(w) for c, w in zip(l, widths)))
+
+
+def write_csv(path, rows):
+    with open(path, "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=COLUMNS, extrasaction="ignore")
+        writer.writeheader()
+        for row in rows:
+            writer.writerow({k: (f"{v:.6f}" if isinstance(v, float) else v) for k, v in row.items()})
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Simulates caches on the RAM access stream of RS5")
+    parser.add_argument("logs", nargs="*", help="RAM logs (+RAM_LOG), NAME=path or path")
+    parser.add_argument("--bin", action="append", default=[],
+                        help="Program binary NAME=path, run on the testbench to record its log")
+    parser.add_argument("--plusarg", action="append", default=[],
+                        help="Extra plusarg NAME=VALUE for --bin runs (e.g. IMAGE_FILE=img.bin)")
+    parser.add_argument("--stream", default="fetch,data", help="Streams to simulate: fetch, data")
+    parser.add_argument("--size", default="1K,2K,4K,8K", help="Cache sizes in bytes (K and M suffixes)")
+    parser.add_argument("--ways", default="1,2,4", help="Associativities")
+    parser.add_argument("--line", default="32", help="Line sizes in bytes")
+    parser.add_argument("--policy", default="lru", help="Replacement: lru, plru, random")
+    parser.add_argument("--write", default="wb", help="Write policy: wb (write-back, write-allocate), "
+                        "wt (write-through, no-write-allocate)")
+    parser.add_argument("--miss-penalty", type=int, default=10, help="Stall cycles per miss")
+    parser.add_argument("--writeback-penalty", type=int, default=None,
+                        help="Stall cycles per dirty eviction (default: the miss penalty)")
+    parser.add_argument("-j", "--jobs", type=int, default=os.cpu_count(),
+                        help="Configurations simulated in parallel")
+    parser.add_argument("--work-root", default=str(DEFAULT_WORK_ROOT), help="Run directories of --bin")
+    parser.add_argument("--timeout", type=float, default=None,
+                        help="Wall-clock limit per --bin simulation in seconds")
+    parser.add_argument("--csv", default=None, help="Also write the results to this CSV file")
+    args = parser.parse_args()
+
+    try:
+        workloads = [parse_workload(spec) for spec in args.logs]
+        binaries = [parse_workload(spec) for spec in args.bin]
+        plusargs = dict(p.split("=", 1) for p in args.plusarg)
+        streams = args.stream.split(",")
+        grid = list(itertools.product([parse_size(s) for s in args.size.split(",")],
+                                      [int(w) for w in args.ways.split(",")],
+                                      [parse_size(l) for l in args.line.split(",")],
+                                      args.policy.split(","), args.write.split(",")))
+        for config in grid:
+            Cache(*config)
+        if any(s not in STREAMS for s in streams):
+            raise ValueError(f"unknown stream in '{args.stream}'")
+    except (OSError, ValueError) as e:
+        sys.exit(f"error: {e}")
+    if not workloads and not binaries:
+        sys.exit("error: no RAM logs or --bin programs given")
+
+    if binaries:
+        exe = ModelCache(log=lambda m: print(m, flush=True)).get(SIM_DIR / "testbench.sv")
+        with ThreadPoolExecutor(max_workers=args.jobs) as pool:
+            futures = [(name, pool.submit(record_log, exe, name, binary, args.work_root, plusargs,
+                                          args.timeout)) for name, binary in binaries]
+            try:
+                workloads += [(name, future.result()) for name, future in futures]
+            except RuntimeError as e:
+                sys.exit(f"error: {e}")
+
+    writeback_penalty = args.miss_penalty if args.writeback_penalty is None else args.writeback_penalty
+    # The fetch stream has no writes, so it runs with the first write policy only
+    first_write = args.write.split(",")[0]
+    tasks = [(name, path, stream, config) for name, path in workloads for stream in streams
+             for config in grid if stream == "data" or config[4] == first_write]
+    print(f"{len(tasks)} simulations of {len(workloads)} workloads", flush=True)
+    with ProcessPoolExecutor(max_workers=args.jobs) as pool:
+        futures = [pool.submit(simulate, path, stream, config, args.miss_penalty, writeback_penalty)
+                   for _, path, stream, config in tasks]
+        rows = [dict(app=name, **future.result()) for (name, *_), future in zip(tasks, futures)]
+
+    print_table(rows)
+    if args.csv:
+        write_csv(args.csv, rows)
+        print(f"\nResults saved in {args.csv}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Checkpoint/restore of testbench runs at a marker symbol of the program.
+
+The savable variant of the testbench (-DSAVABLE, verilated with --savable
+through checkpoint_main.cpp) saves the whole model state the first time the
+marker PC retires; later runs of the same program restore that state, reload
++IMAGE_FILE and resume from the marker. The marker must retire before the
+program reads the image: the reload overwrites the image region only.
+
+What a checkpoint saves is whatever runs before the marker. For the programs
+of app/ built with app/common (crt0 and the newlib init before main, the
+default marker) that is the boot code. The image programs generated by
+pipeline_automatico.py have no crt0 or newlib and start at main (address 0);
+they emit their own marker (image_start) before reading the image header,
+so a checkpoint saves only the reset and the wait for the image load, about
+30 cycles per image.
+
+Verilator cannot serialize --timing coroutines, so the savable model is
+built with --no-timing and the testbench counts its reset/load sequence in
+clock cycles instead of delays. mcycle is part of the saved state: cycle
+counts of restored runs still include the cycles before the marker.
+
+Checkpoints are keyed by the model and by the program binary, since a
+different program boots into a different state. Programs that read their
+per-run constants from the loaded data (like the image header) share one
+checkpoint across inputs.
+
+Usage as a script:
+    python3 sim/checkpoint.py prog.elf prog.bin -- +IMAGE_FILE=img.bin ...
+runs the program, saving or restoring its checkpoint at main() (--marker
+selects another symbol).
+"""
+
+import os
+import sys
+import hashlib
+import argparse
+from pathlib import Path
+
+from model_cache import SIM_DIR, DEFAULT_FLAGS, ModelCache, run_model, read_exit_status, parse_param
+from elfreader import ElfFile
+
+CHECKPOINT_DIR = SIM_DIR / "checkpoints"
+HARNESS = SIM_DIR / "checkpoint_main.cpp"
+SAVABLE_FLAGS = DEFAULT_FLAGS + ("--savable", "--no-timing")
+SAVABLE_DEFINES = ("SAVABLE",)
+DEFAULT_MARKER = "main"
+
+
+def savable_model(cache, params=None):
+    """Executable of the savable testbench for these parameters"""
+    return cache.get(SIM_DIR / "testbench.sv", params, SAVABLE_DEFINES, SAVABLE_FLAGS,
+                     sources=(HARNESS,))
+
+
+def marker_address(elf, symbol=DEFAULT_MARKER):
+    """Address of the marker symbol in the program, or None if it has none"""
+    return ElfFile(elf).symbol(symbol)
+
+
+def checkpoint_path(exe, binary, directory=CHECKPOINT_DIR):
+    """Checkpoint of this program on this model (the model directory name is its key)"""
+    h = hashlib.sha256(Path(binary).read_bytes()).hexdigest()[:16]
+    return Path(directory) / f"{Path(exe).parents[1].name}-{h}.ckpt"
+
+
+def run_checkpointed(exe, run_dir, plusargs, checkpoint, marker, stdout=None, timeout=None):
+    """
+    Runs the savable model, restoring checkpoint if it exists; otherwise the
+    run starts from reset and saves it when marker retires. A restored run
+    that does not end with DONE is discarded (e.g. a stale checkpoint) and
+    repeated from reset.
+
+    Returns (subprocess result, True if the run was restored).
+    """
+    checkpoint = Path(checkpoint)
+    exit_file = plusargs.get("EXIT_FILE", Path(run_dir) / "results" / "exit_status.txt")
+
+    if checkpoint.exists():
+        result = run_model(exe, run_dir, {**plusargs, "CHECKPOINT_RESTORE": checkpoint},
+                           stdout, timeout)
+        status = read_exit_status(exit_file)
+        if status is not None and status["status"] == "DONE":
+            return result, True
+        checkpoint.unlink(missing_ok=True)
+
+    # Saved under a temporary name so concurrent runs never restore a
+    # partially written checkpoint
+    checkpoint.parent.mkdir(parents=True, exist_ok=True)
+    tmp = checkpoint.with_name(f"{checkpoint.name}.tmp-{os.getpid()}")
+    result = run_model(exe, run_dir, {**plusargs, "CHECKPOINT_PC": f"{marker:x}",
+                                      "CHECKPOINT_SAVE": tmp}, stdout, timeout)
+    if tmp.exists():
+        os.replace(tmp, checkpoint)
+    return result, False
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Runs a program on the savable testbench, "
+                                                 "resuming from a checkpoint at a marker symbol")
+    parser.add_argument("elf", help="Program ELF (for the marker address)")
+    parser.add_argument("bin", help="Program binary loaded by the testbench")
+    parser.add_argument("plusargs", nargs="*", help="Other +NAME=value plusargs")
+    parser.add_argument("--marker", default=DEFAULT_MARKER, help="Symbol where the checkpoint is taken")
+    parser.add_argument("-G", dest="params", action="append", default=[],
+                        type=parse_param, help="Parameter override NAME=VALUE")
+    parser.add_argument("--run-dir", default=".", help="Directory of results/ and debug/")
+    args = parser.parse_args()
+
+    marker = marker_address(args.elf, args.marker)
+    if marker is None:
+        sys.exit(f"error: {args.elf} has no symbol '{args.marker}'")
+
+    cache = ModelCache(log=lambda m: print(m, file=sys.stderr))
+    exe = savable_model(cache, dict(args.params))
+    plusargs = dict(p.lstrip("+").split("=", 1) for p in args.plusargs)
+    plusargs["BIN_FILE"] = Path(args.bin).resolve()
+
+    checkpoint = checkpoint_path(exe, args.bin)
+    result, restored = run_checkpointed(exe, args.run_dir, plusargs, checkpoint, marker)
+    print(f"{'Restored' if restored else 'Ran from reset'} ({checkpoint.name}), "
+          f"exit status {result.returncode}", file=sys.stderr)
+    sys.exit(result.returncode)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+// Harness of the savable testbench model (testbench.sv with -DSAVABLE, built
+// by checkpoint.py with --savable --no-timing).
+//
+// Drives the clock with the same 10 ns period as the timed testbench and
+// adds two plusargs:
+//   +CHECKPOINT_SAVE=<path>     write the model state when the testbench
+//                               calls tb_checkpoint() (see +CHECKPOINT_PC)
+//   +CHECKPOINT_RESTORE=<path>  start from a saved state instead of reset,
+//                               then let tb_resume() reopen the outputs and
+//                               patch the image region
+// Every other plusarg is read by the testbench as usual.
+
+#include <cinttypes>
+#include <memory>
+#include <string>
+
+#include "Vtestbench.h"
+#include "Vtestbench__Dpi.h"
+#include "svdpi.h"
+#include "verilated.h"
+#include "verilated_save.h"
+
+static bool checkpoint_requested = false;
+
+// Called from the testbench in the middle of eval(); the state is saved
+// once eval() returns
+void tb_checkpoint() { checkpoint_requested = true; }
+
+static std::string plusarg(VerilatedContext* contextp, const std::string& name) {
+    const std::string match = contextp->commandArgsPlusMatch((name + "=").c_str());
+    return match.empty() ? "" : match.substr(name.size() + 2);
+}
+
+static void save(VerilatedContext* contextp, Vtestbench* topp, const std::string& path) {
+    VerilatedSave os;
+    os.open(path.c_str());
+    uint64_t time = contextp->time();
+    os << time;
+    os << *topp;
+    os.close();
+    VL_PRINTF("# %" PRIu64 " CHECKPOINT SAVED to %s\n", time, path.c_str());
+}
+
+static void restore(VerilatedContext* contextp, Vtestbench* topp, const std::string& path) {
+    VerilatedRestore os;
+    os.open(path.c_str());
+    uint64_t time = 0;
+    os >> time;
+    os >> *topp;
+    os.close();
+    contextp->time(time);
+}
+
+int main(int argc, char** argv) {
+    const std::unique_ptr<VerilatedContext> contextp{new VerilatedContext};
+    contextp->commandArgs(argc, argv);
+    const std::unique_ptr<Vtestbench> topp{new Vtestbench{contextp.get(), "TOP"}};
+
+    const std::string save_path = plusarg(contextp.get(), "CHECKPOINT_SAVE");
+    const std::string restore_path = plusarg(contextp.get(), "CHECKPOINT_RESTORE");
+
+    topp->clk = 1;
+    if (!restore_path.empty()) {
+        restore(contextp.get(), topp.get(), restore_path);
+        svSetScope(svGetScopeFromName("TOP.testbench"));
+        tb_resume();
+    }
+
+    while (!contextp->gotFinish()) {
+        topp->eval();
+        if (checkpoint_requested) {
+            checkpoint_requested = false;
+            if (!save_path.empty()) save(contextp.get(), topp.get(), save_path);
+        }
+        contextp->timeInc(5);
+        topp->clk = !topp->clk;
+    }
+
+    topp->final();
+    return 0;
+}
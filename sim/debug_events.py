@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Reader for the debug events of testbench.sv (+DEBUG_EVENTS=..., +DEBUG_FILE).
+
+Every event is a 24-byte little-endian record: mcycle (64 bits), event kind,
+flags and three 32-bit operands whose meaning depends on the kind:
+
+    fetch   a: PC            b: instruction
+    read    a: address       b: data         c: PC    flags: device << 4
+    write   a: address       b: data         c: PC    flags: device << 4 | byte enables
+    plugin  a: address       b: data         c: PC    flags: bit 0 write, bit 1 DMA
+    custom  a: instruction   b: rs1 value    c: rs2 value   flags: bit 0 ADD_PLUGIN
+
+read_events() returns the records as a NumPy structured array; with a kind
+the operands are renamed after it (events["addr"], events["pc"], ...).
+
+Usage:
+    python3 sim/debug_events.py debug/events.bin
+    python3 sim/debug_events.py debug/events.bin --kind write --addr 0x80001000:0x80002000
+"""
+
+import os
+import sys
+import argparse
+
+import numpy as np
+
+KINDS = {"fetch": 1, "read": 2, "write": 3, "plugin": 4, "custom": 5}
+DEVICES = ("ram", "plugin", "rtc", "plic", "tb")
+
+EVENT_DTYPE = np.dtype([("cycle", "<u8"), ("kind", "u1"), ("flags", "u1"), ("reserved", "<u2"),
+                        ("a", "<u4"), ("b", "<u4"), ("c", "<u4")])
+
+OPERANDS = {"fetch": ("pc", "insn", "unused"), "read": ("addr", "data", "pc"),
+            "write": ("addr", "data", "pc"), "plugin": ("addr", "data", "pc"),
+            "custom": ("insn", "rs1", "rs2")}
+
+
+def kind_dtype(kind):
+    """EVENT_DTYPE with the operands named after the event kind"""
+    return np.dtype({"names": list(EVENT_DTYPE.names[:4]) + list(OPERANDS[kind]),
+                     "formats": [EVENT_DTYPE.fields[n][0] for n in EVENT_DTYPE.names]})
+
+
+def read_events(path, kind=None):
+    """
+    Events of the file as a structured array. The whole file is memory
+    mapped; selecting a kind copies only its records, with named operands.
+    """
+    if os.path.getsize(path) < EVENT_DTYPE.itemsize:
+        events = np.zeros(0, dtype=EVENT_DTYPE)
+    else:
+        events = np.memmap(path, dtype=EVENT_DTYPE, mode="r")
+    if kind is None:
+        return events
+    if kind not in KINDS:
+        raise ValueError(f"unknown event kind '{kind}', expected one of {', '.join(KINDS)}")
+    return np.ascontiguousarray(events[events["kind"] == KINDS[kind]]).view(kind_dtype(kind))
+
+
+def device(events):
+    """Device index of read/write events (see DEVICES)"""
+    return (events["flags"] >> 4) & 7
+
+
+def byte_enables(events):
+    return events["flags"] & 0xf
+
+
+def in_range(events, field, lo, hi):
+    """Events whose field lies in [lo, hi)"""
+    return events[(events[field] >= lo) & (events[field] < hi)]
+
+
+def summary(events):
+    """{kind: number of events}"""
+    counts = np.bincount(events["kind"], minlength=max(KINDS.values()) + 1)
+    return {name: int(counts[k]) for name, k in KINDS.items() if counts[k]}
+
+
+def format_event(kind, e):
+    if kind == "fetch":
+        return f"{e['cycle']:>10} fetch   PC=0x{e['pc']:08x} instr=0x{e['insn']:08x}"
+    if kind in ("read", "write"):
+        dev = DEVICES[(e["flags"] >> 4) & 7] if (e["flags"] >> 4) & 7 < len(DEVICES) else "?"
+        enable = f" enable=0x{e['flags'] & 0xf:x}" if kind == "write" else ""
+        return (f"{e['cycle']:>10} {kind:<7} addr=0x{e['addr']:08x} data=0x{e['data']:08x} "
+                f"PC=0x{e['pc']:08x} {dev}{enable}")
+    if kind == "plugin":
+        access = ("DMA " if e["flags"] & 2 else "") + ("write" if e["flags"] & 1 else "read")
+        return f"{e['cycle']:>10} plugin  {access} addr=0x{e['addr']:08x} data=0x{e['data']:08x}"
+    name = "ADD_PLUGIN" if e["flags"] & 1 else "custom-0"
+    return (f"{e['cycle']:>10} custom  {name} instr=0x{e['insn']:08x} "
+            f"rs1=0x{e['rs1']:08x} rs2=0x{e['rs2']:08x}")
+
+
+def parse_range(spec, end):
+    """"LO:HI" (HI optional, up to end) -> (lo, hi)"""
+    lo, _, hi = spec.partition(":")
+    return int(lo or "0", 0), int(hi, 0) if hi else end
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Decodes the debug events of the testbench")
+    parser.add_argument("file", help="Events file written with +DEBUG_EVENTS")
+    parser.add_argument("--kind", choices=KINDS, nargs="+", help="Event kinds to print")
+    parser.add_argument("--addr", help="Only addresses (PCs for fetch) in LO:HI; custom events are not filtered")
+    parser.add_argument("--cycles", help="Only cycles in LO:HI")
+    parser.add_argument("--limit", type=int, default=100, help="Events printed per kind (0: all)")
+    args = parser.parse_args()
+
+    try:
+        counts = summary(read_events(args.file))
+    except (OSError, ValueError) as e:
+        sys.exit(f"error: {e}")
+    print(", ".join(f"{n} {k}" for k, n in counts.items()) or "no events")
+
+    for kind in args.kind or []:
+        events = read_events(args.file, kind)
+        if args.addr and kind != "custom":
+            events = in_range(events, OPERANDS[kind][0], *parse_range(args.addr, 1 << 32))
+        if args.cycles:
+            events = in_range(events, "cycle", *parse_range(args.cycles, 1 << 64))
+        print(f"\n{kind}: {len(events)} events")
+        for e in events[:args.limit or None]:
+            print(format_event(kind, e))
+
+
+if __name__ == "__main__":
+    main()
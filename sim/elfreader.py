@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+"""
+Minimal pure-Python ELF32/ELF64 reader for RS5 test programs.
+
+Only what the simulation flows need is parsed: the symbol table (to find
+tohost, begin_signature, end_signature, ...) and the allocated sections with
+contents, which are laid out by load address the same way
+`objcopy -O binary` does. This avoids spawning readelf/objcopy per test.
+
+Usage as a script:
+    python3 sim/elfreader.py my.elf                      # list symbols
+    python3 sim/elfreader.py my.elf -s tohost -s begin_signature
+    python3 sim/elfreader.py my.elf -o test.bin          # objcopy -O binary
+"""
+
+import sys
+import struct
+import argparse
+
+import numpy as np
+
+ELF_MAGIC = b"\x7fELF"
+ELFCLASS32 = 1
+ELFCLASS64 = 2
+ELFDATA2LSB = 1
+ELFDATA2MSB = 2
+
+PT_LOAD = 1
+SHT_SYMTAB = 2
+SHT_NOBITS = 8
+SHF_ALLOC = 0x2
+SHF_EXECINSTR = 0x4
+STT_NOTYPE = 0
+STT_FUNC = 2
+
+# (header, program header, section header, symbol) layouts after e_ident
+LAYOUTS = {
+    ELFCLASS32: ("HHIIIIIHHHHHH", "IIIIIIII", "IIIIIIIIII", "IIIBBH"),
+    ELFCLASS64: ("HHIQQQIHHHHHH", "IIQQQQQQ", "IIQQQQIIQQ", "IBBHQQ"),
+}
+
+
+class ElfFile:
+    """Symbols and loadable contents of an ELF file, read once into memory"""
+
+    def __init__(self, path):
+        with open(path, "rb") as f:
+            self.data = f.read()
+        self.path = path
+
+        ident = self.data[:16]
+        if ident[:4] != ELF_MAGIC:
+            raise ValueError(f"{path} is not an ELF file")
+        self.elfclass = ident[4]
+        if self.elfclass not in LAYOUTS:
+            raise ValueError(f"{path}: unsupported ELF class {self.elfclass}")
+        if ident[5] not in (ELFDATA2LSB, ELFDATA2MSB):
+            raise ValueError(f"{path}: unsupported ELF data encoding {ident[5]}")
+        self.endian = "<" if ident[5] == ELFDATA2LSB else ">"
+
+        ehdr, phdr, shdr, sym = LAYOUTS[self.elfclass]
+        (self.e_type, self.e_machine, _, self.entry, phoff, shoff, _, _,
+         phentsize, phnum, shentsize, shnum, shstrndx) = self._unpack(ehdr, 16)
+
+        self.segments = [self._segment(phdr, phoff + i * phentsize) for i in range(phnum)]
+        self.sections = [self._section(shdr, shoff + i * shentsize) for i in range(shnum)]
+        if shstrndx < len(self.sections):
+            names = self.sections[shstrndx]
+            for s in self.sections:
+                s["name"] = self._string(names["offset"], s["name_off"])
+        self._sym_layout = sym
+        self._symbols = None
+        self._symbol_table = None
+
+    def _unpack(self, layout, offset):
+        fmt = self.endian + layout
+        return struct.unpack_from(fmt, self.data, offset)
+
+    def _string(self, table_offset, index):
+        start = table_offset + index
+        return self.data[start:self.data.index(b"\0", start)].decode()
+
+    def _segment(self, layout, offset):
+        if self.elfclass == ELFCLASS32:
+            ptype, poff, vaddr, paddr, filesz, memsz, flags, _ = self._unpack(layout, offset)
+        else:
+            ptype, flags, poff, vaddr, paddr, filesz, memsz, _ = self._unpack(layout, offset)
+        return {"type": ptype, "offset": poff, "vaddr": vaddr, "paddr": paddr,
+                "filesz": filesz, "memsz": memsz, "flags": flags}
+
+    def _section(self, layout, offset):
+        name_off, stype, flags, addr, soff, size, link, _, _, entsize = self._unpack(layout, offset)
+        return {"name_off": name_off, "name": "", "type": stype, "flags": flags, "addr": addr,
+                "offset": soff, "size": size, "link": link, "entsize": entsize}
+
+    def symbol_table(self):
+        """Every named .symtab entry as a dict: name, value, size, type, shndx"""
+        if self._symbol_table is None:
+            self._symbol_table = []
+            for s in self.sections:
+                if s["type"] != SHT_SYMTAB or not s["entsize"]:
+                    continue
+                strtab = self.sections[s["link"]]["offset"]
+                for off in range(s["offset"], s["offset"] + s["size"], s["entsize"]):
+                    fields = self._unpack(self._sym_layout, off)
+                    if self.elfclass == ELFCLASS32:
+                        name, value, size, info, _, shndx = fields
+                    else:
+                        name, info, _, shndx, value, size = fields
+                    if name:
+                        self._symbol_table.append({
+                            "name": self._string(strtab, name), "value": value, "size": size,
+                            "type": info & 0xf, "shndx": shndx})
+        return self._symbol_table
+
+    def symbols(self):
+        """{name: value} of every named symbol in .symtab"""
+        if self._symbols is None:
+            self._symbols = {}
+            for sym in self.symbol_table():
+                self._symbols.setdefault(sym["name"], sym["value"])
+        return self._symbols
+
+    def functions(self):
+        """
+        Sorted (start, end, name) of the code symbols: STT_FUNC when the
+        program has any (C code), otherwise every symbol in an executable
+        section (assembly labels). Symbols without a size end at the next one.
+        """
+        executable = {i for i, s in enumerate(self.sections) if s["flags"] & SHF_EXECINSTR}
+        code = [sym for sym in self.symbol_table()
+                if sym["shndx"] in executable and sym["type"] in (STT_NOTYPE, STT_FUNC)]
+        if any(sym["type"] == STT_FUNC for sym in code):
+            code = [sym for sym in code if sym["type"] == STT_FUNC]
+        code.sort(key=lambda sym: (sym["value"], -sym["size"], sym["name"]))
+
+        functions = []
+        for sym in code:
+            if functions and functions[-1][0] == sym["value"]:
+                continue
+            functions.append([sym["value"], sym["value"] + sym["size"], sym["name"], sym["size"]])
+        for this, following in zip(functions, functions[1:] + [None]):
+            if not this[3]:
+                this[1] = following[0] if following else this[0] + 4
+        return [(start, end, name) for start, end, name, _ in functions]
+
+    def symbol(self, name, default=None):
+        return self.symbols().get(name, default)
+
+    def _lma(self, section):
+        """Load address of a section: its VMA moved by the segment that contains it"""
+        for seg in self.segments:
+            if (seg["type"] == PT_LOAD and
+                    seg["offset"] <= section["offset"] < seg["offset"] + seg["filesz"]):
+                return seg["paddr"] + section["offset"] - seg["offset"]
+        return section["addr"]
+
+    def load_segments(self):
+        """[(load address, bytes)] of the allocated sections with contents"""
+        return [(self._lma(s), self.data[s["offset"]:s["offset"] + s["size"]])
+                for s in self.sections
+                if s["flags"] & SHF_ALLOC and s["type"] != SHT_NOBITS and s["size"]]
+
+    def image(self):
+        """
+        Flat memory image, as objcopy -O binary would write it.
+
+        Returns (base, data): the lowest load address and a uint8 array that
+        covers every loaded section, with zeros in the gaps.
+        """
+        segments = self.load_segments()
+        if not segments:
+            return 0, np.zeros(0, dtype=np.uint8)
+        base = min(a for a, _ in segments)
+        end = max(a + len(d) for a, d in segments)
+        data = np.zeros(end - base, dtype=np.uint8)
+        for addr, contents in segments:
+            data[addr - base:addr - base + len(contents)] = np.frombuffer(contents, dtype=np.uint8)
+        return base, data
+
+
+def read_symbols(path, names=None):
+    """{name: value} of the requested symbols (all of them if names is None)"""
+    symbols = ElfFile(path).symbols()
+    if names is None:
+        return dict(symbols)
+    return {n: symbols[n] for n in names if n in symbols}
+
+
+def load_image(path):
+    """(base, uint8 array) flat image of path, see ElfFile.image"""
+    return ElfFile(path).image()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Reads symbols and the memory image of an ELF file")
+    parser.add_argument("elf", help="Input ELF file")
+    parser.add_argument("-s", "--symbol", action="append", default=None,
+                        help="Print only this symbol (repeatable)")
+    parser.add_argument("-o", "--output", help="Write the flat binary image here")
+    args = parser.parse_args()
+
+    try:
+        elf = ElfFile(args.elf)
+    except (OSError, ValueError) as e:
+        sys.exit(f"error: {e}")
+
+    if args.output:
+        _, data = elf.image()
+        data.tofile(args.output)
+    else:
+        symbols = elf.symbols()
+        for name in args.symbol or sorted(symbols, key=symbols.get):
+            if name not in symbols:
+                sys.exit(f"error: symbol {name} not found")
+            print(f"{symbols[name]:08x} {name}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,228 @@
+#!/usr/bin/env python3
+"""
+Hotspot profiler for the retire trace of testbench.sv (+RETIRE_TRACE=<path>).
+
+The trace holds one 16-byte little-endian record per retired instruction:
+PC (bit 0 set for compressed instructions), instruction word and mcycle.
+Each instruction is charged the cycles since the previous retirement, so
+the cycles the pipeline spends stalled or refilling land on the instruction
+that was waiting; everything above one cycle per instruction is reported as
+stall cycles. PCs are mapped to the functions of the program's ELF symbol
+table and, when a RISC-V addr2line is available, to source lines.
+
+Usage:
+    python3 sim/hotspot.py results/retire.bin app/coremark/coremark.elf
+    python3 sim/hotspot.py retire.bin prog.elf --top 15 --lines 30 --mix
+"""
+
+import os
+import sys
+import argparse
+import subprocess
+
+import numpy as np
+
+from elfreader import ElfFile
+
+TRACE_DTYPE = np.dtype([("pc", "<u4"), ("insn", "<u4"), ("cycle", "<u8")])
+DEFAULT_ADDR2LINE = "riscv64-elf-addr2line"
+
+# Instruction classes, named after the CSRBank counters where they exist
+CLASSES = ("lui_slt", "logic", "addsub", "shift", "branch", "jump", "load", "store",
+           "sys", "csr", "mul", "div", "amo", "vector", "other")
+
+_OP_IMM = {0: "addsub", 1: "shift", 2: "lui_slt", 3: "lui_slt", 4: "logic", 5: "shift",
+           6: "logic", 7: "logic"}
+_OPCODES = {0x37: "lui_slt", 0x17: "addsub", 0x63: "branch", 0x6f: "jump", 0x67: "jump",
+            0x03: "load", 0x23: "store", 0x2f: "amo", 0x57: "vector", 0x07: "vector",
+            0x27: "vector", 0x0f: "sys"}
+
+
+def read_trace(path):
+    """Trace records as a structured array (memory mapped, so large traces are cheap)"""
+    if os.path.getsize(path) < TRACE_DTYPE.itemsize:
+        return np.zeros(0, dtype=TRACE_DTYPE)
+    return np.memmap(path, dtype=TRACE_DTYPE, mode="r")
+
+
+def _classify_compressed(insn):
+    quadrant, funct3 = insn & 3, (insn >> 13) & 7
+    bit12, rd, rs2 = (insn >> 12) & 1, (insn >> 7) & 0x1f, (insn >> 2) & 0x1f
+    if quadrant == 0:
+        if funct3 == 0:
+            return "addsub"
+        if funct3 == 4:                               # Zcb byte/half loads and stores
+            return "store" if (insn >> 11) & 1 else "load"
+        return "load" if funct3 < 4 else "store"
+    if quadrant == 1:
+        if funct3 in (0, 2):
+            return "addsub"
+        if funct3 in (1, 5):
+            return "jump"
+        if funct3 == 3:
+            return "addsub" if rd == 2 else "lui_slt"
+        if funct3 == 4:
+            kind = (insn >> 10) & 3
+            if kind < 2:
+                return "shift"
+            if kind == 2:
+                return "logic"
+            if bit12:                                 # Zcb zext/sext/not/mul
+                return "mul" if (insn >> 5) & 3 == 2 else "logic"
+            return "addsub" if (insn >> 5) & 3 == 0 else "logic"
+        return "branch"
+    if funct3 == 0:
+        return "shift"
+    if funct3 in (1, 2, 3):
+        return "load"
+    if funct3 == 4:
+        if rs2 == 0:
+            return "sys" if bit12 and rd == 0 else "jump"
+        return "addsub"
+    return "store"
+
+
+def classify(insn):
+    """Instruction class of an instruction word (compressed or not)"""
+    if insn & 3 != 3:
+        return _classify_compressed(insn & 0xffff)
+    opcode, funct3, funct7 = insn & 0x7f, (insn >> 12) & 7, insn >> 25
+    if opcode == 0x13:
+        return _OP_IMM[funct3]
+    if opcode == 0x33:
+        if funct7 == 1:
+            return "mul" if funct3 < 4 else "div"
+        if funct7 == 0x07:                            # Zicond
+            return "logic"
+        if funct7 & 0x11 == 0x11:                     # Zkne aes32es(m)i
+            return "other"
+        return _OP_IMM[funct3]
+    if opcode == 0x73:
+        return "sys" if funct3 == 0 else "csr"
+    return _OPCODES.get(opcode, "other")
+
+
+def per_pc(trace):
+    """
+    Aggregates the trace by PC: returns (pcs, instruction words, retired
+    count, cycles, stall cycles), one entry per distinct PC.
+    """
+    cycles = np.diff(trace["cycle"].astype(np.int64), prepend=np.int64(trace["cycle"][0]) - 1)
+    pcs, first, inverse = np.unique(trace["pc"] & ~np.uint32(1), return_index=True,
+                                    return_inverse=True)
+    count = np.bincount(inverse, minlength=len(pcs))
+    total = np.bincount(inverse, weights=cycles, minlength=len(pcs)).astype(np.int64)
+    return pcs, trace["insn"][first], count, total, total - count
+
+
+def addr2line(elf_path, pcs, tool=DEFAULT_ADDR2LINE):
+    """['file:line', ...] of each PC, or None if the tool is not available"""
+    try:
+        out = subprocess.run([tool, "-e", str(elf_path)], capture_output=True, text=True,
+                             input="\n".join(f"{pc:x}" for pc in pcs), check=True)
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    lines = out.stdout.splitlines()
+    if len(lines) != len(pcs):
+        return None
+    return [f"{os.path.basename(l.split(':')[0])}:{l.rsplit(':', 1)[1].split()[0]}"
+            if not l.startswith("??") else "??" for l in lines]
+
+
+def profile(trace, elf):
+    """
+    Flat profile of the trace: {function: {"cycles", "instret", "stalls",
+    "mix": {class: count}}} plus the per-PC arrays for the line profile.
+    """
+    pcs, insns, count, cycles, stalls = per_pc(trace)
+    functions = elf.functions()
+    starts = np.array([f[0] for f in functions], dtype=np.int64)
+    index = np.searchsorted(starts, pcs.astype(np.int64), side="right") - 1
+
+    flat = {}
+    for pc, insn, n, c, s, i in zip(pcs, insns, count, cycles, stalls, index):
+        name = functions[i][2] if i >= 0 and pc < functions[i][1] else f"?{pc:08x}"
+        entry = flat.setdefault(name, {"cycles": 0, "instret": 0, "stalls": 0,
+                                       "mix": dict.fromkeys(CLASSES, 0)})
+        entry["cycles"] += int(c)
+        entry["instret"] += int(n)
+        entry["stalls"] += int(s)
+        entry["mix"][classify(int(insn))] += int(n)
+    return flat, (pcs, count, cycles, stalls)
+
+
+def print_flat(flat, top):
+    total = sum(e["cycles"] for e in flat.values()) or 1
+    print(f"{'Function':<32} {'Cycles':>12} {'%':>6} {'Cum %':>6} {'Instret':>12} {'CPI':>6} "
+          f"{'Stalls':>10} {'Stall %':>7}")
+    print("-" * 100)
+    cumulative = 0
+    for name, e in sorted(flat.items(), key=lambda item: -item[1]["cycles"])[:top]:
+        cumulative += e["cycles"]
+        print(f"{name[:32]:<32} {e['cycles']:>12} {100 * e['cycles'] / total:>6.2f} "
+              f"{100 * cumulative / total:>6.2f} {e['instret']:>12} "
+              f"{e['cycles'] / e['instret']:>6.2f} {e['stalls']:>10} "
+              f"{100 * e['stalls'] / e['cycles']:>7.2f}")
+
+
+def print_mix(flat, top):
+    ranked = sorted(flat.items(), key=lambda item: -item[1]["cycles"])[:top]
+    used = [c for c in CLASSES if any(e["mix"][c] for _, e in ranked)]
+    print(f"{'Function':<32} " + " ".join(f"{c:>7}" for c in used))
+    print("-" * (33 + 8 * len(used)))
+    for name, e in ranked:
+        print(f"{name[:32]:<32} " + " ".join(f"{100 * e['mix'][c] / e['instret']:>6.1f}%"
+                                              for c in used))
+
+
+def print_lines(elf_path, per_pc_data, top, tool):
+    pcs, count, cycles, stalls = per_pc_data
+    lines = addr2line(elf_path, pcs, tool)
+    if lines is None:
+        print(f"Source lines unavailable ({tool} not found or no debug info)")
+        return
+    by_line = {}
+    for line, n, c, s in zip(lines, count, cycles, stalls):
+        entry = by_line.setdefault(line, [0, 0, 0])
+        entry[0] += int(c)
+        entry[1] += int(n)
+        entry[2] += int(s)
+    total = int(cycles.sum()) or 1
+    print(f"{'Line':<40} {'Cycles':>12} {'%':>6} {'Instret':>12} {'Stalls':>10}")
+    print("-" * 84)
+    for line, (c, n, s) in sorted(by_line.items(), key=lambda item: -item[1][0])[:top]:
+        print(f"{line[:40]:<40} {c:>12} {100 * c / total:>6.2f} {n:>12} {s:>10}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Flat cycle profile of a retire trace")
+    parser.add_argument("trace", help="Trace written with +RETIRE_TRACE")
+    parser.add_argument("elf", help="ELF of the simulated program")
+    parser.add_argument("--top", type=int, default=20, help="Functions to list")
+    parser.add_argument("--lines", type=int, default=0, help="Also list the N hottest source lines")
+    parser.add_argument("--mix", action="store_true", help="Also print the instruction mix per function")
+    parser.add_argument("--addr2line", default=DEFAULT_ADDR2LINE, help="addr2line used for --lines")
+    args = parser.parse_args()
+
+    try:
+        trace = read_trace(args.trace)
+        elf = ElfFile(args.elf)
+    except (OSError, ValueError) as e:
+        sys.exit(f"error: {e}")
+    if not len(trace):
+        sys.exit(f"error: {args.trace} holds no retired instructions")
+
+    flat, per_pc_data = profile(trace, elf)
+    cycles = int(trace["cycle"][-1] - trace["cycle"][0]) + 1
+    print(f"{len(trace)} instructions retired in {cycles} cycles (IPC {len(trace) / cycles:.3f})\n")
+    print_flat(flat, args.top)
+    if args.mix:
+        print()
+        print_mix(flat, args.top)
+    if args.lines:
+        print()
+        print_lines(args.elf, per_pc_data, args.lines, args.addr2line)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,403 @@
+#!/usr/bin/env python3
+"""
+Memory image conversion between the formats used around RS5.
+
+    bin   raw bytes, in RAM (little-endian) order
+    hex   $readmemh text, one 32-bit word per line, optional @<word address>
+    coe   Xilinx COE (memory_initialization_vector), 32-bit words
+    ihex  Intel HEX, 16-byte data records with extended linear addresses
+    mem   Vivado/updatemem .mem, @<word address> followed by 32-bit words
+    elf   ELF executable (input only), laid out as objcopy -O binary does
+
+Words are formatted in batches with NumPy (one bytes.hex() per chunk) and raw
+binary inputs are streamed in chunks, so large images are never expanded into
+Python ints. Memories of any size are supported: --size pads the image with
+zeros and --base places it at an offset (as address records where the format
+has them, as leading zeros otherwise).
+
+Usage as a script:
+    python3 sim/memimage.py prog.bin prog.hex
+    python3 sim/memimage.py prog.bin memimage.coe --size 65536
+    python3 sim/memimage.py prog.bin prog.ihex --base 0x80000000
+    python3 sim/memimage.py my.elf test.bin
+"""
+
+import sys
+import argparse
+from pathlib import Path
+
+import numpy as np
+
+import elfreader
+
+FORMATS = ("bin", "hex", "coe", "ihex", "mem")
+INPUT_FORMATS = FORMATS + ("elf",)
+EXTENSIONS = {
+    ".bin": "bin",
+    ".hex": "hex",
+    ".coe": "coe",
+    ".ihex": "ihex",
+    ".ihx": "ihex",
+    ".mem": "mem",
+    ".elf": "elf",
+}
+
+DEFAULT_CHUNK = 1 << 20     # bytes per streamed chunk (multiple of 16)
+MEM_WORDS_PER_LINE = 8
+IHEX_RECORD_BYTES = 16
+
+
+def guess_format(path):
+    """Format from the file extension ('.hex' is $readmemh, Intel HEX is '.ihex')"""
+    fmt = EXTENSIONS.get(Path(path).suffix.lower())
+    if fmt is None:
+        raise ValueError(f"Cannot infer the memory format of {path}, pass it explicitly")
+    return fmt
+
+
+# ---------------------------------------------------------------------------
+# Readers
+# ---------------------------------------------------------------------------
+
+def iter_bin(path, chunk_size=DEFAULT_CHUNK):
+    """Streams a raw binary as uint8 arrays"""
+    with open(path, "rb") as f:
+        while True:
+            data = f.read(chunk_size)
+            if not data:
+                return
+            yield np.frombuffer(data, dtype=np.uint8)
+
+
+def _words_to_bytes(tokens):
+    """Hex word tokens -> little-endian bytes"""
+    if all(len(t) == 8 for t in tokens):
+        words = np.frombuffer(bytes.fromhex("".join(tokens)), dtype=">u4")
+    else:
+        words = np.array([int(t, 16) for t in tokens], dtype=np.uint32)
+    return words.astype("<u4").view(np.uint8)
+
+
+def _place(segments):
+    """[(byte address, uint8 array)] -> (base, contiguous uint8 array)"""
+    segments = [(a, d) for a, d in segments if len(d)]
+    if not segments:
+        return 0, np.zeros(0, dtype=np.uint8)
+    base = min(a for a, _ in segments)
+    end = max(a + len(d) for a, d in segments)
+    image = np.zeros(end - base, dtype=np.uint8)
+    for addr, data in segments:
+        image[addr - base:addr - base + len(data)] = data
+    return base, image
+
+
+def _read_readmem(path):
+    """$readmemh / .mem text with optional @<word address> markers"""
+    segments = []
+    addr = 0
+    tokens = []
+    with open(path) as f:
+        text = f.read()
+    for line in text.splitlines():
+        line = line.split("//", 1)[0]
+        for tok in line.split():
+            if tok.startswith("@"):
+                if tokens:
+                    segments.append((addr, _words_to_bytes(tokens)))
+                    addr += 4 * len(tokens)
+                    tokens = []
+                addr = int(tok[1:], 16) * 4
+            else:
+                tokens.append(tok.replace("_", ""))
+    if tokens:
+        segments.append((addr, _words_to_bytes(tokens)))
+    return _place(segments)
+
+
+def _read_coe(path):
+    with open(path) as f:
+        text = f.read()
+    header, _, vector = text.partition("memory_initialization_vector")
+    radix = 16
+    for stmt in header.split(";"):
+        key, _, value = stmt.partition("=")
+        if key.strip() == "memory_initialization_radix":
+            radix = int(value)
+    vector = vector.lstrip(" \t\n=").split(";", 1)[0]
+    tokens = [t for t in vector.replace(",", " ").split() if t]
+    if radix == 16:
+        return 0, _words_to_bytes(tokens)
+    words = np.array([int(t, radix) for t in tokens], dtype=np.uint32)
+    return 0, words.astype("<u4").view(np.uint8)
+
+
+def _read_ihex(path):
+    segments = []
+    upper = 0
+    with open(path) as f:
+        for lineno, line in enumerate(f, 1):
+            line = line.strip()
+            if not line:
+                continue
+            if not line.startswith(":"):
+                raise ValueError(f"{path}:{lineno}: not an Intel HEX record")
+            record = bytes.fromhex(line[1:])
+            if sum(record) & 0xFF:
+                raise ValueError(f"{path}:{lineno}: bad checksum")
+            count, offset, rtype = record[0], int.from_bytes(record[1:3], "big"), record[3]
+            payload = record[4:4 + count]
+            if rtype == 0x00:
+                segments.append((upper + offset, np.frombuffer(payload, dtype=np.uint8)))
+            elif rtype == 0x01:
+                break
+            elif rtype == 0x02:
+                upper = int.from_bytes(payload, "big") << 4
+            elif rtype == 0x04:
+                upper = int.from_bytes(payload, "big") << 16
+    return _place(segments)
+
+
+def load(path, fmt=None):
+    """
+    Reads a memory image of any supported format.
+
+    Returns (base, data): the byte address of the first byte and a uint8 array.
+    """
+    fmt = fmt or guess_format(path)
+    if fmt == "bin":
+        return 0, np.fromfile(path, dtype=np.uint8)
+    if fmt in ("hex", "mem"):
+        return _read_readmem(path)
+    if fmt == "coe":
+        return _read_coe(path)
+    if fmt == "ihex":
+        return _read_ihex(path)
+    if fmt == "elf":
+        return elfreader.load_image(path)
+    raise ValueError(f"Unknown memory format: {fmt}")
+
+
+# ---------------------------------------------------------------------------
+# Writers
+# ---------------------------------------------------------------------------
+
+def _word_chunks(chunks, lead=0, pad_to=None):
+    """
+    Re-chunks uint8 arrays into word-aligned pieces, with `lead` zero bytes
+    in front and zero padding up to pad_to bytes (or the next word).
+    """
+    zeros = np.zeros(DEFAULT_CHUNK, dtype=np.uint8)
+    total = 0
+    while lead > 0:
+        n = min(lead, DEFAULT_CHUNK)
+        yield zeros[:n]
+        lead -= n
+        total += n
+
+    carry = np.zeros(0, dtype=np.uint8)
+    for chunk in chunks:
+        if len(carry):
+            chunk = np.concatenate((carry, chunk))
+        cut = len(chunk) - len(chunk) % 4
+        if cut:
+            yield chunk[:cut]
+            total += cut
+        carry = chunk[cut:]
+
+    end = total + len(carry)
+    end = max(end, pad_to or 0)
+    end += -end % 4
+    if pad_to is not None and total + len(carry) > pad_to:
+        raise ValueError(f"Image of {total + len(carry)} bytes does not fit in {pad_to} bytes")
+    tail = np.concatenate((carry, np.zeros(end - total - len(carry), dtype=np.uint8)))
+    while len(tail):
+        yield tail[:DEFAULT_CHUNK]
+        tail = tail[DEFAULT_CHUNK:]
+
+
+def _hex_words(chunk, upper=True):
+    """(n, 8) ASCII hex digits, one row per little-endian word (MSB first)"""
+    be = np.ascontiguousarray(chunk.reshape(-1, 4)[:, ::-1])
+    text = be.tobytes().hex()
+    if upper:
+        text = text.upper()
+    return np.frombuffer(text.encode(), dtype=np.uint8).reshape(-1, 8)
+
+
+def _ascii(text, rows):
+    return np.tile(np.frombuffer(text.encode(), dtype=np.uint8), (rows, 1))
+
+
+def _last_flagged(chunks):
+    """Yields (chunk, is_last) so writers can terminate the final word"""
+    prev = None
+    for chunk in chunks:
+        if prev is not None:
+            yield prev, False
+        prev = chunk
+    if prev is not None:
+        yield prev, True
+
+
+def _write_bin(f, chunks, base):
+    for chunk in chunks:
+        f.write(chunk.tobytes())
+
+
+def _write_readmemh(f, chunks, base):
+    if base:
+        f.write(f"@{base // 4:X}\n".encode())
+    for chunk in chunks:
+        digits = _hex_words(chunk)
+        f.write(np.hstack((digits, _ascii("\n", len(digits)))).tobytes())
+
+
+def _write_mem(f, chunks, base):
+    f.write(f"@{base // 4:08X}\n".encode())
+    index = 0
+    for chunk, last in _last_flagged(chunks):
+        digits = _hex_words(chunk)
+        seps = np.full((len(digits), 1), ord(" "), dtype=np.uint8)
+        seps[(np.arange(len(digits)) + index + 1) % MEM_WORDS_PER_LINE == 0] = ord("\n")
+        if last:
+            seps[-1] = ord("\n")
+        index += len(digits)
+        f.write(np.hstack((digits, seps)).tobytes())
+
+
+def _write_coe(f, chunks, base):
+    f.write(b"memory_initialization_radix=16;\n")
+    f.write(b"memory_initialization_vector=\n")
+    for chunk, last in _last_flagged(chunks):
+        digits = _hex_words(chunk, upper=False)
+        if last:
+            digits, final = digits[:-1], digits[-1]
+        f.write(np.hstack((digits, _ascii(",\n", len(digits)))).tobytes())
+        if last:
+            # The vector ends with ';' and no newline, like proto/init_mem.py always wrote
+            f.write(final.tobytes() + b";")
+
+
+def _ihex_record(rtype, offset, payload=b""):
+    record = bytes([len(payload), (offset >> 8) & 0xFF, offset & 0xFF, rtype]) + payload
+    return f":{(record + bytes([-sum(record) & 0xFF])).hex().upper()}\n".encode()
+
+
+def _write_ihex_rows(f, data, addr):
+    """Data records for a piece that does not cross a 64KB boundary"""
+    rows = len(data) // IHEX_RECORD_BYTES
+    if rows:
+        body = data[:rows * IHEX_RECORD_BYTES].reshape(rows, IHEX_RECORD_BYTES)
+        offsets = (addr & 0xFFFF) + np.arange(rows, dtype=np.uint32) * IHEX_RECORD_BYTES
+        header = np.empty((rows, 4), dtype=np.uint8)
+        header[:, 0] = IHEX_RECORD_BYTES
+        header[:, 1] = offsets >> 8
+        header[:, 2] = offsets & 0xFF
+        header[:, 3] = 0x00
+        records = np.hstack((header, body))
+        checksum = (-records.sum(axis=1, dtype=np.uint32)) & 0xFF
+        records = np.hstack((records, checksum.astype(np.uint8)[:, None]))
+        digits = np.frombuffer(records.tobytes().hex().upper().encode(), dtype=np.uint8)
+        digits = digits.reshape(rows, -1)
+        f.write(np.hstack((_ascii(":", rows), digits, _ascii("\n", rows))).tobytes())
+    tail = data[rows * IHEX_RECORD_BYTES:]
+    if len(tail):
+        f.write(_ihex_record(0x00, (addr + rows * IHEX_RECORD_BYTES) & 0xFFFF, tail.tobytes()))
+
+
+def _write_ihex(f, chunks, base):
+    addr = base
+    upper = None
+    for chunk in chunks:
+        while len(chunk):
+            if addr >> 16 != upper:
+                upper = addr >> 16
+                f.write(_ihex_record(0x04, 0, upper.to_bytes(2, "big")))
+            n = min(len(chunk), 0x10000 - (addr & 0xFFFF))
+            _write_ihex_rows(f, chunk[:n], addr)
+            chunk = chunk[n:]
+            addr += n
+    f.write(_ihex_record(0x01, 0))
+
+
+WRITERS = {
+    "bin": _write_bin,
+    "hex": _write_readmemh,
+    "coe": _write_coe,
+    "ihex": _write_ihex,
+    "mem": _write_mem,
+}
+
+# Formats that can express a load address; the others get leading zeros
+ADDRESSED = ("hex", "ihex", "mem")
+
+
+def write(path, data, fmt=None, base=0, size=None):
+    """
+    Writes a memory image.
+
+    data is a bytes-like object, a uint8 array or an iterable of uint8 arrays
+    (streamed). size is the memory size in bytes (the image is zero-padded to
+    it); base is the byte address of the first data byte.
+    """
+    fmt = fmt or guess_format(path)
+    if fmt not in WRITERS:
+        raise ValueError(f"Unknown memory format: {fmt}")
+    if base % 4:
+        raise ValueError(f"Base address 0x{base:X} is not word aligned")
+    if isinstance(data, (bytes, bytearray, memoryview, np.ndarray)):
+        data = [np.frombuffer(data, dtype=np.uint8) if not isinstance(data, np.ndarray)
+                else data.view(np.uint8).reshape(-1)]
+
+    if fmt in ADDRESSED:
+        chunks = _word_chunks(data, 0, None if size is None else size - base)
+        start = base
+    else:
+        chunks = _word_chunks(data, base, size)
+        start = 0
+
+    with open(path, "wb") as f:
+        WRITERS[fmt](f, chunks, start)
+
+
+def convert(src, dst, src_fmt=None, dst_fmt=None, base=None, size=None,
+            chunk_size=DEFAULT_CHUNK):
+    """
+    Converts src into dst. Raw binaries are streamed; other inputs are parsed
+    in memory. base defaults to the load address stored in src for formats
+    that can express it; bin and coe outputs start at the lowest address of
+    src, as objcopy -O binary does.
+    """
+    src_fmt = src_fmt or guess_format(src)
+    dst_fmt = dst_fmt or guess_format(dst)
+    if src_fmt == "bin":
+        data, src_base = iter_bin(src, chunk_size), 0
+    else:
+        src_base, data = load(src, src_fmt)
+    if base is None:
+        base = src_base if dst_fmt in ADDRESSED else 0
+    write(dst, data, dst_fmt, base, size)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Converts RS5 memory images between formats")
+    parser.add_argument("input", help="Input memory image")
+    parser.add_argument("output", help="Output memory image")
+    parser.add_argument("--from", dest="src_fmt", choices=INPUT_FORMATS,
+                        help="Input format (default: from the extension)")
+    parser.add_argument("--to", dest="dst_fmt", choices=FORMATS,
+                        help="Output format (default: from the extension)")
+    parser.add_argument("--base", type=lambda v: int(v, 0), default=None,
+                        help="Load address of the first byte (default: from the input)")
+    parser.add_argument("--size", type=lambda v: int(v, 0), default=None,
+                        help="Memory size in bytes, the image is zero-padded to it")
+    args = parser.parse_args()
+
+    try:
+        convert(args.input, args.output, args.src_fmt, args.dst_fmt, args.base, args.size)
+    except ValueError as e:
+        sys.exit(f"error: {e}")
+
+
+if __name__ == "__main__":
+    main()
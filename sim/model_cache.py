@@ -0,0 +1,228 @@
+#!/usr/bin/env python3
+"""
+Build-once cache of verilated RS5 testbench models.
+
+A model is keyed by a hash of the testbench, every SystemVerilog source in its
+include path, the Verilator version and the build parameters. Runs that only
+change the program, the input data or other plusargs reuse the compiled
+executable instead of re-verilating the whole design.
+
+Usage as a script:
+    python3 sim/model_cache.py [--top testbench.sv] [-G NAME=VALUE ...]
+prints the path of the (possibly freshly built) executable.
+"""
+
+import os
+import sys
+import json
+import fcntl
+import shutil
+import hashlib
+import argparse
+import subprocess
+from pathlib import Path
+
+SIM_DIR = Path(__file__).resolve().parent
+RS5_ROOT = SIM_DIR.parent
+
+DEFAULT_CACHE_DIR = SIM_DIR / "model_cache"
+DEFAULT_INCLUDE_DIRS = (
+    RS5_ROOT / "rtl",
+    RS5_ROOT / "rtl" / "aes",
+    RS5_ROOT / "rtl" / "vector",
+)
+DEFAULT_FLAGS = ("--timescale", "1ns/1ns")
+
+HDL_SUFFIXES = (".sv", ".svh", ".v", ".vh")
+
+
+def verilator_version(verilator="verilator"):
+    """Returns the Verilator version string, or 'unknown' if it is not installed"""
+    try:
+        out = subprocess.run([verilator, "--version"], capture_output=True, text=True)
+        return out.stdout.strip() or "unknown"
+    except OSError:
+        return "unknown"
+
+
+def format_param(value):
+    """Formats a Python value as a Verilator -G override"""
+    if isinstance(value, bool):
+        return "1'b1" if value else "1'b0"
+    if isinstance(value, int):
+        return str(value)
+    value = str(value)
+    # Already a SystemVerilog literal (e.g. 32'h80000000)
+    if "'" in value or value.lstrip("-").isdigit():
+        return value
+    return f'"{value}"'
+
+
+def source_files(top, include_dirs):
+    """All HDL files that can take part in the build of top"""
+    dirs = [Path(top).resolve().parent] + [Path(d).resolve() for d in include_dirs]
+    files = set()
+    for d in dirs:
+        if d.is_dir():
+            files.update(f for f in d.iterdir() if f.suffix in HDL_SUFFIXES)
+    files.add(Path(top).resolve())
+    return sorted(files)
+
+
+def _hash_sources(h, top, include_dirs):
+    for f in source_files(top, include_dirs):
+        h.update(os.path.relpath(f, RS5_ROOT).encode())
+        h.update(b"\0")
+        h.update(f.read_bytes())
+
+
+def rtl_hash(top=SIM_DIR / "testbench.sv", include_dirs=DEFAULT_INCLUDE_DIRS):
+    """Hash of the HDL sources only (no parameters or tool versions)"""
+    h = hashlib.sha256()
+    _hash_sources(h, top, include_dirs)
+    return h.hexdigest()[:16]
+
+
+def model_key(top, params=None, defines=None, flags=(), include_dirs=DEFAULT_INCLUDE_DIRS,
+              verilator="verilator", sources=()):
+    """Hash of everything that affects the verilated model"""
+    h = hashlib.sha256()
+    _hash_sources(h, top, include_dirs)
+    for f in sources:
+        h.update(Path(f).name.encode())
+        h.update(b"\0")
+        h.update(Path(f).read_bytes())
+    h.update(json.dumps({
+        "top": Path(top).name,
+        "params": {k: format_param(v) for k, v in sorted((params or {}).items())},
+        "defines": sorted(defines or []),
+        "flags": list(flags),
+        "verilator": verilator_version(verilator),
+    }, sort_keys=True).encode())
+    return h.hexdigest()[:16]
+
+
+class ModelCache:
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIR, verilator="verilator", build_jobs=0,
+                 log=print):
+        self.cache_dir = Path(cache_dir)
+        self.verilator = verilator
+        self.build_jobs = build_jobs
+        self.log = log
+
+    def get(self, top=SIM_DIR / "testbench.sv", params=None, defines=None, flags=DEFAULT_FLAGS,
+            include_dirs=DEFAULT_INCLUDE_DIRS, top_module=None, sources=()):
+        """
+        Returns the path of the executable for this configuration,
+        verilating it first if it is not cached yet.
+
+        sources are C++ files linked into the model (e.g. a main() of its
+        own); without them Verilator generates the main loop (--binary).
+
+        Concurrent callers (e.g. a process pool) asking for the same model
+        wait on a lock file while the first one builds it.
+        """
+        top = Path(top).resolve()
+        top_module = top_module or top.stem
+        sources = [Path(f).resolve() for f in sources]
+        key = model_key(top, params, defines, flags, include_dirs, self.verilator, sources)
+        model_dir = self.cache_dir / f"{top_module}-{key}"
+        exe = model_dir / "obj_dir" / f"V{top_module}"
+
+        if exe.exists():
+            return exe
+
+        model_dir.mkdir(parents=True, exist_ok=True)
+        with open(model_dir / ".lock", "w") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            if not exe.exists():
+                self._build(top, top_module, params, defines, flags, include_dirs, sources,
+                            model_dir)
+        return exe
+
+    def _build(self, top, top_module, params, defines, flags, include_dirs, sources, model_dir):
+        tmp_dir = model_dir / f"obj_dir.tmp-{os.getpid()}"
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+
+        cmd = [self.verilator, "--cc", "--exe", "--build" if sources else "--binary",
+               "-j", str(self.build_jobs),
+               "--top-module", top_module, "--Mdir", str(tmp_dir)]
+        cmd += list(flags)
+        cmd += [f"-I{d}" for d in include_dirs]
+        cmd += [f"-G{k}={format_param(v)}" for k, v in sorted((params or {}).items())]
+        cmd += [f"-D{d}" for d in (defines or [])]
+        cmd.append(str(top))
+        cmd += [str(f) for f in sources]
+
+        self.log(f"Verilating {top.name} -> {model_dir.name}")
+        result = subprocess.run(cmd, cwd=top.parent, capture_output=True, text=True)
+        (model_dir / "build.log").write_text(result.stdout + result.stderr)
+        if result.returncode != 0:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+            raise RuntimeError(f"Verilator failed for {top.name}, see {model_dir / 'build.log'}")
+
+        os.rename(tmp_dir, model_dir / "obj_dir")
+        (model_dir / "manifest.json").write_text(json.dumps({
+            "top": str(top),
+            "params": {k: format_param(v) for k, v in sorted((params or {}).items())},
+            "defines": list(defines or []),
+            "flags": list(flags),
+            "sources": [str(f) for f in sources],
+            "verilator": verilator_version(self.verilator),
+        }, indent=2))
+
+
+def run_model(exe, run_dir, plusargs=None, stdout=None, timeout=None):
+    """
+    Runs a cached model inside run_dir (where results/ and debug/ are created).
+    plusargs is a dict {NAME: value} turned into +NAME=value arguments.
+    """
+    run_dir = Path(run_dir)
+    for d in ("results", "debug"):
+        shutil.rmtree(run_dir / d, ignore_errors=True)
+        (run_dir / d).mkdir(parents=True)
+    cmd = [str(exe)] + [f"+{k}={v}" for k, v in (plusargs or {}).items()]
+    return subprocess.run(cmd, cwd=run_dir, stdout=stdout, stderr=subprocess.STDOUT,
+                          text=True, timeout=timeout)
+
+
+def read_exit_status(path):
+    """
+    Parses the exit status file written by the testbench (+EXIT_FILE).
+
+    Returns a dict with 'status' (DONE, WATCHDOG, TIMEOUT or RUNNING if the
+    run ended some other way), 'exit_code' and 'time_ns', or None if the
+    file does not exist.
+    """
+    try:
+        with open(path) as f:
+            fields = dict(line.split(":", 1) for line in f if ":" in line)
+    except OSError:
+        return None
+    return {
+        "status": fields.get("Status", "").strip(),
+        "exit_code": int(fields.get("Exit Code", "-1")),
+        "time_ns": int(fields.get("Time (ns)", "0")),
+    }
+
+
+def parse_param(text):
+    name, _, value = text.partition("=")
+    return name, value
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Builds (or reuses) a cached verilated RS5 model")
+    parser.add_argument("--top", default=str(SIM_DIR / "testbench.sv"), help="Top-level testbench")
+    parser.add_argument("-G", dest="params", action="append", default=[], type=parse_param,
+                        help="Parameter override NAME=VALUE")
+    parser.add_argument("-D", dest="defines", action="append", default=[], help="Define")
+    parser.add_argument("--cache-dir", default=str(DEFAULT_CACHE_DIR))
+    args = parser.parse_args()
+
+    cache = ModelCache(args.cache_dir, log=lambda m: print(m, file=sys.stderr))
+    print(cache.get(args.top, dict(args.params), args.defines))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""
+Queries over the binary access log of RAM_mem.sv (+RAM_LOG=<path>).
+
+Each access of a RAM port is a 16-byte little-endian record: cycle (32
+bits, wraps around), port (0: A / fetch, 1: B / data, 2: C / frame plugin
+DMA), write enable (0 for reads), byte address and data. The file is memory
+mapped and every query is a vectorized NumPy expression, so multi-gigabyte
+logs need no parsing.
+
+Usage:
+    python3 sim/ramlog.py results/ram.bin
+    python3 sim/ramlog.py results/ram.bin --writes 0x2000:0x10000
+    python3 sim/ramlog.py results/ram.bin --bandwidth 1000 --port B
+"""
+
+import os
+import sys
+import argparse
+
+import numpy as np
+
+RECORD_DTYPE = np.dtype([("cycle", "<u4"), ("port", "u1"), ("we", "u1"), ("reserved", "<u2"),
+                         ("addr", "<u4"), ("data", "<u4")])
+PORTS = {"A": 0, "B": 1, "C": 2}
+
+# Bytes written by each write-enable mask
+_POPCOUNT = np.array([bin(m).count("1") for m in range(16)], dtype=np.uint8)
+
+
+class RamLog:
+    """Memory-mapped RAM access log"""
+
+    def __init__(self, path):
+        self.path = path
+        if os.path.getsize(path) < RECORD_DTYPE.itemsize:
+            self.records = np.zeros(0, dtype=RECORD_DTYPE)
+        else:
+            self.records = np.memmap(path, dtype=RECORD_DTYPE, mode="r")
+        self._cycles = None
+
+    def __len__(self):
+        return len(self.records)
+
+    def cycles(self):
+        """64-bit cycle of every record (the 32-bit counter unwrapped)"""
+        if self._cycles is None:
+            cycle = self.records["cycle"].astype(np.uint64)
+            wraps = np.cumsum(np.diff(self.records["cycle"].astype(np.int64), prepend=0) < 0)
+            self._cycles = cycle + (wraps.astype(np.uint64) << np.uint64(32))
+        return self._cycles
+
+    def mask(self, port=None, writes=None, lo=None, hi=None):
+        """
+        Boolean mask of the records matching every given filter: port ("A"
+        or "B"), writes (True: writes, False: reads) and address range [lo, hi).
+        """
+        r = self.records
+        m = np.ones(len(r), dtype=bool)
+        if port is not None:
+            m &= r["port"] == PORTS[port]
+        if writes is not None:
+            m &= (r["we"] != 0) if writes else (r["we"] == 0)
+        if lo is not None:
+            m &= r["addr"] >= lo
+        if hi is not None:
+            m &= r["addr"] < hi
+        return m
+
+    def select(self, **filters):
+        """Records matching mask(**filters), with their unwrapped cycles"""
+        m = self.mask(**filters)
+        return self.records[m], self.cycles()[m]
+
+    def reads(self, port=None, lo=None, hi=None):
+        return self.select(port=port, writes=False, lo=lo, hi=hi)
+
+    def writes(self, port=None, lo=None, hi=None):
+        return self.select(port=port, writes=True, lo=lo, hi=hi)
+
+    def bytes_moved(self, records):
+        """Bytes of each record: 4 per read, the enabled lanes per write"""
+        return np.where(records["we"] == 0, 4, _POPCOUNT[records["we"] & 0xf])
+
+    def bandwidth(self, window=1000, port=None, writes=False, lo=None, hi=None):
+        """
+        Bytes read (or written) per window of cycles: returns the start cycle
+        of each window and the bytes moved in it. The windows cover the whole
+        log, so different queries with the same window line up.
+        """
+        if not len(self.records):
+            return np.zeros(0, dtype=np.uint64), np.zeros(0, dtype=np.int64)
+        first = int(self.cycles()[0]) // window
+        count = int(self.cycles()[-1]) // window - first + 1
+        records, cycles = self.select(port=port, writes=writes, lo=lo, hi=hi)
+        bins = (cycles // np.uint64(window)).astype(np.int64) - first
+        total = np.bincount(bins, weights=self.bytes_moved(records), minlength=count).astype(np.int64)
+        starts = (np.arange(count, dtype=np.uint64) + np.uint64(first)) * np.uint64(window)
+        return starts, total
+
+    def last_writes(self, lo, hi):
+        """{word address: last value written} in [lo, hi), e.g. the final result buffer"""
+        records, _ = self.writes(lo=lo, hi=hi)
+        addrs = records["addr"] & ~np.uint32(3)
+        # np.unique on the reversed array keeps the index of the last write
+        unique, index = np.unique(addrs[::-1], return_index=True)
+        return dict(zip(unique.tolist(), records["data"][::-1][index].tolist()))
+
+    def summary(self):
+        """Accesses per port and direction, and the cycle span of the log"""
+        r = self.records
+        counts = {f"{name} {kind}": int(np.count_nonzero((r["port"] == p) & ((r["we"] != 0) == w)))
+                  for name, p in PORTS.items() for kind, w in (("reads", False), ("writes", True))}
+        span = int(self.cycles()[-1] - self.cycles()[0]) + 1 if len(r) else 0
+        return counts, span
+
+
+def parse_range(spec):
+    lo, _, hi = spec.partition(":")
+    return int(lo or "0", 0), int(hi, 0) if hi else 1 << 32
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Queries the RAM access log of the testbench")
+    parser.add_argument("log", help="Log written with +RAM_LOG")
+    parser.add_argument("--port", choices=PORTS, help="Only accesses of this port")
+    parser.add_argument("--writes", metavar="LO:HI", help="List the writes to [LO, HI)")
+    parser.add_argument("--reads", metavar="LO:HI", help="List the reads of [LO, HI)")
+    parser.add_argument("--limit", type=int, default=100, help="Accesses listed (0: all)")
+    parser.add_argument("--bandwidth", type=int, metavar="CYCLES",
+                        help="Read and write bandwidth per window of CYCLES")
+    args = parser.parse_args()
+
+    try:
+        log = RamLog(args.log)
+    except (OSError, ValueError) as e:
+        sys.exit(f"error: {e}")
+
+    counts, span = log.summary()
+    print(f"{len(log)} accesses over {span} cycles: "
+          + ", ".join(f"{n} {k}" for k, n in counts.items()))
+
+    for spec, writes in ((args.reads, False), (args.writes, True)):
+        if not spec:
+            continue
+        lo, hi = parse_range(spec)
+        records, cycles = log.select(port=args.port, writes=writes, lo=lo, hi=hi)
+        print(f"\n{len(records)} {'writes' if writes else 'reads'} in {spec}")
+        for r, c in zip(records[:args.limit or None], cycles[:args.limit or None]):
+            lanes = f" we=0x{r['we']:x}" if writes else ""
+            print(f"{c:>12} {'ABC'[r['port']]} addr=0x{r['addr']:08x} data=0x{r['data']:08x}{lanes}")
+
+    if args.bandwidth:
+        starts, read = log.bandwidth(args.bandwidth, port=args.port)
+        _, written = log.bandwidth(args.bandwidth, port=args.port, writes=True)
+        print(f"\n{'Cycle':>12} {'Read B':>10} {'Write B':>10} {'Read B/c':>9} {'Write B/c':>9}")
+        for start, r, w in zip(starts, read, written):
+            print(f"{start:>12} {r:>10} {w:>10} {r / args.bandwidth:>9.3f} {w / args.bandwidth:>9.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+"""
+Shared runner of the per-test regressions (riscv_tests_regression.py and
+vector_regression.py).
+
+Every test is built with make in its own work directory and simulated
+concurrently on one cached Verilator model of testbench.sv. A suite only
+supplies its tests and three functions: fields(test) gives the result name
+("test") and any extra result fields, setup(work_dir, test) prepares the
+work directory, and passed(test, output) checks the UART output
+(Output.txt). A test passes when that check holds and the program ends
+through tohost.
+"""
+
+import time
+import shutil
+import subprocess
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from model_cache import SIM_DIR, ModelCache, run_model, read_exit_status
+from report import parse_report
+
+
+def new_result(fields, work_dir, reason=""):
+    return {**fields, "status": "FAILED", "cycles": None, "instret": None, "build_s": 0.0,
+            "sim_s": 0.0, "work_dir": str(work_dir), "reason": reason, "output": ""}
+
+
+def run_test(exe, test, fields, work_dir, setup, passed, timeout=None):
+    """Builds and simulates one test; returns a result dict"""
+    result = new_result(fields, work_dir)
+
+    setup(work_dir, test)
+    start = time.perf_counter()
+    build = subprocess.run(["make", "all"], cwd=work_dir, capture_output=True, text=True)
+    result["build_s"] = time.perf_counter() - start
+    (work_dir / "build.log").write_text(build.stdout + build.stderr)
+    if build.returncode != 0:
+        result["reason"] = "build failed"
+        return result
+
+    plusargs = {
+        "BIN_FILE": work_dir / "test.bin",
+        "EXIT_FILE": work_dir / "results" / "exit_status.txt",
+        "RESULT_WORDS": 0,
+    }
+    start = time.perf_counter()
+    try:
+        with open(work_dir / "simulation.log", "w") as log:
+            run_model(exe, work_dir, plusargs, stdout=log, timeout=timeout)
+    except subprocess.TimeoutExpired:
+        result["reason"] = f"killed after {timeout}s"
+    result["sim_s"] = time.perf_counter() - start
+
+    counters = parse_report(work_dir / "results" / "Report.txt") or {}
+    result["counters"] = counters
+    result["cycles"] = counters.get("clock_cycles")
+    result["instret"] = counters.get("instructions_retired")
+
+    output_file = work_dir / "results" / "Output.txt"
+    result["output"] = output_file.read_text(errors="replace") if output_file.exists() else ""
+    status = read_exit_status(work_dir / "results" / "exit_status.txt")
+    if passed(test, result["output"]) and status and status["status"] == "DONE":
+        result["status"] = "PASSED"
+    elif not result["reason"]:
+        result["reason"] = status["status"] if status and status["status"] != "DONE" else "check failed"
+    return result
+
+
+def run_regression(tests, jobs, setup, passed, work_root, keep_work=False, timeout=None,
+                   params=None, fields=lambda test: {"test": str(test)}):
+    """
+    Builds and simulates every test in parallel; returns (results in the
+    order of tests, wall time in seconds)
+    """
+    exe = ModelCache(log=lambda m: print(m, flush=True)).get(SIM_DIR / "testbench.sv", params)
+
+    results = {}
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=jobs) as pool:
+        futures = {}
+        for i, test in enumerate(tests):
+            f = fields(test)
+            work_dir = Path(work_root) / f["test"]
+            futures[pool.submit(run_test, exe, test, f, work_dir, setup, passed, timeout)] = (i, f, work_dir)
+        for future in as_completed(futures):
+            i, f, work_dir = futures[future]
+            try:
+                r = future.result()
+            except Exception as e:
+                r = new_result(f, work_dir, str(e))
+            print(f"{r['status']:<7} {r['test']}", flush=True)
+            if r["status"] == "PASSED" and not keep_work:
+                shutil.rmtree(r["work_dir"], ignore_errors=True)
+            results[i] = r
+    wall_time = time.perf_counter() - start
+    return [results[i] for i in range(len(tests))], wall_time
+
+
+def print_summary(results, wall_time, jobs, slower=()):
+    """Per-test table (with the Delta column if a baseline was compared) and totals"""
+    with_delta = any("delta_pct" in r for r in results)
+    width = max([12] + [len(r["test"]) for r in results])
+    header = (f"{'Test':<{width}} {'Status':<8} {'Cycles':>10} {'Instret':>10} {'CPI':>6} "
+              + (f"{'Delta':>8} " if with_delta else "") + f"{'Build (s)':>10} {'Sim (s)':>8}  Reason")
+    print()
+    print(header)
+    print("-" * len(header))
+    for r in results:
+        cycles = r["cycles"] if r["cycles"] is not None else "-"
+        instret = r["instret"] if r["instret"] is not None else "-"
+        cpi = f"{r['cycles'] / r['instret']:.2f}" if r["cycles"] and r["instret"] else "-"
+        line = f"{r['test']:<{width}} {r['status']:<8} {cycles:>10} {instret:>10} {cpi:>6} "
+        if with_delta:
+            delta = f"{r['delta_pct']:+.1f}%" if r.get("delta_pct") is not None else "-"
+            line += f"{delta:>8} "
+        print(line + f"{r['build_s']:>10.2f} {r['sim_s']:>8.2f}  {r['reason']}")
+    print("-" * len(header))
+    passed = sum(r["status"] == "PASSED" for r in results)
+    serial = sum(r["build_s"] + r["sim_s"] for r in results)
+    print(f"{passed}/{len(results)} passed, {len(results) - passed} failed")
+    print(f"Wall time {wall_time:.1f}s with {jobs} jobs (serial sum {serial:.1f}s)")
+    for r in results:
+        if r["status"] != "PASSED":
+            print(f"FAILED {r['test']}: see {r['work_dir']}")
+    for r in slower:
+        print(f"SLOWER {r['test']}: {r['cycles']} cycles ({r['delta_pct']:+.1f}%)")
@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+Parser for the profiling report written by CSRBank (PROFILING=1).
+
+Report.txt holds "Name:   value" lines grouped in sections (CYCLES WITH,
+INSTRUCTION COUNTERS, VECTOR EXTENSION). Counters are returned with
+normalized snake_case names, e.g. "Clock Cycles" -> clock_cycles and
+"BUBBLES (INC. HAZARDS)" -> bubbles_inc_hazards.
+
+parse_report() returns the flat counters; Report wraps them with the
+derived metrics (IPC, stall/hazard/bubble ratios, instruction mix) used by
+results_db.py to compare runs.
+
+Usage as a script:
+    python3 sim/report.py results/Report.txt
+"""
+
+import re
+import sys
+
+# Instruction classes counted by CSRBank, in report order
+SCALAR_CLASSES = ("lui_slt", "logic", "addsub", "shift", "branch", "jump", "load", "store",
+                  "sys", "csr", "mul", "div")
+VECTOR_CLASSES = ("vaddsub", "vmul", "vdiv", "vmac", "vred", "vload_vstore", "vothers")
+INSTRUCTION_CLASSES = SCALAR_CLASSES + VECTOR_CLASSES
+
+
+def counter_name(label):
+    return re.sub(r"[^a-z0-9]+", "_", label.lower()).strip("_")
+
+
+def parse_report(path):
+    """
+    Returns {counter: int} for every counter in the report, or None if the
+    file does not exist (e.g. the simulation did not reach its final block).
+    """
+    try:
+        with open(path) as f:
+            lines = f.readlines()
+    except OSError:
+        return None
+    counters = {}
+    for line in lines:
+        label, sep, value = line.partition(":")
+        value = value.strip()
+        if sep and value.lstrip("-").isdigit():
+            counters[counter_name(label)] = int(value)
+    return counters
+
+
+def _ratio(num, den):
+    return num / den if den else None
+
+
+class Report:
+    """Counters of one run plus the metrics derived from them"""
+
+    def __init__(self, counters, path=None):
+        self.counters = dict(counters)
+        self.path = path
+
+    @classmethod
+    def from_file(cls, path):
+        """Report of a Report.txt, or None if it cannot be read"""
+        counters = parse_report(path)
+        return cls(counters, path) if counters is not None else None
+
+    def get(self, name, default=0):
+        return self.counters.get(name, default)
+
+    @property
+    def cycles(self):
+        return self.get("clock_cycles")
+
+    @property
+    def instret(self):
+        return self.get("instructions_retired")
+
+    @property
+    def ipc(self):
+        return _ratio(self.instret, self.cycles)
+
+    @property
+    def cpi(self):
+        return _ratio(self.cycles, self.instret)
+
+    @property
+    def stall_ratio(self):
+        return _ratio(self.get("stall"), self.cycles)
+
+    @property
+    def hazard_ratio(self):
+        return _ratio(self.get("hazards"), self.cycles)
+
+    @property
+    def bubble_ratio(self):
+        return _ratio(self.get("bubbles_inc_hazards"), self.cycles)
+
+    @property
+    def compressed_ratio(self):
+        # Only reported when the core has the C extension
+        if "instructions_compressed" not in self.counters:
+            return None
+        return _ratio(self.counters["instructions_compressed"], self.instret)
+
+    def instruction_mix(self):
+        """{class: fraction of the classified instructions} for the classes present"""
+        present = {c: self.counters[c] for c in INSTRUCTION_CLASSES if c in self.counters}
+        total = sum(present.values())
+        return {c: n / total for c, n in present.items()} if total else {}
+
+    def metrics(self):
+        """Derived metrics, None where the denominator is zero"""
+        return {
+            "ipc": self.ipc,
+            "cpi": self.cpi,
+            "stall_ratio": self.stall_ratio,
+            "hazard_ratio": self.hazard_ratio,
+            "bubble_ratio": self.bubble_ratio,
+            "compressed_ratio": self.compressed_ratio,
+        }
+
+
+def main():
+    if len(sys.argv) != 2:
+        sys.exit("usage: report.py <Report.txt>")
+    report = Report.from_file(sys.argv[1])
+    if report is None:
+        sys.exit(f"error: cannot read {sys.argv[1]}")
+    for name, value in report.counters.items():
+        print(f"{name:<24} {value}")
+    print()
+    for name, value in report.metrics().items():
+        print(f"{name:<24} {'-' if value is None else f'{value:.4f}'}")
+
+
+if __name__ == "__main__":
+    main()
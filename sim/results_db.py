@@ -0,0 +1,244 @@
+#!/usr/bin/env python3
+"""
+SQLite database of CSRBank profiling results.
+
+Every run is stored with the application it ran, the hash of the RTL sources
+(model_cache.rtl_hash) and the testbench parameters; storing the same
+(app, rtl_hash, params) again replaces the previous counters, since the
+simulation is deterministic. Runs can then be compared two by two, either by
+run id or by configuration (same app, different RTL or parameters), on the
+derived metrics (IPC, stall ratio, ...), the raw counters and the
+instruction mix.
+
+Usage:
+    python3 sim/results_db.py add results/Report.txt --app coremark -G VEnable=1
+    python3 sim/results_db.py list [--app coremark]
+    python3 sim/results_db.py compare 3 7
+    python3 sim/results_db.py compare --app coremark -a VEnable=0 -b VEnable=1
+"""
+
+import sys
+import json
+import time
+import sqlite3
+import argparse
+from pathlib import Path
+
+from model_cache import SIM_DIR, rtl_hash, parse_param
+from report import Report, INSTRUCTION_CLASSES
+
+DEFAULT_DB = SIM_DIR / "results.db"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id          INTEGER PRIMARY KEY,
+    app         TEXT NOT NULL,
+    rtl_hash    TEXT NOT NULL,
+    params      TEXT NOT NULL,
+    date        TEXT NOT NULL,
+    report_path TEXT,
+    UNIQUE (app, rtl_hash, params)
+);
+CREATE TABLE IF NOT EXISTS counters (
+    run_id INTEGER NOT NULL REFERENCES runs(id) ON DELETE CASCADE,
+    name   TEXT NOT NULL,
+    value  INTEGER NOT NULL,
+    PRIMARY KEY (run_id, name)
+);
+"""
+
+
+def params_key(params):
+    """Canonical text of a parameter set (sorted JSON, values as strings)"""
+    return json.dumps({k: str(v) for k, v in (params or {}).items()}, sort_keys=True)
+
+
+class ResultsDB:
+    def __init__(self, path=DEFAULT_DB):
+        self.path = Path(path)
+        self.conn = sqlite3.connect(self.path)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA foreign_keys = ON")
+        self.conn.executescript(SCHEMA)
+
+    def close(self):
+        self.conn.close()
+
+    def add(self, app, report, params=None, rtl=None):
+        """Stores a Report; returns its run id"""
+        rtl = rtl or rtl_hash()
+        with self.conn:
+            self.conn.execute("DELETE FROM runs WHERE app = ? AND rtl_hash = ? AND params = ?",
+                              (app, rtl, params_key(params)))
+            cur = self.conn.execute(
+                "INSERT INTO runs (app, rtl_hash, params, date, report_path) VALUES (?, ?, ?, ?, ?)",
+                (app, rtl, params_key(params), time.strftime("%Y-%m-%d %H:%M:%S"),
+                 str(report.path) if report.path else None))
+            run_id = cur.lastrowid
+            self.conn.executemany("INSERT INTO counters (run_id, name, value) VALUES (?, ?, ?)",
+                                  [(run_id, k, v) for k, v in report.counters.items()])
+        return run_id
+
+    def runs(self, app=None, rtl=None, params=None):
+        """Run rows matching the filters, newest first"""
+        query, args = "SELECT * FROM runs WHERE 1", []
+        if app is not None:
+            query, args = query + " AND app = ?", args + [app]
+        if rtl is not None:
+            query, args = query + " AND rtl_hash LIKE ?", args + [rtl + "%"]
+        if params is not None:
+            query, args = query + " AND params = ?", args + [params_key(params)]
+        return self.conn.execute(query + " ORDER BY date DESC, id DESC", args).fetchall()
+
+    def find(self, app, rtl=None, params=None):
+        """
+        Id of the newest run of a configuration. rtl or params (or both)
+        must be given, otherwise any run of app would match.
+        """
+        if rtl is None and params is None:
+            raise ValueError(f"a configuration of {app} needs an RTL hash or parameters")
+        rows = self.runs(app, rtl, params)
+        if not rows:
+            raise KeyError(f"no run of {app} with rtl={rtl or '*'} params={params_key(params)}")
+        return rows[0]["id"]
+
+    def report(self, run_id):
+        # rowid follows the insertion order, i.e. the order of Report.txt
+        rows = self.conn.execute("SELECT name, value FROM counters WHERE run_id = ? ORDER BY rowid",
+                                 (run_id,)).fetchall()
+        if not rows:
+            raise KeyError(f"no run with id {run_id}")
+        path = self.conn.execute("SELECT report_path FROM runs WHERE id = ?", (run_id,)).fetchone()[0]
+        return Report({r["name"]: r["value"] for r in rows}, path)
+
+    def compare(self, run_a, run_b):
+        """
+        Rows (section, name, a, b, delta) between two runs: derived metrics,
+        counters and instruction mix. delta is b - a (relative for counters).
+        """
+        a, b = self.report(run_a), self.report(run_b)
+        rows = []
+        ma, mb = a.metrics(), b.metrics()
+        for name in ma:
+            delta = mb[name] - ma[name] if ma[name] is not None and mb[name] is not None else None
+            rows.append(("metric", name, ma[name], mb[name], delta))
+        # Report.txt order, counters only present in b at the end
+        for name in list(a.counters) + [n for n in b.counters if n not in a.counters]:
+            va, vb = a.counters.get(name), b.counters.get(name)
+            delta = (vb - va) / va if va and vb is not None else None
+            rows.append(("counter", name, va, vb, delta))
+        mix_a, mix_b = a.instruction_mix(), b.instruction_mix()
+        for name in INSTRUCTION_CLASSES:
+            if name in mix_a or name in mix_b:
+                va, vb = mix_a.get(name, 0.0), mix_b.get(name, 0.0)
+                rows.append(("mix", name, va, vb, vb - va))
+        return rows
+
+
+def store_results(path, suite, results, params=None):
+    """
+    Stores the counters of the passing tests of a regression runner
+    (riscv_tests_regression.py, vector_regression.py) as app "<suite>/<test>"
+    """
+    db = ResultsDB(path)
+    rtl = rtl_hash()
+    try:
+        for r in results:
+            if r["status"] == "PASSED" and r.get("counters"):
+                db.add(f"{suite}/{r['test']}", Report(r["counters"]), params, rtl)
+    finally:
+        db.close()
+
+
+def _fmt(section, value):
+    if value is None:
+        return "-"
+    if section == "counter":
+        return str(value)
+    return f"{value:.4f}"
+
+
+def _fmt_delta(section, delta):
+    if delta is None:
+        return "-"
+    if section == "counter":
+        return f"{100 * delta:+.1f}%"
+    if section == "mix":
+        return f"{100 * delta:+.2f}pp"
+    return f"{delta:+.4f}"
+
+
+def print_runs(rows):
+    print(f"{'Id':>4}  {'App':<24} {'RTL':<16} {'Date':<19}  Params")
+    for r in rows:
+        print(f"{r['id']:>4}  {r['app']:<24} {r['rtl_hash']:<16} {r['date']:<19}  {r['params']}")
+
+
+def print_compare(db, run_a, run_b):
+    rows = db.compare(run_a, run_b)
+    for label, run_id in (("A", run_a), ("B", run_b)):
+        r = db.conn.execute("SELECT * FROM runs WHERE id = ?", (run_id,)).fetchone()
+        print(f"{label}: #{run_id} {r['app']} rtl={r['rtl_hash']} params={r['params']}")
+    section = None
+    for sec, name, a, b, delta in rows:
+        if sec != section:
+            section = sec
+            print(f"\n{sec.upper():<24} {'A':>12} {'B':>12} {'Delta':>10}")
+        print(f"{name:<24} {_fmt(sec, a):>12} {_fmt(sec, b):>12} {_fmt_delta(sec, delta):>10}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Stores and compares CSRBank profiling reports")
+    parser.add_argument("--db", default=str(DEFAULT_DB), help="SQLite database file")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    add = sub.add_parser("add", help="Store a Report.txt")
+    add.add_argument("report", help="Path of the Report.txt")
+    add.add_argument("--app", required=True, help="Application the report belongs to")
+    add.add_argument("-G", dest="params", action="append", default=[], type=parse_param,
+                     help="Testbench parameter NAME=VALUE of the run")
+    add.add_argument("--rtl-hash", default=None,
+                     help="RTL hash of the run (default: hash of the current sources)")
+
+    ls = sub.add_parser("list", help="List stored runs")
+    ls.add_argument("--app", default=None)
+
+    cmp = sub.add_parser("compare", help="Compare two runs or two configurations")
+    cmp.add_argument("runs", nargs="*", type=int, help="Two run ids")
+    cmp.add_argument("--app", default=None, help="Application of both configurations")
+    cmp.add_argument("-a", dest="params_a", action="append", default=[], type=parse_param,
+                     help="Parameter NAME=VALUE of configuration A")
+    cmp.add_argument("-b", dest="params_b", action="append", default=[], type=parse_param,
+                     help="Parameter NAME=VALUE of configuration B")
+    cmp.add_argument("--rtl-a", default=None, help="RTL hash (prefix) of configuration A")
+    cmp.add_argument("--rtl-b", default=None, help="RTL hash (prefix) of configuration B")
+    args = parser.parse_args()
+
+    db = ResultsDB(args.db)
+    try:
+        if args.command == "add":
+            report = Report.from_file(args.report)
+            if report is None:
+                sys.exit(f"error: cannot read {args.report}")
+            run_id = db.add(args.app, report, dict(args.params), args.rtl_hash)
+            print(f"Stored run #{run_id}")
+        elif args.command == "list":
+            print_runs(db.runs(args.app))
+        elif args.runs:
+            if len(args.runs) != 2:
+                parser.error("compare needs two run ids")
+            print_compare(db, *args.runs)
+        else:
+            if not args.app:
+                parser.error("compare needs two run ids or --app")
+            run_a = db.find(args.app, args.rtl_a, dict(args.params_a) if args.params_a else None)
+            run_b = db.find(args.app, args.rtl_b, dict(args.params_b) if args.params_b else None)
+            print_compare(db, run_a, run_b)
+    except (KeyError, ValueError) as e:
+        sys.exit(f"error: {e.args[0]}")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+Parallel regression of the ISA tests in app/riscv-tests.
+
+app/riscv-tests/test.S chains every test into a single program. Here each
+TEST(name) enabled in test.S gets its own program instead: a work directory
+with a copy of test.S calling only that test and tests/ holding only its
+source, so the CSRBank report (Report.txt) measures that test alone. All
+programs are built and simulated concurrently on one cached Verilator model
+of testbench.sv. A test passes when it prints "<name>..OK" and the program
+ends through tohost.
+
+Pass/fail, clock cycles and retired instructions of every test are saved in
+app/riscv-tests/results/results.json. Passing a previous results file as
+--baseline reports the cycle delta per test and fails on tests that became
+slower than --tolerance.
+
+Usage:
+    python3 sim/riscv_tests_regression.py                    # all tests, all CPUs
+    python3 sim/riscv_tests_regression.py -j 8 add mul lrsc  # selected tests
+    python3 sim/riscv_tests_regression.py --baseline old.json --tolerance 2
+"""
+
+import os
+import re
+import sys
+import json
+import time
+import shutil
+import argparse
+from pathlib import Path
+
+from model_cache import SIM_DIR, RS5_ROOT
+from regression import run_regression, print_summary
+from results_db import store_results
+
+TESTS_DIR = RS5_ROOT / "app" / "riscv-tests"
+SHARED_FILES = ("Makefile", "rs5.ld")
+HEADERS = ("riscv_test.h", "test_macros.h", "encoding.h")
+DEFAULT_WORK_ROOT = SIM_DIR / "riscv_tests_work"
+DEFAULT_RESULTS = TESTS_DIR / "results" / "results.json"
+
+TEST_LINE = re.compile(r"^\s*TEST\((\w+)\)\s*$")
+
+
+def find_tests(names=None):
+    """Tests enabled in test.S, in the order test.S runs them"""
+    tests = []
+    for line in (TESTS_DIR / "test.S").read_text().splitlines():
+        match = TEST_LINE.match(line)
+        if match:
+            tests.append(match.group(1))
+    if names:
+        missing = set(names) - set(tests)
+        if missing:
+            raise ValueError(f"Unknown tests: {', '.join(sorted(missing))}")
+        tests = [t for t in tests if t in names]
+    return tests
+
+
+def single_test_program(test):
+    """test.S with every TEST() line but this one commented out"""
+    lines = []
+    for line in (TESTS_DIR / "test.S").read_text().splitlines():
+        match = TEST_LINE.match(line)
+        if match and match.group(1) != test:
+            line = "#" + line
+        lines.append(line)
+    return "\n".join(lines) + "\n"
+
+
+def setup_work_dir(work_dir, test):
+    """Private copy of the riscv-tests tree with only this test in tests/"""
+    shutil.rmtree(work_dir, ignore_errors=True)
+    (work_dir / "tests").mkdir(parents=True)
+    for name in SHARED_FILES:
+        os.symlink(TESTS_DIR / name, work_dir / name)
+    for name in HEADERS + (f"{test}.S",):
+        os.symlink(TESTS_DIR / "tests" / name, work_dir / "tests" / name)
+    (work_dir / "test.S").write_text(single_test_program(test))
+
+
+def passed(test, output):
+    return f"{test}..OK" in output
+
+
+def load_results(path):
+    """{test: result} of a previous results.json"""
+    with open(path) as f:
+        return {r["test"]: r for r in json.load(f)["tests"]}
+
+
+def compare_baseline(results, baseline, tolerance):
+    """
+    Adds the cycle delta against the baseline to each result and marks the
+    tests more than tolerance percent slower; returns the slower ones.
+    """
+    slower = []
+    for r in results:
+        old = baseline.get(r["test"], {}).get("cycles")
+        r["delta_pct"] = None
+        if old and r["cycles"] is not None:
+            r["delta_pct"] = 100.0 * (r["cycles"] - old) / old
+            if r["delta_pct"] > tolerance:
+                slower.append(r)
+    return slower
+
+
+def save_results(path, results):
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tests = [{k: r[k] for k in ("test", "status", "cycles", "instret", "reason")} for r in results]
+    with open(path, "w") as f:
+        json.dump({"date": time.strftime("%Y-%m-%d %H:%M:%S"),
+                   "tests": tests}, f, indent=2)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Runs the riscv-tests regression on Verilator")
+    parser.add_argument("tests", nargs="*", help="Test names (default: every test enabled in test.S)")
+    parser.add_argument("-j", "--jobs", type=int, default=os.cpu_count(),
+                        help="Tests built and simulated in parallel (default: number of CPUs)")
+    parser.add_argument("--work-root", default=str(DEFAULT_WORK_ROOT),
+                        help="Per-test build/run directories")
+    parser.add_argument("--keep-work", action="store_true",
+                        help="Keep the work directory of passing tests")
+    parser.add_argument("--timeout", type=float, default=None,
+                        help="Wall-clock limit per simulation in seconds")
+    parser.add_argument("--db", default=None,
+                        help="Also store the counters of the passing tests in this results database")
+    parser.add_argument("--results", default=str(DEFAULT_RESULTS),
+                        help="Where to save pass/fail, cycles and instret of each test")
+    parser.add_argument("--baseline", default=None,
+                        help="Previous results file to compare the cycle counts against")
+    parser.add_argument("--tolerance", type=float, default=0.0,
+                        help="Cycle increase over the baseline allowed per test, in percent")
+    args = parser.parse_args()
+
+    try:
+        tests = find_tests(args.tests)
+        baseline = load_results(args.baseline) if args.baseline else None
+    except (OSError, ValueError, KeyError) as e:
+        sys.exit(f"error: {e}")
+
+    results, wall_time = run_regression(tests, args.jobs, setup_work_dir, passed, args.work_root,
+                                        args.keep_work, args.timeout)
+    slower = compare_baseline(results, baseline, args.tolerance) if baseline is not None else []
+    print_summary(results, wall_time, args.jobs, slower)
+    save_results(args.results, results)
+    print(f"Results saved in {args.results}")
+    if args.db:
+        store_results(args.db, "riscv-tests", results)
+    sys.exit(0 if all(r["status"] == "PASSED" for r in results) and not slower else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,257 @@
+#!/usr/bin/env python3
+"""
+Parallel sweep of testbench parameters x applications.
+
+Every combination of the parameter grid is a model variant of testbench.sv,
+verilated once through the model cache (variants already in the cache are
+reused). All (variant, app) pairs then run concurrently, each in its own run
+directory, and the CSRBank report of every run is collected into one table:
+cycles, instret, IPC and the stall/hazard/bubble counters.
+
+Apps are prebuilt binaries given as NAME=path (or just the path, named after
+the file). Enum parameters accept the names of RS5_pkg (MULEXT=MUL_OFF).
+
+Usage:
+    python3 sim/sweep.py -p BRANCHPRED=0,1 -p FORWARDING=0,1 \\
+        --app ../app/coremark/coremark.bin --app hello=../app/samplecode/hello.bin
+    python3 sim/sweep.py -p MULEXT=MUL_OFF,MUL_M -p MEM_WIDTH=65536,131072 \\
+        --app prog.bin -j 16 --csv sweep.csv --db results.db
+"""
+
+import os
+import re
+import sys
+import csv
+import time
+import shutil
+import argparse
+import itertools
+import subprocess
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from model_cache import (SIM_DIR, RS5_ROOT, ModelCache, model_key, rtl_hash, run_model,
+                         read_exit_status)
+from report import Report
+from results_db import ResultsDB
+
+DEFAULT_WORK_ROOT = SIM_DIR / "sweep_work"
+DEFAULT_CSV = SIM_DIR / "sweep_results.csv"
+PKG_FILE = RS5_ROOT / "rtl" / "RS5_pkg.sv"
+
+COLUMNS = ("app", "status", "cycles", "instret", "ipc", "stall", "hazards", "bubbles",
+           "stall_ratio", "sim_s")
+
+
+def package_enums(path=PKG_FILE):
+    """{member: value} of the integer enums of RS5_pkg (mul_e, atomic_e, ...)"""
+    enums = {}
+    text = re.sub(r"//.*", "", Path(path).read_text())
+    for body in re.findall(r"typedef\s+enum\s+(?:integer|int)\s*\{([^}]*)\}", text):
+        value = 0
+        for member in body.split(","):
+            name, _, explicit = member.partition("=")
+            name = name.strip()
+            if not name:
+                continue
+            if explicit.strip():
+                if not explicit.strip().isdigit():
+                    break
+                value = int(explicit)
+            enums[name] = value
+            value += 1
+    return enums
+
+
+def parse_grid(specs, enums):
+    """["NAME=v1,v2", ...] -> {NAME: [v1, v2]}, enum names replaced by their values"""
+    grid = {}
+    for spec in specs:
+        name, sep, values = spec.partition("=")
+        if not sep or not values:
+            raise ValueError(f"bad parameter '{spec}', expected NAME=v1,v2,...")
+        grid[name] = [enums.get(v, v) for v in values.split(",")]
+    return grid
+
+
+def parse_app(spec):
+    name, sep, path = spec.partition("=")
+    if not sep:
+        name, path = Path(spec).stem, spec
+    path = Path(path).resolve()
+    if not path.is_file():
+        raise ValueError(f"app binary not found: {path}")
+    return name, path
+
+
+def variants(grid):
+    """Every combination of the grid as a params dict"""
+    names = list(grid)
+    return [dict(zip(names, values)) for values in itertools.product(*grid.values())]
+
+
+def variant_label(params):
+    return ",".join(f"{k}={v}" for k, v in params.items()) or "default"
+
+
+def build_variants(configs, top, jobs):
+    """
+    Verilates the variants that are not cached yet, a few at a time with the
+    cores split among them; returns {label: executable or exception}.
+    """
+    builders = max(1, min(len(configs), jobs // 4 or 1))
+    cache = ModelCache(build_jobs=max(1, jobs // builders), log=lambda m: print(m, flush=True))
+    exes = {}
+    with ThreadPoolExecutor(max_workers=builders) as pool:
+        futures = {pool.submit(cache.get, top, params): variant_label(params) for params in configs}
+        for future in as_completed(futures):
+            try:
+                exes[futures[future]] = future.result()
+            except Exception as e:
+                print(f"Build of [{futures[future]}] failed: {e}", flush=True)
+                exes[futures[future]] = e
+    return exes
+
+
+def run_one(exe, params, app, binary, run_dir, plusargs, timeout=None):
+    """Runs one app on one variant; returns a result row"""
+    row = dict(params)
+    row.update({"app": app, "status": "FAILED", "run_dir": str(run_dir)})
+    if isinstance(exe, Exception):
+        row["status"] = "BUILD FAILED"
+        return row
+
+    args = {"BIN_FILE": binary, "EXIT_FILE": run_dir / "results" / "exit_status.txt",
+            "RESULT_WORDS": 0}
+    args.update(plusargs)
+    run_dir.mkdir(parents=True, exist_ok=True)
+    start = time.perf_counter()
+    try:
+        with open(run_dir / "simulation.log", "w") as log:
+            run_model(exe, run_dir, args, stdout=log, timeout=timeout)
+    except subprocess.TimeoutExpired:
+        row["status"] = "KILLED"
+    row["sim_s"] = round(time.perf_counter() - start, 3)
+
+    status = read_exit_status(run_dir / "results" / "exit_status.txt")
+    if status and row["status"] != "KILLED":
+        row["status"] = status["status"] if status["exit_code"] == 0 else f"EXIT {status['exit_code']}"
+    report = Report.from_file(run_dir / "results" / "Report.txt")
+    if report is not None:
+        row["report"] = report
+        row.update(cycles=report.cycles, instret=report.instret, ipc=report.ipc,
+                   stall=report.get("stall"), hazards=report.get("hazards"),
+                   bubbles=report.get("bubbles_inc_hazards"), stall_ratio=report.stall_ratio)
+    return row
+
+
+def write_csv(path, rows, param_names):
+    with open(path, "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=list(param_names) + list(COLUMNS),
+                                extrasaction="ignore")
+        writer.writeheader()
+        for row in rows:
+            writer.writerow({k: (f"{v:.4f}" if isinstance(v, float) else v) for k, v in row.items()})
+
+
+def store_db(path, rows, param_names):
+    db = ResultsDB(path)
+    rtl = rtl_hash()
+    try:
+        for row in rows:
+            if "report" in row:
+                db.add(row["app"], row["report"], {k: row[k] for k in param_names}, rtl)
+    finally:
+        db.close()
+
+
+def print_table(rows, param_names):
+    def cell(v, fmt=""):
+        return "-" if v is None else format(v, fmt)
+
+    header = [*param_names, "App", "Status", "Cycles", "Instret", "IPC", "Stall", "Stall %"]
+    lines = [[*(str(row[k]) for k in param_names), row["app"], row["status"],
+              cell(row.get("cycles")), cell(row.get("instret")), cell(row.get("ipc"), ".3f"),
+              cell(row.get("stall")),
+              cell(row["stall_ratio"] * 100 if row.get("stall_ratio") is not None else None, ".1f")]
+             for row in rows]
+    widths = [max(len(h), *(len(l[i]) for l in lines)) for i, h in enumerate(header)]
+    print()
+    print("  ".join(h.ljust(w) for h, w in zip(header, widths)))
+    print("  ".join("-" * w for w in widths))
+    for l in lines:
+        print("  ".join(c.ljust(w) for c, w in zip(l, widths)))
+
+
+def run_sweep(grid, apps, jobs, work_root=DEFAULT_WORK_ROOT, plusargs=None, timeout=None,
+              top=SIM_DIR / "testbench.sv"):
+    configs = variants(grid)
+    print(f"{len(configs)} variants x {len(apps)} apps = {len(configs) * len(apps)} runs", flush=True)
+    start = time.perf_counter()
+    exes = build_variants(configs, top, jobs)
+    print(f"Models ready in {time.perf_counter() - start:.1f}s", flush=True)
+
+    rows = []
+    with ThreadPoolExecutor(max_workers=jobs) as pool:
+        futures = []
+        for params in configs:
+            key = model_key(top, params)
+            for app, binary in apps:
+                run_dir = Path(work_root) / key / app
+                futures.append(pool.submit(run_one, exes[variant_label(params)], params, app,
+                                           binary, run_dir, plusargs or {}, timeout))
+        for future in as_completed(futures):
+            row = future.result()
+            print(f"{row['status']:<12} {row['app']} [{variant_label({k: row[k] for k in grid})}]",
+                  flush=True)
+            rows.append(row)
+
+    order = {variant_label(p): i for i, p in enumerate(configs)}
+    app_order = {app: i for i, (app, _) in enumerate(apps)}
+    rows.sort(key=lambda r: (app_order[r["app"]], order[variant_label({k: r[k] for k in grid})]))
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Sweeps testbench parameters over a set of apps")
+    parser.add_argument("-p", "--param", action="append", default=[],
+                        help="Parameter values NAME=v1,v2,... (one per swept parameter)")
+    parser.add_argument("--app", action="append", required=True,
+                        help="Application binary, NAME=path or path")
+    parser.add_argument("--plusarg", action="append", default=[],
+                        help="Extra plusarg NAME=VALUE for every run (e.g. IMAGE_FILE=img.bin)")
+    parser.add_argument("-j", "--jobs", type=int, default=os.cpu_count(),
+                        help="Simulations in parallel; builds share the same cores")
+    parser.add_argument("--work-root", default=str(DEFAULT_WORK_ROOT), help="Run directories")
+    parser.add_argument("--timeout", type=float, default=None,
+                        help="Wall-clock limit per simulation in seconds")
+    parser.add_argument("--csv", default=str(DEFAULT_CSV), help="CSV table of the results")
+    parser.add_argument("--db", default=None, help="Also store the reports in this results database")
+    parser.add_argument("--keep-work", action="store_true", help="Keep the run directories")
+    args = parser.parse_args()
+
+    try:
+        grid = parse_grid(args.param, package_enums())
+        apps = [parse_app(a) for a in args.app]
+        plusargs = dict(p.split("=", 1) for p in args.plusarg)
+    except (OSError, ValueError) as e:
+        sys.exit(f"error: {e}")
+
+    rows = run_sweep(grid, apps, args.jobs, args.work_root, plusargs, args.timeout)
+    print_table(rows, list(grid))
+    write_csv(args.csv, rows, list(grid))
+    print(f"\nResults saved in {args.csv}")
+    if args.db:
+        store_db(args.db, rows, list(grid))
+    failed = [r for r in rows if r["status"] != "DONE"]
+    if not args.keep_work:
+        for row in rows:
+            if row["status"] == "DONE":
+                shutil.rmtree(row["run_dir"], ignore_errors=True)
+    for row in failed:
+        print(f"FAILED {row['app']}: see {row['run_dir']}")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
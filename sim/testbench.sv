@@ -26,7 +26,26 @@
 
 module testbench
     import RS5_pkg::*;
+#(
+    // 0: per-pixel MMIO plugin (plugin_pixel_processor)
+    // 1: frame-level DMA plugin (plugin_image_processor)
+    parameter bit FRAME_PLUGIN = 1'b0,
+    // Vector extension (the vector-tests regression builds with VEnable=1)
+    parameter bit VEnable      = 1'b0,
+    // Microarchitecture options swept by sweep.py (-G overrides in Verilator)
+    parameter mul_e MULEXT     = MUL_M,
+    parameter bit COMPRESSED   = 1'b1,
+    parameter int VLEN         = 256,
+    parameter int LLEN         = 32,
+    parameter bit BRANCHPRED   = 1'b1,
+    parameter bit FORWARDING   = 1'b1,
+    parameter int MEM_WIDTH    = 65_536
+)
 (
+`ifdef SAVABLE
+    // Modelo com --savable (sem --timing): o clock vem do checkpoint_main.cpp
+    input logic clk
+`endif
 );
     timeunit 1ns; timeprecision 1ns;
 
@@ -34,19 +53,12 @@ module testbench
 // PARAMETERS FOR CORE INSTANTIATION
 //////////////////////////////////////////////////////////////////////////////
 
-    localparam mul_e         MULEXT          = MUL_M;
     localparam atomic_e      AMOEXT          = AMO_A;
-    localparam bit           COMPRESSED      = 1'b1;
     localparam bit           USE_XOSVM       = 1'b0;
     localparam bit           USE_ZKNE        = 1'b1;
     localparam bit           USE_ZICOND      = 1'b1;
     localparam bit           USE_ZCB         = 1'b1;
-    localparam bit           VEnable         = 1'b0;
-    localparam int           VLEN            = 256;
-    localparam int           LLEN            = 32;
     localparam bit           USE_HPMCOUNTER  = 1'b1;
-    localparam bit           BRANCHPRED      = 1'b1;
-    localparam bit           FORWARDING      = 1'b1;
 
 `ifndef SYNTH
     localparam bit           PROFILING       = 1'b1;
@@ -55,19 +67,31 @@ module testbench
     localparam string        PROFILING_FILE  = "./results/Report.txt";
     localparam string        OUTPUT_FILE     = "./results/Output.txt";
 
-    localparam int           MEM_WIDTH       = 65_536;
     localparam string        BIN_FILE        = "./test_pixel_processor.bin";
+    localparam string        IMAGE_FILE      = "test_image_data.bin";
+    localparam logic [31:0]  IMAGE_DATA_ADDR = 32'h00001000;
+    localparam longint       TIMEOUT_NS      = 0;           // 0: no fixed limit
+    localparam longint       MAX_CYCLES      = 100_000_000; // cap of every run (0: none)
+    localparam longint       WATCHDOG_CYCLES = 10_000;      // cycles without retiring
+    localparam longint       SPIN_CYCLES     = 1_000_000;   // cycles retiring in a tiny loop
+    localparam logic [31:0]  SPIN_WINDOW     = 64;          // bytes of that loop (< 32 always fit)
+    localparam logic [31:0]  TOHOST_ADDR     = 32'h80000000;
+    localparam string        EXIT_FILE       = "./results/exit_status.txt";
+    localparam logic [31:0]  RESULT_DATA_ADDR = 32'h00002000;
+    localparam string        RESULT_FILE     = "./results/result_data.bin";
 
     localparam int           i_cnt = 1;
 
 ///////////////////////////////////////// Clock generator //////////////////////////////
 
+`ifndef SAVABLE
     logic        clk=1;
 
     always begin
         #5.0 clk <= 0;
         #5.0 clk <= 1;
     end
+`endif
 
 /////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////
 ////////////////////////////////////////////////////// RESET CPU ////////////////////////////////////////////////////////////////////////////////////
@@ -75,114 +99,377 @@ module testbench
 
     logic reset_n;
 
-    // Basic debug - count any memory write operation
-    integer write_count = 0;
-    integer fetch_count = 0;
-    always_ff @(posedge clk) begin
-        // Count instruction fetches
-        if (reset_n && instruction_address != 32'h0) begin
-            fetch_count <= fetch_count + 1;
-            if (fetch_count < 10) begin
-                $display("# %0t Fetch %0d: PC=0x%08X, instr=0x%08X", 
-                         $time, fetch_count, instruction_address, instruction);
+    // Eventos de depuração (+DEBUG_EVENTS=fetch,read,write,plugin,custom ou all):
+    // cada evento habilitado grava um registro binário de 24 bytes em
+    // +DEBUG_FILE (ver debug_events.py), em vez de texto no stdout
+    //   mcycle (64 bits), {16'b0, flags, tipo}, a, b, c
+    localparam int    EV_FETCH   = 1;   // a: PC, b: instrução
+    localparam int    EV_READ    = 2;   // a: endereço, b: dado, c: PC; flags: dispositivo << 4
+    localparam int    EV_WRITE   = 3;   // idem, flags[3:0]: write enable
+    localparam int    EV_PLUGIN  = 4;   // a: endereço, b: dado, c: PC; flags: bit 0 escrita, bit 1 DMA
+    localparam int    EV_CUSTOM  = 5;   // a: instrução, b: rs1, c: rs2; flags: bit 0 ADD_PLUGIN
+    localparam string DEBUG_FILE = "./debug/events.bin";
+
+    logic [7:0] debug_mask = '0;
+    int         debug_fd   = 0;
+
+    function automatic logic [7:0] debug_event_mask(string spec);
+        logic [7:0] mask = '0;
+        int         start = 0;
+        string      name;
+
+        for (int i = 0; i <= spec.len(); i++) begin
+            if (i == spec.len() || spec[i] == ",") begin
+                name  = spec.substr(start, i - 1);
+                start = i + 1;
+                if      (name == "fetch")  mask[EV_FETCH]  = 1'b1;
+                else if (name == "read")   mask[EV_READ]   = 1'b1;
+                else if (name == "write")  mask[EV_WRITE]  = 1'b1;
+                else if (name == "plugin") mask[EV_PLUGIN] = 1'b1;
+                else if (name == "custom") mask[EV_CUSTOM] = 1'b1;
+                else if (name == "all")    mask            = '1;
+                else if (name != "")       $display("# WARNING: unknown debug event '%s'", name);
             end
         end
-        
-        if (mem_write_enable != '0) begin
+        return mask;
+    endfunction
+
+    task automatic debug_event(int kind, logic [7:0] flags, logic [31:0] a, logic [31:0] b, logic [31:0] c);
+        $fwrite(debug_fd, "%u%u%u%u%u%u", dut.CSRBank1.mcycle[31:0], dut.CSRBank1.mcycle[63:32],
+                {16'b0, flags, 8'(kind)}, a, b, c);
+    endtask
+
+    integer write_count = 0;
+    always @(posedge clk) begin
+        if (mem_write_enable != '0)
             write_count <= write_count + 1;
-            $display("# %0t Memory Write %0d: addr=0x%08X, data=0x%08X, enable=0x%X", 
-                     $time, write_count, mem_address, mem_data_write, mem_write_enable);
-        end
-        
-        // Debug read operations  
-        if (mem_operation_enable && mem_write_enable == 4'b0000) begin
-            $display("# %0t Read: addr=0x%08X, mem_data_read=0x%08X, enable_plugin=%b, data_plugin=0x%08X", 
-                     $time, mem_address, mem_data_read, enable_plugin, data_plugin);
-        end
-        
-        // Debug ADD_PLUGIN instruction detection
-        if (dut.decoder1.instruction_i[6:0] == 7'b0001011) begin
-            $display("# %0t CUSTOM-0 Instruction: 0x%08X", $time, dut.decoder1.instruction_i);
-        end
-        if (dut.execute1.instruction_operation_i == ADD_PLUGIN) begin
-            $display("# %d ADD_PLUGIN Operation Detected!", $time);
-            $display("# %d   Instruction: 0x%08x", $time, dut.execute1.instruction_i);
-            $display("# %d   rs1=x%0d, rs2=x%0d, rd=x%0d", $time, 
-                     dut.execute1.instruction_i[19:15],
-                     dut.execute1.instruction_i[24:20], 
-                     dut.execute1.instruction_i[11:7]);
-            $display("# %d   op_a_value=0x%08x, op_b_value=0x%08x", $time,
-                     dut.execute1.rs1_data_i,
-                     dut.execute1.rs2_data_i);
+
+        if (reset_n && debug_mask != '0) begin
+            if (debug_mask[EV_FETCH])
+                debug_event(EV_FETCH, 8'h00, instruction_address, instruction, 32'h0);
+
+            if (debug_mask[EV_READ] && mem_operation_enable && mem_write_enable == '0)
+                debug_event(EV_READ, {1'b0, mem_device, 4'h0}, mem_address, mem_data_read, dut.pc_execute);
+
+            if (debug_mask[EV_WRITE] && mem_write_enable != '0)
+                debug_event(EV_WRITE, {1'b0, mem_device, mem_write_enable}, mem_address, mem_data_write, dut.pc_execute);
+
+            if (debug_mask[EV_PLUGIN] && enable_plugin)
+                debug_event(EV_PLUGIN, {7'b0, |mem_write_enable}, mem_address,
+                            |mem_write_enable ? mem_data_write : data_plugin, dut.pc_execute);
+
+            // Instruções custom-0 no execute, uma vez cada (mesma condição de minstret)
+            if (debug_mask[EV_CUSTOM] && dut.execute1.instruction_i[6:0] == 7'b0001011
+                && !dut.CSRBank1.hold && dut.instruction_operation_execute != NOP)
+                debug_event(EV_CUSTOM, {7'b0, dut.execute1.instruction_operation_i == ADD_PLUGIN},
+                            dut.execute1.instruction_i, dut.execute1.rs1_data_i, dut.execute1.rs2_data_i);
         end
-        
-        // Debug plugin activity
-        // Plugin start/done logs (commented out for pixel processor)
-        /*
-        if (plugin_mem_if.plugin_start) begin
-            $display("# %0t Plugin Start: op_a=0x%08X, op_b=0x%08X", $time, 
-                     plugin_mem_if.plugin_operand_a, plugin_mem_if.plugin_operand_b);
+    end
+
+    // Run-time options (the model is verilated once and reused):
+    //   +IMAGE_FILE=<path>   raw little-endian image data (.bin)
+    //   +IMAGE_ADDR=<hex>    RAM offset where the image is loaded (IMAGE_DATA_ADDR)
+    //   +TIMEOUT=<ns>        optional fixed time limit after the image is loaded
+    //   +MAX_CYCLES=<n>      cycle cap of the run, TIMEOUT status (MAX_CYCLES, 0: off)
+    //   +WATCHDOG=<cycles>   stop when minstret does not advance for this long (0: off)
+    //   +SPIN_WATCHDOG=<n>   stop when every instruction retired in n cycles lies in
+    //                        SPIN_WINDOW bytes, e.g. "j ." or polling a done bit that
+    //                        never rises (SPIN_CYCLES, 0: off)
+    //   +EXIT_FILE=<path>    status of the run: DONE, WATCHDOG or TIMEOUT, and exit code
+    //   +RESULT_FILE=<path>  raw dump of the result buffer written at the end
+    //   +RESULT_ADDR=<hex>   start of the result buffer (RESULT_DATA_ADDR)
+    //   +RESULT_WORDS=<n>    words to dump (default: up to the end of RAM)
+    //   +RETIRE_TRACE=<path> binary trace of every retired instruction (see hotspot.py)
+    //   +DEBUG_EVENTS=<list> debug events to record: fetch,read,write,plugin,custom or all
+    //   +DEBUG_FILE=<path>   binary file of the debug events (DEBUG_FILE)
+    //   +CHECKPOINT_PC=<hex> save a checkpoint when this PC retires (SAVABLE only)
+    // The program binary is selected with +BIN_FILE=<path> (see RAM_mem.sv).
+    string       image_file   = IMAGE_FILE;
+    logic [31:0] image_addr   = IMAGE_DATA_ADDR;
+    longint      timeout_ns   = TIMEOUT_NS;
+    longint      max_cycles   = MAX_CYCLES;
+    longint      watchdog     = WATCHDOG_CYCLES;
+    longint      spin_limit   = SPIN_CYCLES;
+    string       exit_file    = EXIT_FILE;
+    string       sim_status   = "RUNNING";
+    int          exit_code    = -1;
+    string       result_file  = RESULT_FILE;
+    logic [31:0] result_addr  = RESULT_DATA_ADDR;
+    int          result_words = -1;
+    string       retire_trace = "";
+    int          trace_fd     = 0;
+    string       debug_events = "";
+    string       debug_file   = DEBUG_FILE;
+
+    // Os padrões são reatribuídos para que tb_resume não herde os
+    // plusargs da execução que salvou o checkpoint
+    task automatic read_plusargs();
+        image_file   = IMAGE_FILE;
+        image_addr   = IMAGE_DATA_ADDR;
+        timeout_ns   = TIMEOUT_NS;
+        max_cycles   = MAX_CYCLES;
+        watchdog     = WATCHDOG_CYCLES;
+        spin_limit   = SPIN_CYCLES;
+        exit_file    = EXIT_FILE;
+        result_file  = RESULT_FILE;
+        result_addr  = RESULT_DATA_ADDR;
+        result_words = -1;
+        retire_trace = "";
+        debug_events = "";
+        debug_file   = DEBUG_FILE;
+
+        void'($value$plusargs("IMAGE_FILE=%s", image_file));
+        void'($value$plusargs("IMAGE_ADDR=%h", image_addr));
+        void'($value$plusargs("TIMEOUT=%d", timeout_ns));
+        void'($value$plusargs("MAX_CYCLES=%d", max_cycles));
+        void'($value$plusargs("WATCHDOG=%d", watchdog));
+        void'($value$plusargs("SPIN_WATCHDOG=%d", spin_limit));
+        void'($value$plusargs("EXIT_FILE=%s", exit_file));
+        void'($value$plusargs("RESULT_FILE=%s", result_file));
+        void'($value$plusargs("RESULT_ADDR=%h", result_addr));
+        void'($value$plusargs("RESULT_WORDS=%d", result_words));
+        void'($value$plusargs("RETIRE_TRACE=%s", retire_trace));
+        void'($value$plusargs("DEBUG_EVENTS=%s", debug_events));
+        void'($value$plusargs("DEBUG_FILE=%s", debug_file));
+    endtask
+
+    task automatic open_outputs();
+        trace_fd   = 0;
+        debug_fd   = 0;
+        debug_mask = '0;
+
+        if (retire_trace != "") begin
+            trace_fd = $fopen(retire_trace, "wb");
+            if (trace_fd == 0)
+                $display("# ERROR: Could not open %s", retire_trace);
         end
-        if (plugin_mem_if.plugin_done) begin
-            $display("# %0t Plugin Done: result=0x%08X, busy=%b", $time, 
-                     plugin_mem_if.plugin_result, plugin_mem_if.plugin_busy);
+
+        if (debug_events != "") begin
+            debug_fd = $fopen(debug_file, "wb");
+            if (debug_fd == 0)
+                $display("# ERROR: Could not open %s", debug_file);
+            else
+                debug_mask = debug_event_mask(debug_events);
         end
-        */
-    end
+    endtask
 
     initial begin
+        read_plusargs();
+        open_outputs();
+
         reset_n = 0;                                          // RESET for CPU initialization
         $display("# %0t RESET START", $time);
 
+`ifndef SAVABLE
         #100 reset_n = 1;                                     // Hold state for 100 ns
         $display("# %0t RESET RELEASE", $time);
         
         // Carregar dados da imagem na RAM após reset
         #200 load_image_data();
-        
-        // Timeout para evitar simulação infinita
-        #500000 begin
+`endif
+    end
+
+    // Limite fixo opcional (+TIMEOUT), contado em ciclos de 10 ns a partir
+    // da carga da imagem (300 ns), e teto de ciclos sempre ativo
+    // (+MAX_CYCLES); o fim normal é a escrita em TOHOST_ADDR e travamentos
+    // são detectados pelos watchdogs de instret e de laço
+    longint tb_cycle = 0;
+    logic   image_loaded = 1'b0;
+
+    always @(posedge clk) begin
+        tb_cycle <= tb_cycle + 1;
+
+`ifdef SAVABLE
+        // Sem --timing não há atrasos: reset por 100 ns e imagem em 300 ns
+        // também são contados em ciclos
+        if (tb_cycle == 10) begin
+            reset_n <= 1;
+            $display("# %0t RESET RELEASE", $time);
+        end
+
+        // Retomado de um checkpoint anterior à carga, tb_resume já carregou a imagem
+        if (tb_cycle == 30 && !image_loaded)
+            load_image_data();
+`endif
+
+        if (timeout_ns > 0 && tb_cycle >= 30 + timeout_ns / 10) begin
+            sim_status = "TIMEOUT";
             $display("\n# %0t TIMEOUT - ENDING SIMULATION", $time);
             $display("# Write operations detected: %0d", write_count);
             $finish;
         end
+
+        if (max_cycles > 0 && tb_cycle >= max_cycles) begin
+            sim_status = "TIMEOUT";
+            $display("\n# %0t TIMEOUT - %0d cycles (MAX_CYCLES) reached", $time, max_cycles);
+            $finish;
+        end
+    end
+
+`ifdef SAVABLE
+    // Checkpoint (+CHECKPOINT_PC): na primeira vez que a instrução nesse PC
+    // é retirada, o checkpoint_main.cpp salva o estado do modelo. Restaurado
+    // o checkpoint, tb_resume relê os plusargs, reabre os arquivos de saída
+    // (descritores não são salvos) e recarrega a imagem, sobrescrevendo a
+    // da execução original antes de o programa lê-la
+    import "DPI-C" function void tb_checkpoint();
+    export "DPI-C" task tb_resume;
+
+    logic [31:0] checkpoint_pc    = '0;
+    logic        checkpoint_armed = 1'b0;
+
+    initial
+        checkpoint_armed = ($value$plusargs("CHECKPOINT_PC=%h", checkpoint_pc) != 0);
+
+    always @(posedge clk) begin
+        if (checkpoint_armed && reset_n && !dut.CSRBank1.hold
+            && dut.instruction_operation_execute != NOP && dut.pc_execute == checkpoint_pc) begin
+            checkpoint_armed = 1'b0;
+            $display("# %0t CHECKPOINT at PC 0x%08X", $time, checkpoint_pc);
+            tb_checkpoint();
+        end
+    end
+
+    task automatic tb_resume();
+        checkpoint_armed = 1'b0;
+        read_plusargs();
+        open_outputs();
+
+        fd = $fopen(OUTPUT_FILE, "w");
+        dut.CSRBank1.gen_profiling.fd = $fopen(PROFILING_FILE, "w");
+        RAM_MEM.fd_log = 0;
+        if ($value$plusargs("RAM_LOG=%s", RAM_MEM.ram_log))
+            RAM_MEM.fd_log = $fopen(RAM_MEM.ram_log, "wb");
+
+        $display("# %0t RESUMED FROM CHECKPOINT", $time);
+        load_image_data();
+    endtask
+`endif
+
+    // Watchdog: encerra quando o núcleo para de retirar instruções
+    logic [63:0] last_instret = '0;
+    longint      stalled_cycles = 0;
+
+    always @(posedge clk) begin
+        if (!reset_n || watchdog <= 0 || dut.CSRBank1.minstret != last_instret) begin
+            last_instret   = dut.CSRBank1.minstret;
+            stalled_cycles = 0;
+        end
+        else begin
+            stalled_cycles++;
+            if (stalled_cycles >= watchdog) begin
+                sim_status = "WATCHDOG";
+                $display("\n# %0t WATCHDOG - no instruction retired in %0d cycles", $time, watchdog);
+                $finish;
+            end
+        end
+    end
+
+    // Watchdog de laço: o núcleo segue retirando instruções, mas todas numa
+    // janela de SPIN_WINDOW bytes centrada no PC que a abriu (laço de fim
+    // "j ." ou polling de um done que nunca sobe)
+    logic [31:0] spin_base   = '0;
+    longint      spin_cycles = 0;
+
+    always @(posedge clk) begin
+        if (!reset_n || spin_limit <= 0) begin
+            spin_cycles = 0;
+        end
+        else begin
+            if (!dut.CSRBank1.hold && dut.instruction_operation_execute != NOP
+                && dut.pc_execute - spin_base >= SPIN_WINDOW) begin
+                spin_base   = dut.pc_execute - SPIN_WINDOW / 2;
+                spin_cycles = 0;
+            end
+            else begin
+                spin_cycles++;
+            end
+            if (spin_cycles >= spin_limit) begin
+                sim_status = "WATCHDOG";
+                $display("\n# %0t WATCHDOG - every instruction retired in %0d cycles within 0x%08X-0x%08X",
+                         $time, spin_limit, spin_base, spin_base + SPIN_WINDOW - 1);
+                $finish;
+            end
+        end
+    end
+
+    // Trace de instruções retiradas (+RETIRE_TRACE): um registro de 16 bytes
+    // little-endian por instrução, com a mesma condição que incrementa minstret:
+    //   PC (bit 0 = instrução comprimida), instrução, mcycle (64 bits)
+    always @(posedge clk) begin
+        if (trace_fd != 0 && reset_n && !dut.CSRBank1.hold
+            && dut.instruction_operation_execute != NOP) begin
+            $fwrite(trace_fd, "%u%u%u%u",
+                    dut.pc_execute | {31'b0, dut.instruction_compressed_execute},
+                    dut.instruction_execute,
+                    dut.CSRBank1.mcycle[31:0], dut.CSRBank1.mcycle[63:32]);
+        end
     end
 
     // Tarefa para carregar dados da imagem na RAM
+    // O .bin já está no layout da RAM (palavras little-endian), então é
+    // copiado de uma vez com $fread a partir de image_addr
     task automatic load_image_data();
-        integer fd, i, result;
-        logic [31:0] data_word;
-        logic [31:0] base_addr = 32'h00001000; // IMAGE_DATA_ADDR
+        integer fd, n_bytes;
         
         $display("# %0t Loading image data into RAM...", $time);
         
-        fd = $fopen("test_image_data.hex", "r");
+        fd = $fopen(image_file, "rb");
         if (fd == 0) begin
-            $display("# ERROR: Could not open test_image_data.hex");
+            $display("# ERROR: Could not open %s", image_file);
             return;
         end
         
-        i = 0;
-        while (!$feof(fd)) begin
-            result = $fscanf(fd, "%h", data_word);
-            if (result == 1) begin
-                // Escrever diretamente na RAM
-                RAM_MEM.RAM[base_addr + (i*4)]     = data_word[7:0];
-                RAM_MEM.RAM[base_addr + (i*4) + 1] = data_word[15:8];
-                RAM_MEM.RAM[base_addr + (i*4) + 2] = data_word[23:16];
-                RAM_MEM.RAM[base_addr + (i*4) + 3] = data_word[31:24];
-                
-                if (i < 10) begin
-                    $display("# Image[%0d]: 0x%08X at addr 0x%08X", i, data_word, base_addr + (i*4));
-                end
-                i = i + 1;
-            end
-        end
-        
+        n_bytes = $fread(RAM_MEM.RAM, fd, image_addr);
         $fclose(fd);
-        $display("# %0t Image data loaded: %0d words", $time, i);
+        image_loaded = 1'b1;
+        
+        for (int i = 0; i < 10 && i*4 < n_bytes; i++) begin
+            $display("# Image[%0d]: 0x%08X at addr 0x%08X", i,
+                     {RAM_MEM.RAM[image_addr + i*4 + 3], RAM_MEM.RAM[image_addr + i*4 + 2],
+                      RAM_MEM.RAM[image_addr + i*4 + 1], RAM_MEM.RAM[image_addr + i*4]},
+                     image_addr + i*4);
+        end
+        $display("# %0t Image data loaded: %0d words", $time, n_bytes / 4);
     endtask
 
+    // Dump do buffer de resultados (RAM little-endian, 4 bytes por pixel 0xGGGGGG00)
+    // e do estado de término da simulação
+    final begin
+        int fd_res;
+        int fd_exit;
+        int last;
+
+        if (trace_fd != 0)
+            $fclose(trace_fd);
+        if (debug_fd != 0)
+            $fclose(debug_fd);
+
+        fd_exit = $fopen(exit_file, "w");
+        if (fd_exit != 0) begin
+            $fwrite(fd_exit, "Status:    %s\n", sim_status);
+            $fwrite(fd_exit, "Exit Code: %0d\n", exit_code);
+            $fwrite(fd_exit, "Time (ns): %0t\n", $time);
+            $fclose(fd_exit);
+        end
+
+        last = (result_words < 0) ? MEM_WIDTH : int'(result_addr) + result_words*4;
+        if (last > MEM_WIDTH)
+            last = MEM_WIDTH;
+
+        fd_res = $fopen(result_file, "wb");
+        if (fd_res == 0) begin
+            $display("# ERROR: Could not open %s", result_file);
+        end
+        else begin
+            for (int addr = int'(result_addr); addr + 3 < last; addr += 4)
+                $fwrite(fd_res, "%u", {RAM_MEM.RAM[addr+3], RAM_MEM.RAM[addr+2],
+                                       RAM_MEM.RAM[addr+1], RAM_MEM.RAM[addr]});
+            $fclose(fd_res);
+            $display("# Result buffer 0x%08X-0x%08X dumped to %s", result_addr, last, result_file);
+        end
+    end
+
 //////////////////////////////////////////////////////////////////////////////
 // TB SIGNALS
 //////////////////////////////////////////////////////////////////////////////
@@ -208,6 +495,10 @@ module testbench
     logic [31:0]            data_ram, data_plic, data_tb, data_plugin;
     logic                   enable_tb_r, enable_rtc_r, enable_plic_r, enable_plugin_r;
     logic                   mti, mei;
+    logic [2:0]             mem_device;
+    logic                   enable_dma;
+    logic [3:0]             dma_write_enable;
+    logic [31:0]            dma_address, dma_data_write, dma_data_read;
 
 //////////////////////////////////////////////////////////////////////////////
 // Control
@@ -260,6 +551,10 @@ module testbench
         end
     end
 
+    // Dispositivo do acesso atual: 0 RAM, 1 plugin, 2 RTC, 3 PLIC, 4 TB
+    assign mem_device = enable_plugin ? 3'd1 : enable_rtc ? 3'd2 : enable_plic ? 3'd3 :
+                        enable_tb     ? 3'd4 : 3'd0;
+
     always_ff @(posedge clk) begin
         enable_tb_r     <= enable_tb;
         enable_rtc_r    <= enable_rtc;
@@ -351,7 +646,13 @@ module testbench
         .weB_i      (mem_write_enable),
         .addrB_i    (mem_address[($clog2(MEM_WIDTH) - 1):0]),
         .dataB_i    (mem_data_write),
-        .dataB_o    (data_ram)
+        .dataB_o    (data_ram),
+
+        .enC_i      (enable_dma),
+        .weC_i      (dma_write_enable),
+        .addrC_i    (dma_address[($clog2(MEM_WIDTH) - 1):0]),
+        .dataC_i    (dma_data_write),
+        .dataC_o    (dma_data_read)
     );
 
 //////////////////////////////////////////////////////////////////////////////
@@ -399,30 +700,83 @@ module testbench
 // PLUGIN
 //////////////////////////////////////////////////////////////////////////////
 
-    plugin_pixel_memory_interface plugin_mem_if(
-        .clk      (clk),
-        .reset_n  (reset_n),
-        .enable_i (enable_plugin),
-        .we_i     (mem_write_enable),
-        .addr_i   (mem_address),
-        .data_i   (mem_data_write),
-        .data_o   (data_plugin)
-    );
+    generate
+        if (FRAME_PLUGIN) begin : gen_frame_plugin
+            logic [31:0] plugin_mem_addr, plugin_mem_wdata, plugin_mem_rdata;
+            logic        plugin_mem_req, plugin_mem_we, plugin_mem_ready;
+
+            plugin_image_memory_interface plugin_mem_if(
+                .clk          (clk),
+                .reset_n      (reset_n),
+                .enable_i     (enable_plugin),
+                .we_i         (mem_write_enable),
+                .addr_i       (mem_address),
+                .data_i       (mem_data_write),
+                .data_o       (data_plugin),
+
+                // Plugin memory access interface
+                .mem_req_o    (plugin_mem_req),
+                .mem_we_o     (plugin_mem_we),
+                .mem_addr_o   (plugin_mem_addr),
+                .mem_data_o   (plugin_mem_wdata),
+                .mem_data_i   (plugin_mem_rdata),
+                .mem_ready_i  (plugin_mem_ready)
+            );
+
+            // Plugin memory master on port C of RAM_MEM: each request is
+            // served in one cycle and acknowledged with a single mem_ready
+            // pulse, so the FSM samples valid read data
+            assign enable_dma       = plugin_mem_req && !plugin_mem_ready && plugin_mem_addr < MEM_WIDTH;
+            assign dma_write_enable = plugin_mem_we ? 4'hf : 4'h0;
+            assign dma_address      = plugin_mem_addr;
+            assign dma_data_write   = plugin_mem_wdata;
+
+            always_ff @(posedge clk or negedge reset_n) begin
+                if (!reset_n) begin
+                    plugin_mem_ready <= 1'b0;
+                    plugin_mem_rdata <= '0;
+                end
+                else begin
+                    plugin_mem_ready <= plugin_mem_req && !plugin_mem_ready;
 
-    // Plugin debug logs
-    always_ff @(posedge clk) begin
-        if (enable_plugin && |mem_write_enable) begin
-            $display("# %0d Plugin Write: addr=0x%08x, data=0x%08x", $time(), mem_address, mem_data_write);
-        end
-        if (enable_plugin && !|mem_write_enable) begin
-            $display("# %0d Plugin Read: addr=0x%08x, data=0x%08x", $time(), mem_address, data_plugin);
+                    if (enable_dma && !plugin_mem_we)
+                        plugin_mem_rdata <= dma_data_read;
+                end
+            end
+
+            // Acessos DMA do plugin (+DEBUG_EVENTS=plugin), gravados no ciclo
+            // de mem_ready, quando o dado lido já é válido
+            logic [31:0] dma_addr, dma_wdata;
+            logic        dma_we;
+
+            always @(posedge clk) begin
+                if (plugin_mem_req && !plugin_mem_ready) begin
+                    dma_addr  <= plugin_mem_addr;
+                    dma_wdata <= plugin_mem_wdata;
+                    dma_we    <= plugin_mem_we;
+                end
+                if (debug_mask[EV_PLUGIN] && plugin_mem_ready)
+                    debug_event(EV_PLUGIN, {6'b0, 1'b1, dma_we}, dma_addr,
+                                dma_we ? dma_wdata : plugin_mem_rdata, 32'h0);
+            end
         end
-        
-        // Debug operation enable
-        if (mem_operation_enable) begin
-            $display("# %0d Operation: addr=0x%08x, write=%b, enable_plugin=%b", $time(), mem_address, |mem_write_enable, enable_plugin);
+        else begin : gen_pixel_plugin
+            assign enable_dma       = 1'b0;
+            assign dma_write_enable = 4'h0;
+            assign dma_address      = '0;
+            assign dma_data_write   = '0;
+
+            plugin_pixel_memory_interface plugin_mem_if(
+                .clk      (clk),
+                .reset_n  (reset_n),
+                .enable_i (enable_plugin),
+                .we_i     (mem_write_enable),
+                .addr_i   (mem_address),
+                .data_i   (mem_data_write),
+                .data_o   (data_plugin)
+            );
         end
-    end
+    endgenerate
 
 //////////////////////////////////////////////////////////////////////////////
 // Memory Mapped regs
@@ -455,12 +809,6 @@ module testbench
                 else if ((mem_address >= 32'h00001000 && mem_address < 32'h00001010)) begin
                     $display("# %0t ADD_PLUGIN Test: Writing 0x%08X to address 0x%08X", $time, mem_data_write, mem_address);
                 end
-                // END REG
-                if (mem_address == 32'h80000000) begin
-                    $display(    "\n# %0t END OF SIMULATION",$time);
-                    $fdisplay(fd,"\n# %0t END OF SIMULATION",$time);
-                    $finish;
-                end
                 data_tb <= '0;  // Default for write operations
             end
             else begin
@@ -474,4 +822,15 @@ module testbench
         end
     end
 
+    // END REG (tohost): o valor escrito é o código de saída (0 = sucesso)
+    always @(posedge clk) begin
+        if (enable_tb && mem_write_enable != '0 && mem_address == TOHOST_ADDR) begin
+            sim_status = "DONE";
+            exit_code  = int'(mem_data_write);
+            $display(    "\n# %0t END OF SIMULATION (exit code %0d)",$time, exit_code);
+            $fdisplay(fd,"\n# %0t END OF SIMULATION (exit code %0d)",$time, exit_code);
+            $finish;
+        end
+    end
+
 endmodule
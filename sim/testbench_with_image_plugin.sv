@@ -145,6 +145,9 @@ module testbench
     logic [31:0]            data_ram, data_plic, data_tb, data_plugin;
     logic                   enable_tb_r, enable_rtc_r, enable_plic_r, enable_plugin_r;
     logic                   mti, mei;
+    logic                   enable_dma;
+    logic [3:0]             dma_write_enable;
+    logic [31:0]            dma_address, dma_data_write, dma_data_read;
 
 //////////////////////////////////////////////////////////////////////////////
 // Control
@@ -288,7 +291,13 @@ module testbench
         .weB_i      (mem_write_enable),
         .addrB_i    (mem_address[($clog2(MEM_WIDTH) - 1):0]),
         .dataB_i    (mem_data_write),
-        .dataB_o    (data_ram)
+        .dataB_o    (data_ram),
+
+        .enC_i      (enable_dma),
+        .weC_i      (dma_write_enable),
+        .addrC_i    (dma_address[($clog2(MEM_WIDTH) - 1):0]),
+        .dataC_i    (dma_data_write),
+        .dataC_o    (dma_data_read)
     );
 
 //////////////////////////////////////////////////////////////////////////////
@@ -358,34 +367,18 @@ module testbench
     );
     
     // Plugin memory access handler
-    // Access main memory through hierarchical reference to RAM_MEM instance
+    // Access main memory through port C (DMA) of the RAM_MEM instance
     assign plugin_mem_ready = 1'b1;  // Always ready for simplicity
     
-    // Plugin memory read/write logic
+    assign enable_dma       = plugin_mem_req && plugin_mem_addr < MEM_WIDTH;
+    assign dma_write_enable = plugin_mem_we ? 4'hf : 4'h0;
+    assign dma_address      = plugin_mem_addr;
+    assign dma_data_write   = plugin_mem_wdata;
+
+    // Plugin memory read logic (writes are done by RAM_MEM)
     always_ff @(posedge clk) begin
-        if (plugin_mem_req) begin
-            if (plugin_mem_we) begin
-                // Write to memory (4-byte word)
-                if (plugin_mem_addr < 32'h1000000) begin
-                    // Write 32-bit word to RAM (byte-addressed)
-                    RAM_MEM.RAM[plugin_mem_addr + 0] <= plugin_mem_wdata[7:0];
-                    RAM_MEM.RAM[plugin_mem_addr + 1] <= plugin_mem_wdata[15:8];
-                    RAM_MEM.RAM[plugin_mem_addr + 2] <= plugin_mem_wdata[23:16];
-                    RAM_MEM.RAM[plugin_mem_addr + 3] <= plugin_mem_wdata[31:24];
-                end
-            end else begin
-                // Read from memory (4-byte word)
-                if (plugin_mem_addr < 32'h1000000) begin
-                    // Read 32-bit word from RAM (byte-addressed)
-                    plugin_mem_rdata <= {RAM_MEM.RAM[plugin_mem_addr + 3],
-                                        RAM_MEM.RAM[plugin_mem_addr + 2],
-                                        RAM_MEM.RAM[plugin_mem_addr + 1],
-                                        RAM_MEM.RAM[plugin_mem_addr + 0]};
-                end else begin
-                    plugin_mem_rdata <= 32'h0;
-                end
-            end
-        end
+        if (plugin_mem_req && !plugin_mem_we)
+            plugin_mem_rdata <= enable_dma ? dma_data_read : 32'h0;
     end
 
 //////////////////////////////////////////////////////////////////////////////
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Parallel regression of the vector extension tests (app/vector-tests).
+
+Every test is built in its own work directory (the shared headers and the
+Makefile are linked in, objects stay local) and simulated concurrently on
+one cached Verilator model of testbench.sv with VEnable=1. A test passes
+when it prints "PASSED: test/<file>!" and ends through tohost.
+
+The UART output of each test is kept in app/vector-tests/results/passed or
+results/failed, as vector_regression.sh used to do.
+
+Usage:
+    python3 sim/vector_regression.py                  # operations/, all CPUs
+    python3 sim/vector_regression.py -j 8 vadd vmul   # selected tests
+    python3 sim/vector_regression.py --suite operations mem_operations
+"""
+
+import os
+import sys
+import shutil
+import argparse
+
+from model_cache import SIM_DIR, RS5_ROOT
+from regression import run_regression, print_summary
+from results_db import store_results
+
+VECTOR_DIR = RS5_ROOT / "app" / "vector-tests"
+SHARED_FILES = ("Makefile", "rs5.ld", "test.S")
+TEST_SUFFIXES = (".c", ".S")
+DEFAULT_WORK_ROOT = SIM_DIR / "vector_work"
+DEFAULT_PARAMS = {"VEnable": 1}
+
+
+def find_tests(suites, names=None):
+    """Test sources of the given suites, optionally filtered by name (stem)"""
+    tests = []
+    for suite in suites:
+        suite_dir = VECTOR_DIR / suite
+        tests += sorted(p for p in suite_dir.iterdir() if p.suffix in TEST_SUFFIXES)
+    if names:
+        wanted = set(names)
+        tests = [t for t in tests if t.stem in wanted or t.name in wanted]
+        missing = wanted - {t.stem for t in tests} - {t.name for t in tests}
+        if missing:
+            raise ValueError(f"Unknown tests: {', '.join(sorted(missing))}")
+    return tests
+
+
+def setup_work_dir(work_dir, test):
+    """Private copy of the vector-tests tree with only this test in test/"""
+    shutil.rmtree(work_dir, ignore_errors=True)
+    (work_dir / "test").mkdir(parents=True)
+    for name in SHARED_FILES:
+        os.symlink(VECTOR_DIR / name, work_dir / name)
+    for f in (VECTOR_DIR / "test").iterdir():
+        if f.is_file() and f.suffix in (".h", ".c", ".S"):
+            os.symlink(f, work_dir / "test" / f.name)
+    os.symlink(test, work_dir / "test" / test.name)
+
+
+def fields(test):
+    return {"test": test.stem, "suite": test.parent.name}
+
+
+def passed(test, output):
+    return f"PASSED: test/{test.name}!" in output
+
+
+def save_outputs(results):
+    """UART output of every test in results/passed or results/failed"""
+    results_dir = VECTOR_DIR / "results"
+    for status in ("passed", "failed"):
+        shutil.rmtree(results_dir / status, ignore_errors=True)
+        (results_dir / status).mkdir(parents=True)
+    for r in results:
+        (results_dir / r["status"].lower() / f"{r['test']}.txt").write_text(r["output"])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Runs the vector-tests regression on Verilator")
+    parser.add_argument("tests", nargs="*", help="Test names (default: every test of the suites)")
+    parser.add_argument("--suite", nargs="+", default=["operations"],
+                        help="Folders of app/vector-tests to run (default: operations)")
+    parser.add_argument("-j", "--jobs", type=int, default=os.cpu_count(),
+                        help="Tests built and simulated in parallel (default: number of CPUs)")
+    parser.add_argument("--work-root", default=str(DEFAULT_WORK_ROOT),
+                        help="Per-test build/run directories")
+    parser.add_argument("--keep-work", action="store_true",
+                        help="Keep the work directory of passing tests")
+    parser.add_argument("--timeout", type=float, default=None,
+                        help="Wall-clock limit per simulation in seconds")
+    parser.add_argument("--db", default=None,
+                        help="Also store the counters of the passing tests in this results database")
+    args = parser.parse_args()
+
+    try:
+        tests = find_tests(args.suite, args.tests)
+    except (OSError, ValueError) as e:
+        sys.exit(f"error: {e}")
+
+    results, wall_time = run_regression(tests, args.jobs, setup_work_dir, passed, args.work_root,
+                                        args.keep_work, args.timeout, DEFAULT_PARAMS, fields)
+    print_summary(results, wall_time, args.jobs)
+    save_outputs(results)
+    if args.db:
+        store_results(args.db, "vector-tests", results, DEFAULT_PARAMS)
+    sys.exit(0 if all(r["status"] == "PASSED" for r in results) else 1)
+
+
+if __name__ == "__main__":
+    main()